@@ -31,10 +31,14 @@ of another experiment of interest.
 
    complete_meas_cal
    tensored_meas_cal
+   random_meas_cal
+   local_meas_cal
    MeasurementFilter
    TensoredFilter
    CompleteMeasFitter
    TensoredMeasFitter
+   LocalMeasFitter
+   correlated_mit_pattern
 
 Expectation Value Measurement
 =============================
@@ -54,8 +58,10 @@ expectation values of diagonal operators from counts.
 """
 
 from .measurement import (complete_meas_cal, tensored_meas_cal,
+                          random_meas_cal, local_meas_cal,
                           MeasurementFilter, TensoredFilter,
-                          CompleteMeasFitter, TensoredMeasFitter)
+                          CompleteMeasFitter, TensoredMeasFitter,
+                          LocalMeasFitter, correlated_mit_pattern)
 
 from .expval import (expectation_value,
                      expval_meas_mitigator_circuits,
@@ -19,6 +19,8 @@ Measurement correction module
 """
 
 # Measurement correction functions
-from .circuits import complete_meas_cal, tensored_meas_cal
+from .circuits import (complete_meas_cal, tensored_meas_cal,
+                       random_meas_cal, local_meas_cal)
 from .filters import MeasurementFilter, TensoredFilter
-from .fitters import CompleteMeasFitter, TensoredMeasFitter
+from .fitters import (CompleteMeasFitter, TensoredMeasFitter,
+                      LocalMeasFitter, correlated_mit_pattern)
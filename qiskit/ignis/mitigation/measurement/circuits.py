@@ -16,10 +16,12 @@
 Measurement calibration circuits. To apply the measurement mitigation
 use the fitters to produce a filter.
 """
-from typing import List, Tuple, Union
+from typing import List, Tuple, Union, Optional
+import numpy as np
 from qiskit import QuantumRegister, ClassicalRegister, \
     QuantumCircuit, QiskitError
 from qiskit.ignis.verification.tomography import count_keys
+from qiskit.ignis.utils import _covering_array
 
 
 def complete_meas_cal(qubit_list: List[int] = None,
@@ -179,35 +181,224 @@ def tensored_meas_cal(mit_pattern: List[List[int]] = None,
             basis_state = largest_state[:list_size] + basis_state
         state_labels.append(basis_state)
 
+    qubits = [qubit for qubit_list in mit_pattern for qubit in qubit_list]
     cal_circuits = []
     for basis_state in state_labels:
-        qc_circuit = QuantumCircuit(qr, cr,
-                                    name='%scal_%s' % (circlabel, basis_state))
+        cal_circuits.append(_cal_circuit(qr, cr, qubits, basis_state,
+                                         circlabel))
+
+    return cal_circuits, mit_pattern
 
-        end_index = nqubits
-        for qubit_list, list_size in zip(mit_pattern, qubits_list_sizes):
 
-            start_index = end_index - list_size
-            substate = basis_state[start_index:end_index]
+def random_meas_cal(qubit_list: List[int] = None,
+                    qr: Union[int, List[QuantumRegister]] = None,
+                    cr: Union[int, List[ClassicalRegister]] = None,
+                    num_circuits: int = 32,
+                    circlabel: str = '',
+                    seed: Optional[int] = None
+                    ) -> Tuple[List[QuantumCircuit], List[str]]:
+    """
+    Return a list of measurement calibration circuits for random basis states.
 
-            for qind in range(list_size):
-                if substate[list_size-qind-1] == '1':
-                    qc_circuit.x(qr[qubit_list[qind]])
+    These circuits are a cheap calibration for detecting correlated readout
+    errors with :func:`correlated_mit_pattern`, which does not need every
+    basis state to be prepared.
 
-            end_index = start_index
+    Args:
+        qubit_list: A list of qubits to perform the measurement correction on.
+           If `None`, and qr is given then assumed to be performed over the entire
+           qr. The calibration states will be labelled according to this ordering (default `None`).
 
-        qc_circuit.barrier(qr)
+        qr: Quantum registers (or their size).
+        If `None`, one is created (default `None`).
 
-        # add measurements
-        end_index = nqubits
-        for qubit_list, list_size in zip(mit_pattern, qubits_list_sizes):
+        cr: Classical registers (or their size).
+        If `None`, one is created (default `None`).
 
-            for qind in range(list_size):
-                qc_circuit.measure(qr[qubit_list[qind]],
-                                   cr[nqubits-(end_index-qind)])
+        num_circuits: The number of distinct random basis states to prepare
+            (default 32).
 
-            end_index -= list_size
+        circlabel: A string to add to the front of circuit names for
+            unique identification (default ' ').
 
-        cal_circuits.append(qc_circuit)
+        seed: Seed for the random number generator (default `None`).
 
-    return cal_circuits, mit_pattern
+    Returns:
+        A list of QuantumCircuit objects containing the calibration circuits.
+
+        A list of calibration state labels.
+
+    Additional Information:
+        The returned circuits are named circlabel+cal_XXX
+        where XXX is the basis state, as for :func:`complete_meas_cal`.
+        If ``num_circuits`` is at least :math:`2^n` all basis states are
+        prepared.
+
+        The results of these circuits can also be passed to the
+        TensoredMeasurementFitter constructor, which averages the
+        calibration of each group of qubits over the random states of the
+        other qubits.
+
+    Raises:
+        QiskitError: if both `qubit_list` and `qr` are `None`.
+    """
+
+    if qubit_list is None and qr is None:
+        raise QiskitError("Must give one of a qubit_list or a qr")
+
+    # Create the registers if not already done
+    if qr is None:
+        qr = QuantumRegister(max(qubit_list)+1)
+
+    if isinstance(qr, int):
+        qr = QuantumRegister(qr)
+
+    if qubit_list is None:
+        qubit_list = range(len(qr))
+
+    nqubits = len(qubit_list)
+
+    if cr is None:
+        cr = ClassicalRegister(nqubits)
+
+    if isinstance(cr, int):
+        cr = ClassicalRegister(cr)
+
+    # sample distinct random basis states
+    num_circuits = min(num_circuits, 2 ** nqubits)
+    rng = np.random.default_rng(seed)
+    state_labels = []
+    sampled = set()
+    while len(state_labels) < num_circuits:
+        bits = rng.integers(2, size=nqubits)
+        basis_state = ''.join(str(bit) for bit in bits)
+        if basis_state not in sampled:
+            sampled.add(basis_state)
+            state_labels.append(basis_state)
+
+    cal_circuits = []
+    for basis_state in state_labels:
+        cal_circuits.append(_cal_circuit(qr, cr, list(qubit_list),
+                                         basis_state, circlabel))
+
+    return cal_circuits, state_labels
+
+
+def local_meas_cal(qubit_list: List[int] = None,
+                   qr: Union[int, List[QuantumRegister]] = None,
+                   cr: Union[int, List[ClassicalRegister]] = None,
+                   k: int = 2,
+                   circlabel: str = '',
+                   seed: Optional[int] = None
+                   ) -> Tuple[List[QuantumCircuit], List[str]]:
+    """
+    Return a list of measurement calibration circuits for a k-local
+    correlated readout error model.
+
+    The prepared basis states are the rows of a binary covering array of
+    strength :math:`k`, so every basis state of every group of :math:`k`
+    qubits is prepared in some circuit. The number of circuits grows as
+    :math:`2^k \\log n` rather than :math:`2^n`.
+
+    Args:
+        qubit_list: A list of qubits to perform the measurement correction on.
+           If `None`, and qr is given then assumed to be performed over the entire
+           qr. The calibration states will be labelled according to this ordering (default `None`).
+
+        qr: Quantum registers (or their size).
+        If `None`, one is created (default `None`).
+
+        cr: Classical registers (or their size).
+        If `None`, one is created (default `None`).
+
+        k: The maximum number of qubits with correlated readout errors
+            (default 2).
+
+        circlabel: A string to add to the front of circuit names for
+            unique identification (default ' ').
+
+        seed: Seed for the random number generator of the covering array
+            construction (default `None`).
+
+    Returns:
+        A list of QuantumCircuit objects containing the calibration circuits.
+
+        A list of calibration state labels.
+
+    Additional Information:
+        The returned circuits are named circlabel+cal_XXX
+        where XXX is the basis state, as for :func:`complete_meas_cal`.
+        The results are used by the :class:`LocalMeasFitter` to fit the
+        calibration matrices of groups of at most :math:`k` qubits.
+
+    Raises:
+        QiskitError: if both `qubit_list` and `qr` are `None`, or if `k` is
+            not positive.
+    """
+
+    if qubit_list is None and qr is None:
+        raise QiskitError("Must give one of a qubit_list or a qr")
+
+    if k < 1:
+        raise QiskitError("k must be positive")
+
+    # Create the registers if not already done
+    if qr is None:
+        qr = QuantumRegister(max(qubit_list)+1)
+
+    if isinstance(qr, int):
+        qr = QuantumRegister(qr)
+
+    if qubit_list is None:
+        qubit_list = range(len(qr))
+
+    nqubits = len(qubit_list)
+
+    if cr is None:
+        cr = ClassicalRegister(nqubits)
+
+    if isinstance(cr, int):
+        cr = ClassicalRegister(cr)
+
+    if k >= nqubits:
+        state_labels = count_keys(nqubits)
+    else:
+        # column j of the covering array is the state of qubit_list[j]
+        array = _covering_array(nqubits, k, 2, seed=seed)
+        state_labels = [''.join(str(bit) for bit in reversed(row))
+                        for row in array]
+
+    cal_circuits = []
+    for basis_state in state_labels:
+        cal_circuits.append(_cal_circuit(qr, cr, list(qubit_list),
+                                         basis_state, circlabel))
+
+    return cal_circuits, state_labels
+
+
+def _cal_circuit(qr: QuantumRegister,
+                 cr: ClassicalRegister,
+                 qubits: List[int],
+                 basis_state: str,
+                 circlabel: str = ''
+                 ) -> QuantumCircuit:
+    """
+    Return a calibration circuit preparing and measuring a basis state.
+
+    The last character of the basis state is the state of ``qubits[0]``,
+    which is measured to the first classical bit.
+    """
+    qc_circuit = QuantumCircuit(qr, cr,
+                                name='%scal_%s' % (circlabel, basis_state))
+    nqubits = len(qubits)
+    for qind, qubit in enumerate(qubits):
+        if basis_state[nqubits-qind-1] == '1':
+            qc_circuit.x(qr[qubit])
+
+    qc_circuit.barrier(qr)
+
+    # add measurements
+    for qind, qubit in enumerate(qubits):
+        qc_circuit.measure(qr[qubit], cr[qind])
+
+    return qc_circuit
@@ -19,14 +19,22 @@
 Measurement correction filters.
 
 """
-from copy import deepcopy
-from scipy.optimize import minimize
+from copy import copy, deepcopy
+from inspect import signature
 import scipy.linalg as la
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
 import numpy as np
 import qiskit
 from qiskit import QiskitError
 from qiskit.tools import parallel_map
 from qiskit.ignis.verification.tomography import count_keys
+from qiskit.ignis.utils import _project_simplex
+
+# Relative tolerance of the iterative solver of the sparse method, which
+# is passed as ``rtol`` by newer SciPy versions and ``tol`` by older ones
+_SPARSE_TOL = 1e-10
+_GMRES_RTOL = 'rtol' if 'rtol' in signature(spla.gmres).parameters else 'tol'
 
 
 class MeasurementFilter():
@@ -52,6 +60,10 @@ class MeasurementFilter():
 
         self._cal_matrix = cal_matrix
         self._state_labels = state_labels
+        # pseudo inverse and squared spectral norm of the cal matrix. The
+        # cache may be shared with the other filters of a fitter, so it is
+        # replaced instead of cleared when the cal matrix is set.
+        self._cache = {}
 
     @property
     def cal_matrix(self):
@@ -72,10 +84,12 @@ class MeasurementFilter():
     def cal_matrix(self, new_cal_matrix):
         """Set cal_matrix."""
         self._cal_matrix = new_cal_matrix
+        self._cache = {}
 
     def apply(self,
               raw_data,
-              method='least_squares'):
+              method='least_squares',
+              distance=None):
         """Apply the calibration matrix to results.
 
         Args:
@@ -90,11 +104,27 @@ class MeasurementFilter():
 
                  Form 4: a qiskit Result
 
+                 Form 5: a list of counts dictionaries
+
+                 Form 6: a 2-D array of shape `(M, len(state_labels))` of the
+                 counts of `M` experiments
+
             method (str): fitting method. If `None`, then least_squares is used.
 
                 ``pseudo_inverse``: direct inversion of the A matrix
 
-                ``least_squares``: constrained to have physical probabilities
+                ``least_squares``: constrained to have physical probabilities.
+                This is solved by accelerated projected gradient descent
+                onto the non-negative counts with the same total as the
+                raw counts.
+
+                ``sparse``: inversion of the calibration matrix restricted
+                to the observed states, see :func:`TensoredFilter.apply`.
+                This requires counts dictionary data.
+
+            distance (int): for the ``sparse`` method, only states with at
+                most this Hamming distance are coupled. If `None` all
+                observed states are coupled.
 
         Returns:
             dict or list: The corrected data in the same form as `raw_data`
@@ -103,110 +133,164 @@ class MeasurementFilter():
             QiskitError: if `raw_data` is not an integer multiple
                 of the number of calibrated states.
 
+        Additional Information:
+            Data for several experiments, given as a Result, a list of counts
+            dictionaries or a 2-D array, is corrected in a single batch. For
+            the ``pseudo_inverse`` method the pseudo inverse is applied to
+            all experiments as one matrix product. The pseudo inverse is
+            computed once and cached until the ``cal_matrix`` is set, so the
+            ``cal_matrix`` should not be modified in place.
         """
 
         # check forms of raw_data
-        if isinstance(raw_data, dict):
-            # counts dictionary
-            for data_label in raw_data.keys():
-                if data_label not in self._state_labels:
-                    raise QiskitError("Unexpected state label '" + data_label +
-                                      "', verify the fitter's state labels "
-                                      "correspond to the input data")
-            data_format = 0
-            # convert to form2
-            raw_data2 = [np.zeros(len(self._state_labels), dtype=float)]
-            for stateidx, state in enumerate(self._state_labels):
-                raw_data2[0][stateidx] = raw_data.get(state, 0)
-
-        elif isinstance(raw_data, list):
-            size_ratio = len(raw_data)/len(self._state_labels)
-            if len(raw_data) == len(self._state_labels):
-                data_format = 1
-                raw_data2 = [raw_data]
-            elif int(size_ratio) == size_ratio:
-                data_format = 2
-                size_ratio = int(size_ratio)
-                # make the list into chunks the size of state_labels for easier
-                # processing
-                raw_data2 = np.zeros([size_ratio, len(self._state_labels)])
-                for i in range(size_ratio):
-                    raw_data2[i][:] = raw_data[
-                        i * len(self._state_labels):(i + 1)*len(
-                            self._state_labels)]
-            else:
-                raise QiskitError("Data list is not an integer multiple "
-                                  "of the number of calibrated states")
+        if isinstance(raw_data, qiskit.result.result.Result):
+            return self._apply_result(raw_data, method, distance)
 
-        elif isinstance(raw_data, qiskit.result.result.Result):
-
-            # extract out all the counts, re-call the function with the
-            # counts and push back into the new result
-            new_result = deepcopy(raw_data)
-
-            new_counts_list = parallel_map(
-                self._apply_correction,
-                [resultidx for resultidx, _ in enumerate(raw_data.results)],
-                task_args=(raw_data, method))
-
-            for resultidx, new_counts in new_counts_list:
-                new_result.results[resultidx].data.counts = new_counts
-
-            return new_result
-
-        else:
-            raise QiskitError("Unrecognized type for raw_data.")
-
-        if method == 'pseudo_inverse':
-            pinv_cal_mat = la.pinv(self._cal_matrix)
+        if isinstance(raw_data, dict):
+            return self._apply_counts_list([raw_data], method, distance)[0]
+
+        if isinstance(raw_data, list) and raw_data and \
+                all(isinstance(counts, dict) for counts in raw_data):
+            return self._apply_counts_list(raw_data, method, distance)
+
+        if isinstance(raw_data, np.ndarray) and raw_data.ndim == 2:
+            if raw_data.shape[1] != len(self._state_labels):
+                raise QiskitError("Data array does not match the number "
+                                  "of calibrated states")
+            return self._apply_array(raw_data, method)
+
+        if isinstance(raw_data, list):
+            return self._apply_list(raw_data, method)
+
+        raise QiskitError("Unrecognized type for raw_data.")
+
+    def _apply_result(self, raw_data, method, distance):
+        """Apply the calibration matrix to the counts of a Result."""
+        counts_list = [raw_data.get_counts(resultidx)
+                       for resultidx, _ in enumerate(raw_data.results)]
+        return _replace_counts(
+            raw_data, self._apply_counts_list(counts_list, method, distance))
+
+    def _apply_counts_list(self, raw_data, method, distance):
+        """Apply the calibration matrix to a list of counts dictionaries."""
+        index = {label: ind for ind, label in enumerate(self._state_labels)}
+        for counts in raw_data:
+            for data_label in counts:
+                if data_label not in index:
+                    raise QiskitError(
+                        "Unexpected state label '" + data_label +
+                        "', verify the fitter's state labels "
+                        "correspond to the input data")
+        if method == 'sparse':
+            return [self._apply_sparse(counts, distance)
+                    for counts in raw_data]
+        raw_data2 = np.zeros([len(raw_data), len(self._state_labels)])
+        for data_idx, counts in enumerate(raw_data):
+            for state, count in counts.items():
+                raw_data2[data_idx, index[state]] = count
+        raw_data2 = self._apply_array(raw_data2, method)
+
+        # convert back into counts dictionaries
+        new_counts_list = []
+        for row in raw_data2:
+            new_counts_list.append(
+                {state: row[stateidx] for stateidx, state in
+                 enumerate(self._state_labels) if row[stateidx] != 0})
+        return new_counts_list
+
+    def _apply_list(self, raw_data, method):
+        """Apply the calibration matrix to a list of counts of one or more
+        experiments."""
+        size_ratio = len(raw_data)/len(self._state_labels)
+        if len(raw_data) == len(self._state_labels):
+            return self._apply_array([raw_data], method)[0]
+        if int(size_ratio) == size_ratio:
+            # make the list into chunks the size of state_labels for easier
+            # processing
+            raw_data2 = np.reshape(raw_data, [int(size_ratio),
+                                              len(self._state_labels)])
+            # flatten back out the list
+            return self._apply_array(raw_data2, method).flatten()
+        raise QiskitError("Data list is not an integer multiple "
+                          "of the number of calibrated states")
 
-        # Apply the correction
-        for data_idx, _ in enumerate(raw_data2):
+    def apply_memory(self,
+                     memory,
+                     method='least_squares',
+                     distance=None,
+                     chunk_size=2 ** 16):
+        """Apply the calibration matrix to single-shot measurement memory.
 
-            if method == 'pseudo_inverse':
-                raw_data2[data_idx] = np.dot(
-                    pinv_cal_mat, raw_data2[data_idx])
+        Args:
+            memory (list or np.ndarray or iterable): The measured outcomes of
+                the shots of one experiment. Can be a list of bitstrings as
+                returned by ``result.get_memory``, a 1-D array of the integer
+                values of the outcomes, a 2-D array of shape
+                ``(shots, num_clbits)`` of the bits of the outcomes with
+                column ``j`` for classical bit ``j``, or an iterable of such
+                chunks of shots.
 
-            elif method == 'least_squares':
-                nshots = sum(raw_data2[data_idx])
+            method (str): fitting method, see :func:`apply`.
 
-                def fun(x):
-                    return sum(
-                        (raw_data2[data_idx] - np.dot(self._cal_matrix, x))**2)
-                x0 = np.random.rand(len(self._state_labels))
-                x0 = x0 / sum(x0)
-                cons = ({'type': 'eq', 'fun': lambda x: nshots - sum(x)})
-                bnds = tuple((0, nshots) for x in x0)
-                res = minimize(fun, x0, method='SLSQP',
-                               constraints=cons, bounds=bnds, tol=1e-6)
-                raw_data2[data_idx] = res.x
+            distance (int): for the ``sparse`` method, only states with at
+                most this Hamming distance are coupled.
 
-            else:
-                raise QiskitError("Unrecognized method.")
+            chunk_size (int): the maximum number of shots converted at once.
 
-        if data_format == 2:
-            # flatten back out the list
-            raw_data2 = raw_data2.flatten()
-
-        elif data_format == 0:
-            # convert back into a counts dictionary
-            new_count_dict = {}
-            for stateidx, state in enumerate(self._state_labels):
-                if raw_data2[0][stateidx] != 0:
-                    new_count_dict[state] = raw_data2[0][stateidx]
+        Returns:
+            dict: The corrected counts dictionary.
 
-            raw_data2 = new_count_dict
-        else:
-            # TODO: should probably change to:
-            # raw_data2 = raw_data2[0].tolist()
-            raw_data2 = raw_data2[0]
-        return raw_data2
+        Additional Information:
+            The shots are converted to integer outcomes chunk by chunk and
+            accumulated in a histogram of the distinct outcomes, so the
+            memory used is bounded by ``chunk_size`` and the number of
+            distinct outcomes instead of the number of shots.
+        """
+        num_bits = len(self._state_labels[0])
+        return self.apply(_memory_counts(memory, num_bits, chunk_size),
+                          method, distance)
 
-    def _apply_correction(self, resultidx, raw_data, method):
-        """Wrapper to call apply with a counts dictionary."""
-        new_counts = self.apply(
-            raw_data.get_counts(resultidx), method=method)
-        return resultidx, new_counts
+    def _apply_array(self, raw_data, method):
+        """Apply the calibration matrix to each row of a counts array."""
+        raw_data2 = np.array(raw_data, dtype=float)
+        if method == 'pseudo_inverse':
+            if 'pinv' not in self._cache:
+                self._cache['pinv'] = np.asarray(la.pinv(self._cal_matrix))
+            return raw_data2 @ self._cache['pinv'].T
+
+        if method == 'least_squares':
+            if 'norm' not in self._cache:
+                self._cache['norm'] = \
+                    la.norm(np.asarray(self._cal_matrix), 2) ** 2
+            # the experiments are fitted in parallel, as each fit is an
+            # iterative solve
+            new_rows = parallel_map(self._least_squares, list(raw_data2),
+                                    task_args=(self._cache['norm'],))
+            return np.reshape(new_rows, raw_data2.shape)
+
+        raise QiskitError("Unrecognized method.")
+
+    def _least_squares(self, raw_data, lipschitz):
+        """Return the constrained least squares counts of one experiment."""
+        cal_mat = np.asarray(self._cal_matrix)
+        return _constrained_least_squares(cal_mat.dot, cal_mat.T.dot,
+                                          raw_data, lipschitz)
+
+    def _apply_sparse(self, raw_data, distance):
+        """Apply the calibration matrix restricted to the observed states."""
+        states = list(raw_data)
+        index = {label: ind for ind, label in enumerate(self._state_labels)}
+        inds = np.array([index[state] for state in states], dtype=int)
+        cal_mat = np.asarray(self._cal_matrix)
+
+        def elements(rows, cols):
+            return cal_mat[inds[rows], inds[cols]]
+
+        keys = np.array([int(state, 2) for state in states], dtype=np.int64)
+        counts = np.array(list(raw_data.values()), dtype=float)
+        new_counts = _sparse_solve(keys, counts, elements, distance)
+        return {state: count for state, count in zip(states, new_counts)
+                if count != 0}
 
 
 class TensoredFilter():
@@ -219,7 +303,8 @@ class TensoredFilter():
 
     def __init__(self,
                  cal_matrices: np.matrix,
-                 substate_labels_list: list):
+                 substate_labels_list: list,
+                 positions_list: list = None):
         """
         Initialize a tensored measurement error mitigation filter using
         the cal_matrices from a tensored measurement calibration fitter.
@@ -228,14 +313,42 @@ class TensoredFilter():
             cal_matrices: the calibration matrices for applying the correction.
             substate_labels_list: for each calibration matrix
                 a list of the states (as strings, states in the subspace)
+            positions_list: for each calibration matrix the positions of
+                its qubits in the state labels of the data, with position 0
+                the rightmost bit. If `None`, the first calibration matrix is
+                of the rightmost bits and each following matrix of the next
+                bits.
+
+        Raises:
+            QiskitError: if the positions_list is not a partition of the
+                positions of the state labels into the calibration matrices.
         """
 
         self._cal_matrices = cal_matrices
+        # pseudo inverses and squared spectral norms of the cal matrices. The
+        # cache may be shared with the other filters of a fitter, so it is
+        # replaced instead of cleared when the cal matrices are set.
+        self._cache = {}
         self._qubit_list_sizes = []
         self._indices_list = []
+        self._index_perms = []
         self._substate_labels_list = []
         self.substate_labels_list = substate_labels_list
 
+        # the position in the state labels of each bit of the block ordered
+        # states, with the bits of the first calibration matrix first
+        self._bit_order = None
+        if positions_list is not None:
+            sizes = [len(positions) for positions in positions_list]
+            bit_order = [int(pos) for positions in positions_list
+                         for pos in positions]
+            if sizes != self._qubit_list_sizes or \
+                    sorted(bit_order) != list(range(self.nqubits)):
+                raise QiskitError("The positions_list does not match the "
+                                  "qubits of the calibration matrices")
+            if bit_order != list(range(self.nqubits)):
+                self._bit_order = bit_order
+
     @property
     def cal_matrices(self):
         """Return cal_matrices."""
@@ -245,6 +358,7 @@ class TensoredFilter():
     def cal_matrices(self, new_cal_matrices):
         """Set cal_matrices."""
         self._cal_matrices = deepcopy(new_cal_matrices)
+        self._cache = {}
 
     @property
     def substate_labels_list(self):
@@ -269,6 +383,12 @@ class TensoredFilter():
             self._indices_list.append(
                 {lab: ind for ind, lab in enumerate(sub_labels)})
 
+        # get the calibration matrix index of each integer substate
+        self._index_perms = []
+        for size, indices in zip(self._qubit_list_sizes, self._indices_list):
+            self._index_perms.append(np.array(
+                [indices[label] for label in count_keys(size)], dtype=int))
+
     @property
     def qubit_list_sizes(self):
         """Return _qubit_list_sizes."""
@@ -279,158 +399,530 @@ class TensoredFilter():
         """Return the number of qubits. See also MeasurementFilter.apply() """
         return sum(self._qubit_list_sizes)
 
-    def apply(self, raw_data, method='least_squares'):
+    def apply(self, raw_data, method='least_squares', distance=None):
         """
         Apply the calibration matrices to results.
 
         Args:
-            raw_data (dict or Result): The data to be corrected. Can be in one of two forms:
+            raw_data (dict or Result): The data to be corrected. Can be in one of four forms:
 
                 * A counts dictionary from results.get_counts
 
                 * A Qiskit Result
 
+                * A list of counts dictionaries
+
+                * A 2-D array of shape ``(M, 2**nqubits)`` of the counts of
+                  ``M`` experiments, indexed by the integer value of the
+                  state labels
+
             method (str): fitting method. The following methods are supported:
 
                 * 'pseudo_inverse': direct inversion of the cal matrices.
 
                 * 'least_squares': constrained to have physical probabilities.
+                  This is solved by accelerated projected gradient descent
+                  using products with the tensored cal matrices.
+
+                * 'sparse': inversion of the calibration matrix restricted
+                  to the observed states. The restricted matrix columns are
+                  renormalized and the linear system is solved with GMRES,
+                  so memory scales with the number of observed states
+                  instead of ``2**nqubits``.
 
                 * If `None`, 'least_squares' is used.
 
+            distance (int): for the 'sparse' method, only states with at
+                most this Hamming distance are coupled, which makes the
+                restricted matrix sparse. If `None` all observed states are
+                coupled, and the restricted matrix elements are recomputed
+                for each iteration of the solver instead of being stored.
+
         Returns:
             dict or Result: The corrected data in the same form as raw_data
 
         Raises:
             QiskitError: if raw_data is not in a one of the defined forms.
-        """
 
-        all_states = count_keys(self.nqubits)
-        num_of_states = 2**self.nqubits
+        Additional Information:
+            The 'sparse' method follows the matrix-free measurement
+            mitigation of Nation et al., PRX Quantum 2, 040326 (2021).
+            Like 'pseudo_inverse' the corrected counts may be negative.
+
+            Data for several experiments is corrected in a single batch. The
+            pseudo inverses of the cal matrices are computed once and cached
+            until the ``cal_matrices`` are set, so the ``cal_matrices``
+            should not be modified in place.
+        """
 
         # check forms of raw_data
+        if isinstance(raw_data, qiskit.result.result.Result):
+            counts_list = [raw_data.get_counts(resultidx)
+                           for resultidx, _ in enumerate(raw_data.results)]
+            return _replace_counts(
+                raw_data, self.apply(counts_list, method, distance))
+
         if isinstance(raw_data, dict):
-            # counts dictionary
-            # convert to list
-            raw_data2 = [np.zeros(num_of_states, dtype=float)]
-            for state, count in raw_data.items():
-                stateidx = int(state, 2)
-                raw_data2[0][stateidx] = count
+            return self.apply([raw_data], method, distance)[0]
 
-        elif isinstance(raw_data, qiskit.result.result.Result):
+        num_of_states = 2**self.nqubits
 
-            # extract out all the counts, re-call the function with the
-            # counts and push back into the new result
-            new_result = deepcopy(raw_data)
+        if isinstance(raw_data, list) and \
+                all(isinstance(counts, dict) for counts in raw_data):
+            if method == 'sparse':
+                return [self._permute_counts(
+                    self._apply_sparse(self._permute_counts(counts),
+                                       distance), inverse=True)
+                        for counts in raw_data]
+            # convert to an array
+            raw_data2 = np.zeros([len(raw_data), num_of_states], dtype=float)
+            for data_idx, counts in enumerate(raw_data):
+                for state, count in counts.items():
+                    raw_data2[data_idx, int(state, 2)] = count
+            raw_data2 = self._apply_label_array(raw_data2, method)
+
+            # convert back into counts dictionaries
+            all_states = count_keys(self.nqubits)
+            new_counts_list = []
+            for row in raw_data2:
+                new_counts_list.append(
+                    {all_states[state_idx]: row[state_idx]
+                     for state_idx in np.flatnonzero(row)})
+            return new_counts_list
+
+        if isinstance(raw_data, np.ndarray) and raw_data.ndim == 2:
+            if raw_data.shape[1] != num_of_states:
+                raise QiskitError("Data array does not match the number "
+                                  "of calibrated states")
+            return self._apply_label_array(raw_data, method)
+
+        raise QiskitError("Unrecognized type for raw_data.")
+
+    def apply_memory(self, memory, method='least_squares', distance=None,
+                     chunk_size=2 ** 16):
+        """
+        Apply the calibration matrices to single-shot measurement memory.
 
-            new_counts_list = parallel_map(
-                self._apply_correction,
-                [resultidx for resultidx, _ in enumerate(raw_data.results)],
-                task_args=(raw_data, method))
+        Args:
+            memory (list or np.ndarray or iterable): The measured outcomes of
+                the shots of one experiment, in one of the forms accepted by
+                :func:`MeasurementFilter.apply_memory`, or an iterable of
+                chunks of shots.
+
+            method (str): fitting method, see :func:`apply`.
 
-            for resultidx, new_counts in new_counts_list:
-                new_result.results[resultidx].data.counts = new_counts
+            distance (int): for the 'sparse' method, only states with at
+                most this Hamming distance are coupled.
 
-            return new_result
+            chunk_size (int): the maximum number of shots converted at once.
 
-        else:
-            raise QiskitError("Unrecognized type for raw_data.")
+        Returns:
+            dict: The corrected counts dictionary.
 
+        Additional Information:
+            The shots are accumulated chunk by chunk in a histogram of the
+            distinct outcomes. With the 'sparse' method the memory used is
+            bounded by ``chunk_size`` and the number of distinct outcomes,
+            so large numbers of shots of many qubits can be mitigated.
+        """
+        return self.apply(_memory_counts(memory, self.nqubits, chunk_size),
+                          method, distance)
+
+    def _permute_counts(self, counts, inverse=False):
+        """Reorder the bits of the states of a counts dictionary from the
+        state labels to the calibration matrices, or back if inverse."""
+        if self._bit_order is None:
+            return counts
+        order = self._bit_order
+        if inverse:
+            order = list(np.argsort(order))
+        num_bits = self.nqubits
+        return {''.join(state[num_bits - 1 - order[bit]]
+                        for bit in reversed(range(num_bits))): count
+                for state, count in counts.items()}
+
+    def _apply_label_array(self, raw_data, method):
+        """Apply the calibration matrices to each row of a counts array
+        indexed by the integer value of the state labels."""
+        if self._bit_order is None:
+            return self._apply_array(raw_data, method)
+        # the state label index of each block ordered state
+        states = np.arange(2 ** self.nqubits)
+        perm = np.zeros(len(states), dtype=int)
+        for bit, pos in enumerate(self._bit_order):
+            perm |= ((states >> bit) & 1) << pos
+        raw_data2 = np.asarray(raw_data, dtype=float)
+        new_data = np.empty_like(raw_data2)
+        new_data[:, perm] = self._apply_array(raw_data2[:, perm], method)
+        return new_data
+
+    def _apply_array(self, raw_data, method):
+        """Apply the calibration matrices to each row of a counts array."""
+        raw_data2 = np.array(raw_data, dtype=float)
         if method == 'pseudo_inverse':
-            pinv_cal_matrices = []
-            for cal_mat in self._cal_matrices:
-                pinv_cal_matrices.append(la.pinv(cal_mat))
-
-        # Apply the correction
-        for data_idx, _ in enumerate(raw_data2):
-
-            if method == 'pseudo_inverse':
-                inv_mat_dot_raw = np.zeros([num_of_states], dtype=float)
-                for state1_idx, state1 in enumerate(all_states):
-                    for state2_idx, state2 in enumerate(all_states):
-                        if raw_data2[data_idx][state2_idx] == 0:
-                            continue
-
-                        product = 1.
-                        end_index = self.nqubits
-                        for p_ind, pinv_mat in enumerate(pinv_cal_matrices):
-
-                            start_index = end_index - \
-                                self._qubit_list_sizes[p_ind]
-
-                            state1_as_int = \
-                                self._indices_list[p_ind][
-                                    state1[start_index:end_index]]
-
-                            state2_as_int = \
-                                self._indices_list[p_ind][
-                                    state2[start_index:end_index]]
-
-                            end_index = start_index
-                            product *= \
-                                pinv_mat[state1_as_int][state2_as_int]
-                            if product == 0:
-                                break
-                        inv_mat_dot_raw[state1_idx] += \
-                            (product * raw_data2[data_idx][state2_idx])
-                raw_data2[data_idx] = inv_mat_dot_raw
-
-            elif method == 'least_squares':
-
-                def fun(x):
-                    mat_dot_x = np.zeros([num_of_states], dtype=float)
-                    for state1_idx, state1 in enumerate(all_states):
-                        mat_dot_x[state1_idx] = 0.
-                        for state2_idx, state2 in enumerate(all_states):
-                            if x[state2_idx] != 0:
-                                product = 1.
-                                end_index = self.nqubits
-                                for c_ind, cal_mat in \
-                                        enumerate(self._cal_matrices):
-
-                                    start_index = end_index - \
-                                        self._qubit_list_sizes[c_ind]
-
-                                    state1_as_int = \
-                                        self._indices_list[c_ind][
-                                            state1[start_index:end_index]]
-
-                                    state2_as_int = \
-                                        self._indices_list[c_ind][
-                                            state2[start_index:end_index]]
-
-                                    end_index = start_index
-                                    product *= \
-                                        cal_mat[state1_as_int][state2_as_int]
-                                    if product == 0:
-                                        break
-                                mat_dot_x[state1_idx] += \
-                                    (product * x[state2_idx])
-                    return sum(
-                        (raw_data2[data_idx] - mat_dot_x)**2)
-
-                x0 = np.random.rand(num_of_states)
-                x0 = x0 / sum(x0)
-                nshots = sum(raw_data2[data_idx])
-                cons = ({'type': 'eq', 'fun': lambda x: nshots - sum(x)})
-                bnds = tuple((0, nshots) for x in x0)
-                res = minimize(fun, x0, method='SLSQP',
-                               constraints=cons, bounds=bnds, tol=1e-6)
-                raw_data2[data_idx] = res.x
+            if 'pinv' not in self._cache:
+                self._cache['pinv'] = [la.pinv(cal_mat)
+                                       for cal_mat in self._cal_matrices]
+            return self._tensored_dot(self._cache['pinv'], raw_data2)
+
+        if method == 'least_squares':
+            # the spectral norm of a tensor product is the product of norms
+            if 'norms' not in self._cache:
+                self._cache['norms'] = [la.norm(np.asarray(cal_mat), 2) ** 2
+                                        for cal_mat in self._cal_matrices]
+            # the experiments are fitted in parallel, as each fit is an
+            # iterative solve
+            new_rows = parallel_map(self._least_squares, list(raw_data2),
+                                    task_args=(np.prod(self._cache['norms']),))
+            return np.reshape(new_rows, raw_data2.shape)
+
+        raise QiskitError("Unrecognized method.")
+
+    def _least_squares(self, raw_data, lipschitz):
+        """Return the constrained least squares counts of one experiment."""
+        cal_matrices = [np.asarray(cal_mat) for cal_mat in self._cal_matrices]
+        cal_matrices_t = [cal_mat.T for cal_mat in cal_matrices]
+        return _constrained_least_squares(
+            lambda x: self._tensored_dot(cal_matrices, x),
+            lambda x: self._tensored_dot(cal_matrices_t, x),
+            raw_data, lipschitz)
+
+    def _tensored_dot(self, matrices, vec):
+        """Return the product of the tensored matrices with a vector.
+
+        The vector is reshaped to a tensor with one axis for each
+        calibration block, and each block matrix is contracted with its
+        axis, instead of forming the full ``2**nqubits`` square matrix.
+
+        Args:
+            matrices (list): a matrix for each calibration block, in the
+                ordering of the cal matrices.
+            vec (np.ndarray): a vector of length ``2**nqubits`` indexed by
+                the integer value of the state labels, or a 2-D array with
+                such a vector in each row.
 
+        Returns:
+            np.ndarray: the vector, or each row of the array, multiplied by
+            the tensor product of the matrices.
+        """
+        # the first calibration block is the least significant axis, after
+        # the leading axis of the rows
+        num_blocks = len(matrices)
+        shape = np.shape(vec)
+        tensor = np.reshape(vec, [-1] + [2 ** size for size in
+                                         reversed(self._qubit_list_sizes)])
+        for ind, (mat, perm) in enumerate(zip(matrices, self._index_perms)):
+            mat = np.asarray(mat)[np.ix_(perm, perm)]
+            axis = num_blocks - ind
+            tensor = np.moveaxis(np.tensordot(mat, tensor, axes=(1, axis)),
+                                 0, axis)
+        return tensor.reshape(shape)
+
+    def _apply_sparse(self, raw_data, distance):
+        """Apply the calibration matrices restricted to the observed states."""
+        states = list(raw_data)
+        keys = _memory_keys(states, self.nqubits)
+        counts = np.array(list(raw_data.values()), dtype=float)
+        if keys.ndim == 2:
+            # the bits of the packed states, least significant bit first
+            bits = np.unpackbits(keys, axis=1, count=self.nqubits)[:, ::-1]
+
+        # the calibration matrix index of each state in each block
+        block_inds = []
+        offset = 0
+        for size, perm in zip(self._qubit_list_sizes, self._index_perms):
+            if keys.ndim == 2:
+                substates = bits[:, offset:offset + size].astype(np.int64) \
+                    @ (1 << np.arange(size))
             else:
-                raise QiskitError("Unrecognized method.")
+                substates = (keys >> offset) & (2 ** size - 1)
+            block_inds.append(perm[substates])
+            offset += size
+        cal_matrices = [np.asarray(cal_mat) for cal_mat in self._cal_matrices]
+
+        def elements(rows, cols):
+            vals = np.ones(len(rows))
+            for cal_mat, inds in zip(cal_matrices, block_inds):
+                vals *= cal_mat[inds[rows], inds[cols]]
+            return vals
+
+        new_counts = _sparse_solve(keys, counts, elements, distance)
+        return {state: count for state, count in zip(states, new_counts)
+                if count != 0}
 
-        # convert back into a counts dictionary
-        new_count_dict = {}
-        for state_idx, state in enumerate(all_states):
-            if raw_data2[0][state_idx] != 0:
-                new_count_dict[state] = raw_data2[0][state_idx]
 
-        return new_count_dict
+def _replace_counts(result, counts_list):
+    """Return a copy of a result with new counts for each experiment.
 
-    def _apply_correction(self, resultidx, raw_data, method):
-        """Wrapper to call apply with a counts dictionary."""
-        new_counts = self.apply(
-            raw_data.get_counts(resultidx), method=method)
-        return resultidx, new_counts
+    Only the result containers and experiment data are copied, so all
+    other experiment data is shared with the original result.
+    """
+    new_result = copy(result)
+    new_result.results = []
+    for exp_result, counts in zip(result.results, counts_list):
+        exp_result = copy(exp_result)
+        exp_result.data = copy(exp_result.data)
+        exp_result.data.counts = counts
+        new_result.results.append(exp_result)
+    return new_result
+
+
+def _memory_counts(memory, num_bits, chunk_size=2 ** 16):
+    """Return the counts dictionary of single-shot measurement memory.
+
+    Args:
+        memory (list or np.ndarray or iterable): the measured outcomes, or an
+            iterable of chunks of measured outcomes.
+        num_bits (int): the number of classical bits of the outcomes.
+        chunk_size (int): the maximum number of shots converted at once.
+
+    Returns:
+        dict: the counts of the distinct outcomes.
+
+    Raises:
+        QiskitError: if the memory is not in one of the supported forms.
+    """
+    if isinstance(memory, np.ndarray) or (
+            isinstance(memory, list) and
+            (not memory or isinstance(memory[0], (str, int, np.integer)))):
+        memory = [memory]
+
+    if num_bits <= 20:
+        # a packed histogram indexed by the integer outcomes
+        histogram = np.zeros(2 ** num_bits, dtype=np.int64)
+        for chunk in memory:
+            for start in range(0, len(chunk), chunk_size):
+                histogram += np.bincount(
+                    _memory_keys(chunk[start:start + chunk_size], num_bits),
+                    minlength=len(histogram))
+        keys = np.flatnonzero(histogram)
+        counts = histogram[keys]
+    else:
+        # sorted histograms of the distinct outcomes, with the histograms of
+        # new chunks merged once they are as large as the accumulated one
+        keys = _memory_keys(np.zeros((0, num_bits)), num_bits)
+        counts = np.zeros(0, dtype=np.int64)
+        pending = []
+        num_pending = 0
+        for chunk in memory:
+            for start in range(0, len(chunk), chunk_size):
+                pending.append(_unique_keys(
+                    _memory_keys(chunk[start:start + chunk_size], num_bits),
+                    return_counts=True))
+                num_pending += len(pending[-1][0])
+                if num_pending >= len(keys):
+                    keys, counts = _merge_histograms([(keys, counts)]
+                                                     + pending)
+                    pending = []
+                    num_pending = 0
+        keys, counts = _merge_histograms([(keys, counts)] + pending)
+
+    if keys.ndim == 2:
+        bits = np.unpackbits(keys, axis=1, count=num_bits) + ord('0')
+        return {row.tobytes().decode(): int(count)
+                for row, count in zip(bits, counts)}
+    return {format(key, '0{}b'.format(num_bits)): int(count)
+            for key, count in zip(keys, counts)}
+
+
+def _merge_histograms(histograms):
+    """Return the sum of histograms given as outcome and count arrays."""
+    keys, inverse = _unique_keys(
+        np.concatenate([keys for keys, _ in histograms]), return_inverse=True)
+    counts = np.zeros(len(keys), dtype=np.int64)
+    np.add.at(counts, inverse,
+              np.concatenate([counts for _, counts in histograms]))
+    return keys, counts
+
+
+def _memory_keys(chunk, num_bits):
+    """Return the outcomes of a chunk of measurement memory.
+
+    The outcomes are integers for at most 62 bits. For more bits they are
+    rows of the bits packed into bytes, most significant bit first, so that
+    the rows are ordered as the outcomes.
+    """
+    packed = num_bits > 62
+    if isinstance(chunk, np.ndarray) and chunk.ndim == 2:
+        if chunk.shape[1] != num_bits:
+            raise QiskitError("Memory array does not match the number "
+                              "of calibrated qubits")
+        # the bits with the most significant bit first
+        bits = np.asarray(chunk, dtype=np.uint8)[:, ::-1]
+    elif len(chunk) and isinstance(chunk[0], str):
+        if chunk[0].startswith('0x'):
+            if not packed:
+                return np.array([int(shot, 16) for shot in chunk],
+                                dtype=np.int64)
+            chunk = [format(int(shot, 16), '0{}b'.format(num_bits))
+                     for shot in chunk]
+        if ' ' in chunk[0]:
+            chunk = [shot.replace(' ', '') for shot in chunk]
+        # the characters of fixed length bitstrings as an array of bits
+        bits = np.frombuffer(''.join(chunk).encode(), dtype=np.uint8)
+        if len(bits) != len(chunk) * num_bits:
+            raise QiskitError("Memory bitstrings do not match the number "
+                              "of calibrated qubits")
+        bits = bits.reshape(len(chunk), num_bits) - ord('0')
+    elif isinstance(chunk, (list, np.ndarray)):
+        if not packed:
+            return np.asarray(chunk, dtype=np.int64)
+        bits = np.array([[int(bit) for bit in
+                          format(int(shot), '0{}b'.format(num_bits))]
+                         for shot in chunk], dtype=np.uint8)
+        bits = bits.reshape(len(chunk), num_bits)
+    else:
+        raise QiskitError("Unrecognized type for memory.")
+    if packed:
+        return np.packbits(bits, axis=1)
+    return bits.astype(np.int64) @ \
+        (1 << np.arange(num_bits - 1, -1, -1, dtype=np.int64))
+
+
+def _unique_keys(keys, **kwargs):
+    """Return the unique outcomes of :func:`_memory_keys`, see np.unique."""
+    return np.unique(keys, axis=0 if keys.ndim == 2 else None, **kwargs)
+
+
+def _constrained_least_squares(matvec, rmatvec, raw_data, lipschitz,
+                               tol=1e-10, max_iter=1000):
+    r"""Return the physical counts closest to the raw counts.
+
+    Minimizes :math:`\|A.x - b\|^2` subject to :math:`x \ge 0` and
+    :math:`\sum_i x_i = \sum_i b_i` using the accelerated projected
+    gradient method (FISTA) with adaptive restart. The matrix :math:`A` is
+    only used through matrix-vector products so structured calibration
+    matrices never need to be formed.
+
+    Args:
+        matvec (callable): function returning :math:`A.x`.
+        rmatvec (callable): function returning :math:`A^T.x`.
+        raw_data (np.ndarray): the raw counts :math:`b`.
+        lipschitz (float): the squared spectral norm of :math:`A`.
+        tol (float): convergence tolerance on the change of the
+            probabilities between iterations.
+        max_iter (int): the maximum number of iterations.
+
+    Returns:
+        np.ndarray: the constrained least squares counts.
+    """
+    nshots = np.sum(raw_data)
+    if nshots <= 0:
+        return np.zeros(len(raw_data))
+    probs = np.asarray(raw_data, dtype=float) / nshots
+    step_size = 1 / max(lipschitz, 1e-12)
+
+    x = _project_simplex(probs, 1)
+    resid = matvec(x) - probs
+    fval = np.dot(resid, resid)
+    momentum = x
+    step = 1.
+    for _ in range(max_iter):
+        grad = rmatvec(matvec(momentum) - probs)
+        x_next = _project_simplex(momentum - step_size * grad, 1)
+        resid = matvec(x_next) - probs
+        fval_next = np.dot(resid, resid)
+
+        # Adaptive restart of the momentum if the objective increases
+        if fval_next > fval and step > 1:
+            momentum = x
+            step = 1.
+            continue
+
+        change = la.norm(x_next - x)
+        step_next = 0.5 * (1 + np.sqrt(1 + 4 * step ** 2))
+        momentum = x_next + ((step - 1) / step_next) * (x_next - x)
+        x, fval, step = x_next, fval_next, step_next
+        if change <= tol:
+            break
+    return nshots * x
+
+
+def _sparse_solve(keys, counts, elements, distance=None, chunk=2 ** 22):
+    """Solve the calibration matrix restricted to the observed states.
+
+    Args:
+        keys (np.ndarray): the observed states as returned by
+            :func:`_memory_keys`.
+        counts (np.ndarray): the counts of the observed states.
+        elements (callable): function returning the calibration matrix
+            elements for arrays of row and column indices into ``keys``.
+        distance (int): the maximum Hamming distance of coupled states, or
+            `None` to couple all states. If `None` the matrix is not
+            stored, and its elements are recomputed for each product of
+            the iterative solver.
+        chunk (int): the maximum number of state pairs to evaluate at once.
+
+    Returns:
+        np.ndarray: the corrected counts of the observed states.
+
+    Raises:
+        QiskitError: if the iterative solver does not converge.
+    """
+    num_states = len(keys)
+    shots = np.sum(counts)
+    # the bytes of packed states also count towards the chunk size
+    step = max(1, chunk // (num_states * int(np.prod(keys.shape[1:]))))
+
+    def pairs():
+        for start in range(0, num_states, step):
+            sub_keys = keys[start:start + step]
+            if distance is None:
+                row, col = np.indices((len(sub_keys), num_states))
+                row, col = row.ravel(), col.ravel()
+            else:
+                dist = _popcount(sub_keys[:, None] ^ keys[None, :])
+                if keys.ndim == 2:
+                    # the sum over the bytes of packed states
+                    dist = np.sum(dist, axis=-1)
+                row, col = np.nonzero(dist <= distance)
+            yield start, row + start, col
+
+    # Renormalize the columns to the probability kept on the observed states
+    col_sums = np.zeros(num_states)
+    if distance is None:
+        for _, row, col in pairs():
+            col_sums += np.bincount(col, weights=elements(row, col),
+                                    minlength=num_states)
+
+        def matvec(vec):
+            vec = np.ravel(vec) / col_sums
+            out = np.empty(num_states)
+            for start, row, col in pairs():
+                vals = elements(row, col).reshape(-1, num_states)
+                out[start:start + len(vals)] = vals @ vec
+            return out
+
+        cal_mat = spla.LinearOperator((num_states, num_states),
+                                      matvec=matvec)
+        diag = elements(np.arange(num_states),
+                        np.arange(num_states)) / col_sums
+    else:
+        rows, cols = [], []
+        for _, row, col in pairs():
+            rows.append(row)
+            cols.append(col)
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        vals = elements(rows, cols)
+        col_sums += np.bincount(cols, weights=vals, minlength=num_states)
+        cal_mat = sp.csr_matrix((vals / col_sums[cols], (rows, cols)),
+                                shape=(num_states, num_states))
+        diag = cal_mat.diagonal()
+
+    probs = counts / shots
+    precond = spla.LinearOperator(cal_mat.shape, matvec=lambda x: x / diag)
+    sol, info = spla.gmres(cal_mat, probs, x0=probs, M=precond, atol=0,
+                           **{_GMRES_RTOL: _SPARSE_TOL})
+    if info != 0:
+        raise QiskitError("Sparse mitigation solver did not converge.")
+    return shots * sol
+
+
+def _popcount(vals):
+    """Return the number of set bits of each integer of an array."""
+    count = np.zeros(vals.shape, dtype=int)
+    while np.any(vals):
+        count += vals & 1
+        vals = vals >> 1
+    return count
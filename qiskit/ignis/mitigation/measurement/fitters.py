@@ -18,10 +18,11 @@
 """
 Measurement correction fitters.
 """
-from typing import List, Union
+from typing import List, Union, Optional
 import copy
 import re
 import numpy as np
+from scipy.stats import chi2
 from qiskit import QiskitError
 from qiskit.result import Result
 from qiskit.ignis.verification.tomography import count_keys
@@ -44,7 +45,8 @@ class CompleteMeasFitter:
                  results: Union[Result, List[Result]],
                  state_labels: List[str],
                  qubit_list: List[int] = None,
-                 circlabel: str = ''):
+                 circlabel: str = '',
+                 decay: Optional[float] = None):
         """
         Initialize a measurement calibration matrix from the results of running
         the circuits returned by `measurement_calibration_circuits`
@@ -62,15 +64,21 @@ class CompleteMeasFitter:
                 subset is needed). If `None`, the qubit_list will be
                 created according to the length of state_labels[0].
             circlabel: if the qubits were labeled.
+            decay: the factor by which the weight of the calibration counts
+                decays for every later result added. See
+                :class:`TensoredMeasFitter`.
         """
         if qubit_list is None:
             qubit_list = range(len(state_labels[0]))
         self._qubit_list = qubit_list
+        # the pseudo inverse and norm of the cal matrix shared by the filters
+        self._filter_cache = {}
 
         self._tens_fitt = TensoredMeasFitter(results,
                                              [qubit_list],
                                              [state_labels],
-                                             circlabel)
+                                             circlabel,
+                                             decay)
 
     @property
     def cal_matrix(self):
@@ -81,6 +89,7 @@ class CompleteMeasFitter:
     def cal_matrix(self, new_cal_matrix):
         """set cal_matrix."""
         self._tens_fitt.cal_matrices = [copy.deepcopy(new_cal_matrix)]
+        self._filter_cache = {}
 
     @property
     def state_labels(self):
@@ -99,8 +108,14 @@ class CompleteMeasFitter:
 
     @property
     def filter(self):
-        """Return a measurement filter using the cal matrix."""
-        return MeasurementFilter(self.cal_matrix, self.state_labels)
+        """Return a measurement filter using the cal matrix.
+
+        The filters share the pseudo inverse of the cal matrix until it is
+        rebuilt or set, so it is only computed once.
+        """
+        meas_filter = MeasurementFilter(self.cal_matrix, self.state_labels)
+        meas_filter._cache = self._filter_cache
+        return meas_filter
 
     def add_data(self, new_results, rebuild_cal_matrix=True):
         """
@@ -113,6 +128,8 @@ class CompleteMeasFitter:
         """
 
         self._tens_fitt.add_data(new_results, rebuild_cal_matrix)
+        if rebuild_cal_matrix:
+            self._filter_cache = {}
 
     def subset_fitter(self, qubit_sublist=None):
         """
@@ -142,46 +159,33 @@ class CompleteMeasFitter:
 
         # build state labels
         new_state_labels = count_keys(len(qubit_sublist))
+        num_states = len(new_state_labels)
 
         # mapping between indices in the state_labels and the qubits in
         # the sublist
-        qubit_sublist_ind = []
-        for sqb in qubit_sublist:
-            for qbind, qubit in enumerate(self._qubit_list):
-                if qubit == sqb:
-                    qubit_sublist_ind.append(qbind)
-
-        # states in the full calibration which correspond
-        # to the reduced labels
-        q_q_mapping = []
-        state_labels_reduced = []
-        for label in self.state_labels:
-            tmplabel = [label[index] for index in qubit_sublist_ind]
-            state_labels_reduced.append(''.join(tmplabel))
-
-        for sub_lab_ind, _ in enumerate(new_state_labels):
-            q_q_mapping.append([])
-            for labelind, label in enumerate(state_labels_reduced):
-                if label == new_state_labels[sub_lab_ind]:
-                    q_q_mapping[-1].append(labelind)
+        qubit_list = list(self._qubit_list)
+        qubit_sublist_ind = [qubit_list.index(sqb) for sqb in qubit_sublist]
+
+        # index of the reduced label of each state in the full calibration
+        bits = np.array([[char == '1' for char in label]
+                         for label in self.state_labels], dtype=int)
+        place_values = 2 ** np.arange(len(qubit_sublist))[::-1]
+        reduced_ind = bits[:, qubit_sublist_ind] @ place_values
 
         new_fitter = CompleteMeasFitter(results=None,
                                         state_labels=new_state_labels,
                                         qubit_list=qubit_sublist)
 
-        new_cal_matrix = np.zeros([len(new_state_labels),
-                                   len(new_state_labels)])
-
-        # do a partial trace
-        for i in range(len(new_state_labels)):
-            for j in range(len(new_state_labels)):
-
-                for q_q_i_map in q_q_mapping[i]:
-                    for q_q_j_map in q_q_mapping[j]:
-                        new_cal_matrix[i, j] += self.cal_matrix[q_q_i_map,
-                                                                q_q_j_map]
-
-                new_cal_matrix[i, j] /= len(q_q_mapping[i])
+        # do a partial trace by summing the calibration matrix elements
+        # over all pairs of states with the same reduced labels
+        cal_matrix = np.asarray(self.cal_matrix, dtype=float)
+        pair_ind = reduced_ind[:, None] * num_states + reduced_ind[None, :]
+        new_cal_matrix = np.bincount(pair_ind.ravel(),
+                                     weights=cal_matrix.ravel(),
+                                     minlength=num_states ** 2)
+        new_cal_matrix = new_cal_matrix.reshape(num_states, num_states)
+        new_cal_matrix /= np.bincount(reduced_ind,
+                                      minlength=num_states)[:, None]
 
         new_fitter.cal_matrix = new_cal_matrix
 
@@ -230,7 +234,8 @@ class TensoredMeasFitter():
                  results: Union[Result, List[Result]],
                  mit_pattern: List[List[int]],
                  substate_labels_list: List[List[str]] = None,
-                 circlabel: str = ''):
+                 circlabel: str = '',
+                 decay: Optional[float] = None):
         """
         Initialize a measurement calibration matrix from the results of running
         the circuits returned by `measurement_calibration_circuits`.
@@ -250,14 +255,32 @@ class TensoredMeasFitter():
 
             circlabel: if the qubits were labeled
 
+            decay: the factor in (0, 1] by which the weight of the
+                calibration counts decays for every later result added. If
+                `None` all calibration counts have the same weight.
+
         Raises:
             ValueError: if the mit_pattern doesn't match the
                 substate_labels_list
+
+        Additional Information:
+            The calibration counts of each result are accumulated in a
+            count matrix for each calibration matrix when the result is
+            added, so only the columns of the prepared states are updated
+            and the results are not stored. With a ``decay`` the
+            accumulated counts are multiplied by ``decay`` before the counts
+            of each new result are added, giving an exponentially weighted
+            calibration for continuously calibrated drifting devices.
         """
 
-        self._result_list = []
+        if decay is not None and not 0 < decay <= 1:
+            raise ValueError("decay must be in the interval (0, 1]")
         self._cal_matrices = None
+        # the pseudo inverses and norms of the cal matrices shared by the
+        # filters
+        self._filter_cache = {}
         self._circlabel = circlabel
+        self._decay = decay
 
         self._qubit_list_sizes = \
             [len(qubit_list) for qubit_list in mit_pattern]
@@ -278,6 +301,12 @@ class TensoredMeasFitter():
             self._indices_list.append(
                 {lab: ind for ind, lab in enumerate(sub_labels)})
 
+        # accumulated calibration counts of each calibration matrix
+        self._count_matrices = []
+        for list_size in self._qubit_list_sizes:
+            self._count_matrices.append(np.zeros([2**list_size, 2**list_size],
+                                                 dtype=float))
+
         self.add_data(results)
 
     @property
@@ -289,6 +318,7 @@ class TensoredMeasFitter():
     def cal_matrices(self, new_cal_matrices):
         """Set _cal_matrices."""
         self._cal_matrices = copy.deepcopy(new_cal_matrices)
+        self._filter_cache = {}
 
     @property
     def substate_labels_list(self):
@@ -297,14 +327,26 @@ class TensoredMeasFitter():
 
     @property
     def filter(self):
-        """Return a measurement filter using the cal matrices."""
-        return TensoredFilter(self._cal_matrices, self._substate_labels_list)
+        """Return a measurement filter using the cal matrices.
+
+        The filters share the pseudo inverses of the cal matrices until they
+        are rebuilt or set, so they are only computed once.
+        """
+        meas_filter = TensoredFilter(self._cal_matrices,
+                                     self._substate_labels_list)
+        meas_filter._cache = self._filter_cache
+        return meas_filter
 
     @property
     def nqubits(self):
         """Return _qubit_list_sizes."""
         return sum(self._qubit_list_sizes)
 
+    @property
+    def decay(self):
+        """Return the decay factor of the calibration counts."""
+        return self._decay
+
     def add_data(self, new_results, rebuild_cal_matrix=True):
         """
         Add measurement calibration data
@@ -322,7 +364,10 @@ class TensoredMeasFitter():
             new_results = [new_results]
 
         for result in new_results:
-            self._result_list.append(result)
+            if self._decay is not None:
+                for count_mat in self._count_matrices:
+                    count_mat *= self._decay
+            self._add_counts(result)
 
         if rebuild_cal_matrix:
             self._build_calibration_matrices()
@@ -387,59 +432,58 @@ class TensoredMeasFitter():
 
         return np.mean(assign_fid_list)
 
-    def _build_calibration_matrices(self):
+    def _add_counts(self, result):
         """
-        Build the measurement calibration matrices from the results of running
-        the circuits returned by `measurement_calibration`.
+        Add the counts of the calibration experiments in a result to the
+        columns of the prepared states of the count matrices.
         """
+        for experiment in result.results:
+            circ_name = experiment.header.name
+            # extract the state from the circuit name
+            # this was the prepared state
+            circ_search = re.search('(?<=' + self._circlabel + 'cal_)\\w+',
+                                    circ_name)
+
+            # this experiment is not one of the calcs so skip
+            if circ_search is None:
+                continue
+
+            state = circ_search.group(0)
+
+            # get the counts from the result
+            state_cnts = result.get_counts(circ_name)
+            measured_states = list(state_cnts)
+            counts = np.array(list(state_cnts.values()), dtype=float)
+            end_index = self.nqubits
+            for cal_ind, count_mat in enumerate(self._count_matrices):
+
+                start_index = end_index - self._qubit_list_sizes[cal_ind]
+                indices = self._indices_list[cal_ind]
+
+                substate_index = indices[state[start_index:end_index]]
+                measured_substate_indices = [
+                    indices[measured_state[start_index:end_index]]
+                    for measured_state in measured_states]
+                end_index = start_index
+
+                count_mat[:, substate_index] += np.bincount(
+                    measured_substate_indices, weights=counts,
+                    minlength=len(count_mat))
 
-        # initialize the set of empty calibration matrices
+    def _build_calibration_matrices(self):
+        """
+        Build the measurement calibration matrices from the accumulated
+        calibration counts.
+        """
+        self._filter_cache = {}
         self._cal_matrices = []
-        for list_size in self._qubit_list_sizes:
-            self._cal_matrices.append(np.zeros([2**list_size, 2**list_size],
-                                               dtype=float))
-
-        # go through for each calibration experiment
-        for result in self._result_list:
-            for experiment in result.results:
-                circ_name = experiment.header.name
-                # extract the state from the circuit name
-                # this was the prepared state
-                circ_search = re.search('(?<=' + self._circlabel + 'cal_)\\w+',
-                                        circ_name)
-
-                # this experiment is not one of the calcs so skip
-                if circ_search is None:
-                    continue
-
-                state = circ_search.group(0)
-
-                # get the counts from the result
-                state_cnts = result.get_counts(circ_name)
-                for measured_state, counts in state_cnts.items():
-                    end_index = self.nqubits
-                    for cal_ind, cal_mat in enumerate(self._cal_matrices):
-
-                        start_index = end_index - \
-                            self._qubit_list_sizes[cal_ind]
-
-                        substate_index = self._indices_list[cal_ind][
-                            state[start_index:end_index]]
-                        measured_substate_index = \
-                            self._indices_list[cal_ind][
-                                measured_state[start_index:end_index]]
-                        end_index = start_index
-
-                        cal_mat[measured_substate_index][substate_index] += \
-                            counts
-
-        for mat_index, _ in enumerate(self._cal_matrices):
-            sums_of_columns = np.sum(self._cal_matrices[mat_index], axis=0)
+        for count_mat in self._count_matrices:
+            sums_of_columns = np.sum(count_mat, axis=0)
             # pylint: disable=assignment-from-no-return
-            self._cal_matrices[mat_index] = np.divide(
-                self._cal_matrices[mat_index], sums_of_columns,
-                out=np.zeros_like(self._cal_matrices[mat_index]),
-                where=sums_of_columns != 0)
+            self._cal_matrices.append(np.divide(
+                count_mat, sums_of_columns,
+                out=np.zeros_like(count_mat),
+                where=sums_of_columns != 0))
 
     def plot_calibration(self, cal_index=0, ax=None, show_plot=True):
         """
@@ -482,3 +526,303 @@ class TensoredMeasFitter():
 
         if show_plot:
             plt.show()
+
+
+class LocalMeasFitter(TensoredMeasFitter):
+    """
+    Measurement correction fitter for a k-local correlated readout error
+    model.
+    """
+
+    def __init__(self,
+                 results: Union[Result, List[Result]],
+                 mit_pattern: Optional[List[List[int]]] = None,
+                 qubit_list: Optional[List[int]] = None,
+                 circlabel: str = '',
+                 decay: Optional[float] = None):
+        """
+        Initialize a measurement calibration matrix from the results of
+        running the circuits returned by `local_meas_cal`.
+
+        Args:
+            results: the results of running the measurement calibration
+                circuits. If this is `None`, the user will set calibration
+                matrices later.
+
+            mit_pattern: qubits to perform the measurement correction on,
+                divided to groups of qubits with correlated readout errors.
+                If `None`, the groups are found from the results with
+                `correlated_mit_pattern`.
+
+            qubit_list: the qubits of the calibration state labels, in the
+                ordering of the calibration circuits. If `None`, the sorted
+                qubits of the mit_pattern.
+
+            circlabel: if the qubits were labeled
+
+            decay: the factor in (0, 1] by which the weight of the
+                calibration counts decays for every later result added. If
+                `None` all calibration counts have the same weight.
+
+        Raises:
+            QiskitError: if both the results and the mit_pattern are `None`,
+                if the mit_pattern qubits are not in the qubit_list, or if
+                the calibration states do not match the qubit_list.
+
+        Additional Information:
+            The readout errors are modeled by the tensor product of the
+            calibration matrices of groups of qubits, as for the
+            :class:`TensoredMeasFitter`, but the calibration states do not
+            have to be tensor products of the basis states of the groups.
+            The calibration matrix of each group is fitted from the counts of
+            all calibration circuits, marginalized over the other qubits. For
+            the circuits of ``local_meas_cal(k=k)`` every basis state of
+            every group of at most :math:`k` qubits is prepared.
+
+            The filter corrects counts whose classical bits are ordered as
+            the qubit_list, as measured by the calibration circuits, with
+            bit ``j`` from the right for ``qubit_list[j]``. Qubits of the
+            qubit_list that are not in the mit_pattern are not corrected.
+        """
+        if mit_pattern is None:
+            if results is None:
+                raise QiskitError("Must give one of results or a mit_pattern")
+            mit_pattern = correlated_mit_pattern(results, qubit_list,
+                                                 circlabel=circlabel)
+        if qubit_list is None:
+            qubit_list = sorted(qubit for group in mit_pattern
+                                for qubit in group)
+        qubit_list = list(qubit_list)
+        if not set(qubit for group in mit_pattern
+                   for qubit in group).issubset(qubit_list):
+            raise QiskitError("mit_pattern qubits are not in the qubit_list")
+        self._positions_list = [
+            np.array([qubit_list.index(qubit) for qubit in group])
+            for group in mit_pattern]
+        self._mit_pattern = mit_pattern
+        self._qubit_list = qubit_list
+
+        super().__init__(results, mit_pattern, circlabel=circlabel,
+                         decay=decay)
+
+    @property
+    def mit_pattern(self):
+        """Return the groups of qubits of the calibration matrices."""
+        return self._mit_pattern
+
+    @property
+    def qubit_list(self):
+        """Return the qubits of the calibration state labels."""
+        return self._qubit_list
+
+    @property
+    def filter(self):
+        """Return a measurement filter of counts in qubit_list order.
+
+        The filters share the pseudo inverses of the cal matrices until they
+        are rebuilt or set.
+        """
+        cal_matrices = list(self._cal_matrices)
+        substate_labels_list = list(self._substate_labels_list)
+        positions_list = [list(positions)
+                          for positions in self._positions_list]
+        # qubits without a calibration matrix are not corrected
+        covered = set(pos for positions in positions_list
+                      for pos in positions)
+        for pos in range(len(self._qubit_list)):
+            if pos not in covered:
+                cal_matrices.append(np.eye(2))
+                substate_labels_list.append(count_keys(1))
+                positions_list.append([pos])
+        meas_filter = TensoredFilter(cal_matrices, substate_labels_list,
+                                     positions_list)
+        meas_filter._cache = self._filter_cache
+        return meas_filter
+
+    def _add_counts(self, result):
+        """
+        Add the counts of the calibration experiments in a result to the
+        count matrices, marginalized over the qubits of the other groups.
+        """
+        nqubits = len(self._qubit_list)
+        for experiment in result.results:
+            circ_name = experiment.header.name
+            circ_search = re.search('(?<=' + self._circlabel + 'cal_)\\w+',
+                                    circ_name)
+            if circ_search is None:
+                continue
+
+            state = circ_search.group(0)
+            if len(state) != nqubits:
+                raise QiskitError("Calibration state {} does not match the "
+                                  "qubit_list".format(state))
+            state_cnts = result.get_counts(circ_name)
+            counts = np.array(list(state_cnts.values()), dtype=float)
+            # bit j of the labels is the state of qubit_list[j]
+            prepared = int(state, 2)
+            measured = np.array([int(key.replace(' ', ''), 2)
+                                 for key in state_cnts], dtype=np.int64)
+            for positions, count_mat in zip(self._positions_list,
+                                            self._count_matrices):
+                place = 1 << np.arange(len(positions))
+                substate_index = np.sum(((prepared >> positions) & 1)
+                                        * place)
+                measured_substate_indices = \
+                    ((measured[:, None] >> positions) & 1) @ place
+                count_mat[:, substate_index] += np.bincount(
+                    measured_substate_indices, weights=counts,
+                    minlength=len(count_mat))
+
+    def _build_calibration_matrices(self):
+        """
+        Build the measurement calibration matrices from the accumulated
+        calibration counts.
+
+        Raises:
+            QiskitError: if a basis state of a group was not prepared.
+        """
+        for group, count_mat in zip(self._mit_pattern, self._count_matrices):
+            if np.any(count_mat) and not np.all(np.any(count_mat, axis=0)):
+                raise QiskitError(
+                    "Not all basis states of the qubits {} were prepared by "
+                    "the calibration circuits".format(group))
+        super()._build_calibration_matrices()
+
+
+def correlated_mit_pattern(results: Union[Result, List[Result]],
+                           qubit_list: List[int] = None,
+                           significance: float = 0.01,
+                           threshold: float = 0.0,
+                           circlabel: str = '') -> List[List[int]]:
+    r"""
+    Return the coarsest tensored mit_pattern capturing correlated readout
+    errors.
+
+    Every pair of qubits is tested for readout correlations, and qubits of
+    correlated pairs are put in the same group of the returned mit_pattern,
+    so the tensored calibration circuits and filters only use the groups
+    that are needed.
+
+    Args:
+        results: the results of running measurement calibration circuits,
+            such as the circuits returned by `random_meas_cal`.
+        qubit_list: the qubits of the calibration state labels, in the
+            ordering of the calibration circuits. If `None`, the qubits are
+            numbered according to the length of the state labels.
+        significance: the family-wise significance level of the tests for
+            correlated pairs of qubits, with the Bonferroni correction for
+            the number of pairs (default 0.01).
+        threshold: the minimum mutual information, in nats, of the readout
+            of a correlated pair of qubits. This ignores statistically
+            significant but negligible correlations (default 0).
+        circlabel: if the qubits were labeled.
+
+    Returns:
+        The mit_pattern with the qubits of each connected group of
+        correlated qubits.
+
+    Raises:
+        QiskitError: if the results contain no calibration circuits.
+
+    Additional Information:
+        For each pair of qubits :math:`i, j` the measured outcomes
+        :math:`y` are compared with the tensored model
+        :math:`P(y_i|x_i) P(y_j|x_j)` for prepared states :math:`x` using a
+        G-test, where the G statistic
+
+        .. math::
+            G = 2 \sum N(x, y) \log \frac{P(y_i, y_j | x_i, x_j)}
+                {P(y_i|x_i) P(y_j|x_j)}
+
+        is :math:`2N` times the conditional mutual information of the
+        readout of the two qubits, including the dependence of the readout
+        of each qubit on the prepared state of the other.
+    """
+    if not isinstance(results, list):
+        results = [results]
+
+    # prepared and measured bits of each calibration outcome, with the last
+    # character of the labels the first qubit
+    prepared = []
+    measured = []
+    counts = []
+    for result in results:
+        for experiment in result.results:
+            circ_name = experiment.header.name
+            circ_search = re.search('(?<=' + circlabel + 'cal_)\\w+',
+                                    circ_name)
+            if circ_search is None:
+                continue
+            state = circ_search.group(0)
+            for measured_state, count in result.get_counts(circ_name).items():
+                prepared.append([int(bit) for bit in reversed(state)])
+                measured.append([int(bit) for bit in
+                                 reversed(measured_state.replace(' ', ''))])
+                counts.append(count)
+    if not counts:
+        raise QiskitError("No measurement calibration data in the results.")
+
+    prepared = np.array(prepared, dtype=int)
+    measured = np.array(measured, dtype=int)
+    counts = np.array(counts, dtype=float)
+    nqubits = prepared.shape[1]
+    if qubit_list is None:
+        qubit_list = range(nqubits)
+    qubit_list = list(qubit_list)
+
+    num_pairs = max(1, nqubits * (nqubits - 1) // 2)
+    groups = list(range(nqubits))
+
+    def find(qind):
+        while groups[qind] != qind:
+            groups[qind] = groups[groups[qind]]
+            qind = groups[qind]
+        return qind
+
+    for i in range(nqubits):
+        for j in range(i + 1, nqubits):
+            index = (8 * prepared[:, i] + 4 * prepared[:, j] +
+                     2 * measured[:, i] + measured[:, j])
+            joint = np.bincount(index, weights=counts,
+                                minlength=16).reshape(2, 2, 2, 2)
+            info, dof = _readout_information(joint)
+            pval = chi2.sf(2 * np.sum(joint) * info, dof)
+            if pval < significance / num_pairs and info > threshold:
+                groups[find(j)] = find(i)
+
+    mit_pattern = {}
+    for qind in range(nqubits):
+        mit_pattern.setdefault(find(qind), []).append(qubit_list[qind])
+    return list(mit_pattern.values())
+
+
+def _readout_information(joint: np.ndarray):
+    """
+    Return the conditional mutual information of the readout of two qubits
+    and the degrees of freedom of its G-test.
+
+    Args:
+        joint: the counts indexed by the prepared and measured bits
+            ``[x_i, x_j, y_i, y_j]``.
+
+    Returns:
+        tuple: the information in nats and the degrees of freedom.
+    """
+    total = np.sum(joint)
+    prep_counts = np.sum(joint, axis=(2, 3))
+    # tensored model P(y_i|x_i) P(y_j|x_j) fitted to the data
+    counts_i = np.sum(joint, axis=(1, 3))
+    counts_j = np.sum(joint, axis=(0, 2))
+    prob_i = counts_i / np.maximum(np.sum(counts_i, axis=1), 1)[:, None]
+    prob_j = counts_j / np.maximum(np.sum(counts_j, axis=1), 1)[:, None]
+    model = prob_i[:, None, :, None] * prob_j[None, :, None, :]
+    joint_prob = joint / np.maximum(prep_counts, 1)[:, :, None, None]
+
+    nonzero = joint > 0
+    info = np.sum(joint[nonzero] * np.log(joint_prob[nonzero] /
+                                          model[nonzero])) / total
+    # free parameters of the joint and the tensored models
+    dof = 3 * np.count_nonzero(prep_counts) \
+        - np.count_nonzero(np.sum(counts_i, axis=1)) \
+        - np.count_nonzero(np.sum(counts_j, axis=1))
+    return max(info, 0.), max(dof, 1)
@@ -14,6 +14,11 @@
 
 """Utility functions"""
 
+import itertools as it
+from typing import Optional
+
+import numpy as np
+
 
 def build_counts_dict_from_list(count_list):
     """
@@ -35,3 +40,81 @@ def build_counts_dict_from_list(count_list):
             new_count_dict[item] = countdict[item]+new_count_dict.get(item, 0)
 
     return new_count_dict
+
+
+def _project_simplex(vals: np.array, total: float) -> np.array:
+    """Project a real vector onto the simplex {x >= 0, sum(x) = total}."""
+    if total <= 0:
+        return np.zeros_like(vals)
+    desc = np.sort(vals)[::-1]
+    csum = np.cumsum(desc) - total
+    ind = np.arange(1, len(vals) + 1)
+    rho = np.nonzero(desc - csum / ind > 0)[0][-1]
+    theta = csum[rho] / (rho + 1)
+    return np.maximum(vals - theta, 0)
+
+
+def _covering_array(num_qubits: int,
+                    k: int,
+                    num_labels: int,
+                    seed: Optional[int] = None,
+                    num_candidates: int = 50
+                    ) -> np.array:
+    """Return a strength-k covering array.
+
+    Args:
+        num_qubits: the number of columns of the array.
+        k: the strength of the array.
+        num_labels: the number of symbols in each column.
+        seed: seed for the random number generator.
+        num_candidates: the number of random candidate rows to compare when
+            adding each row.
+    Returns:
+        An integer array of shape ``(rows, num_qubits)`` with entries in
+        ``range(num_labels)`` such that for every k columns all
+        ``num_labels ** k`` combinations of symbols appear in some row.
+
+    Additional Information:
+        The array is constructed greedily. Each new row is chosen as the
+        best of a number of random candidates, each seeded with a
+        combination that is not yet covered, and is then improved by
+        changing one column at a time while this covers more combinations.
+    """
+    rng = np.random.default_rng(seed)
+    subsets = np.array(list(it.combinations(range(num_qubits), k)))
+    # Mixed radix place values for encoding the symbols on each subset
+    place = num_labels ** np.arange(k - 1, -1, -1)
+    uncovered = np.ones((len(subsets), num_labels ** k), dtype=bool)
+    sub_index = np.arange(len(subsets))
+
+    def gains(rows):
+        codes = rows[:, subsets] @ place
+        return np.sum(uncovered[sub_index, codes], axis=-1)
+
+    rows = []
+    while np.any(uncovered):
+        # Random candidate rows, each covering a random uncovered
+        # combination on a random subset
+        missing = np.argwhere(uncovered)
+        picks = missing[rng.integers(len(missing), size=num_candidates)]
+        cands = rng.integers(num_labels, size=(num_candidates, num_qubits))
+        for cand, (sub, code) in zip(cands, picks):
+            cand[subsets[sub]] = (code // place) % num_labels
+        best = cands[np.argmax(gains(cands))]
+
+        # Local improvement of the chosen row one column at a time
+        best_gain = gains(best[None, :])[0]
+        improved = True
+        while improved:
+            improved = False
+            for qubit in range(num_qubits):
+                trial = np.repeat(best[None, :], num_labels, axis=0)
+                trial[:, qubit] = np.arange(num_labels)
+                trial_gains = gains(trial)
+                if np.max(trial_gains) > best_gain:
+                    best = trial[np.argmax(trial_gains)]
+                    best_gain = np.max(trial_gains)
+                    improved = True
+        uncovered[sub_index, best[subsets] @ place] = False
+        rows.append(best)
+    return np.array(rows)
@@ -63,10 +63,17 @@ Tomography
    state_tomography_circuits
    process_tomography_circuits
    gateset_tomography_circuits
+   long_gst_circuits
+   local_tomography_circuits
+   shadow_tomography_circuits
+   direct_fidelity_circuits
    basis
    StateTomographyFitter
    ProcessTomographyFitter
    GatesetTomographyFitter
+   LocalTomographyFitter
+   ShadowTomographyFitter
+   DirectFidelityFitter
    TomographyFitter
    marginal_counts
    combine_counts
@@ -128,10 +135,17 @@ from .topological_codes import (RepetitionCode, GraphDecoder,
                                 postselection_decoding)
 from .tomography import (state_tomography_circuits,
                          process_tomography_circuits,
-                         gateset_tomography_circuits, basis,
+                         gateset_tomography_circuits,
+                         long_gst_circuits,
+                         local_tomography_circuits,
+                         shadow_tomography_circuits,
+                         direct_fidelity_circuits, basis,
                          StateTomographyFitter,
                          ProcessTomographyFitter,
                          GatesetTomographyFitter,
+                         LocalTomographyFitter,
+                         ShadowTomographyFitter,
+                         DirectFidelityFitter,
                          TomographyFitter,
                          marginal_counts, combine_counts,
                          expectation_counts, count_keys)
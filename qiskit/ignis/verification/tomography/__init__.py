@@ -30,6 +30,14 @@ Base Fitter
    TomographyFitter
 
 
+Circuits
+========
+
+.. autosummary::
+
+    tomography_circuit_template
+    bind_tomography_circuits
+
 Utility functions
 =================
 
@@ -76,6 +84,60 @@ Circuits
 
     process_tomography_circuits
 
+==============================================================
+Local Tomography (:mod:`qiskit.ignis.verification.tomography`)
+==============================================================
+
+.. currentmodule:: qiskit.ignis.verification.tomography
+
+Fitter
+======
+.. autosummary::
+
+    LocalTomographyFitter
+
+Circuits
+========
+.. autosummary::
+
+    local_tomography_circuits
+
+===============================================================
+Shadow Tomography (:mod:`qiskit.ignis.verification.tomography`)
+===============================================================
+
+.. currentmodule:: qiskit.ignis.verification.tomography
+
+Fitter
+======
+.. autosummary::
+
+    ShadowTomographyFitter
+
+Circuits
+========
+.. autosummary::
+
+    shadow_tomography_circuits
+
+========================================================================
+Direct Fidelity Estimation (:mod:`qiskit.ignis.verification.tomography`)
+========================================================================
+
+.. currentmodule:: qiskit.ignis.verification.tomography
+
+Fitter
+======
+.. autosummary::
+
+    DirectFidelityFitter
+
+Circuits
+========
+.. autosummary::
+
+    direct_fidelity_circuits
+
 ================================================================
 Gate Set Tomography (:mod:`qiskit.ignis.verification.tomography`)
 ================================================================
@@ -93,18 +155,28 @@ Circuits
 .. autosummary::
 
     gateset_tomography_circuits
+    long_gst_circuits
 """
 
 # Tomography circuit generation
 from .basis import state_tomography_circuits
 from .basis import process_tomography_circuits
 from .basis import gateset_tomography_circuits
+from .basis import long_gst_circuits
+from .basis import local_tomography_circuits
+from .basis import shadow_tomography_circuits
+from .basis import direct_fidelity_circuits
+from .basis import tomography_circuit_template
+from .basis import bind_tomography_circuits
 from . import basis
 
 # Tomography data formatting
 from .fitters import StateTomographyFitter
 from .fitters import ProcessTomographyFitter
 from .fitters import GatesetTomographyFitter
+from .fitters import LocalTomographyFitter
+from .fitters import ShadowTomographyFitter
+from .fitters import DirectFidelityFitter
 from .fitters import TomographyFitter
 
 # Utility functions TODO: move to qiskit.quantum_info
@@ -24,8 +24,14 @@ from .sicbasis import SICBasis
 from .circuits import state_tomography_circuits
 from .circuits import process_tomography_circuits
 from .circuits import gateset_tomography_circuits
+from .circuits import long_gst_circuits
+from .circuits import local_tomography_circuits
+from .circuits import shadow_tomography_circuits
+from .circuits import direct_fidelity_circuits
 from .circuits import default_basis
 from .circuits import tomography_circuit_tuples
+from .circuits import tomography_circuit_template
+from .circuits import bind_tomography_circuits
 
 from .paulibasis import pauli_measurement_circuit
 from .paulibasis import pauli_preparation_circuit
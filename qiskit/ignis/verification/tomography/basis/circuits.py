@@ -17,18 +17,28 @@
 Quantum tomography circuit generation.
 """
 
+import copy
 import logging
-from typing import List, Union, Tuple, Optional
+from typing import List, Dict, Union, Tuple, Optional, Iterator
 import itertools as it
-import re
+
+import numpy as np
 
 from qiskit import QuantumRegister
 from qiskit.circuit import Qubit
 from qiskit import ClassicalRegister
 from qiskit import QuantumCircuit
 from qiskit import QiskitError
+from qiskit.circuit import Parameter, ParameterVector
 from qiskit.circuit.measure import Measure
 from qiskit.circuit.reset import Reset
+from qiskit.circuit.library import U3Gate
+from qiskit.quantum_info import Operator, DensityMatrix, Statevector, PTM
+from qiskit.quantum_info.operators.channel.quantum_channel import \
+    QuantumChannel
+from qiskit.quantum_info.synthesis import OneQubitEulerDecomposer
+
+from ....utils import _covering_array
 
 from .tomographybasis import TomographyBasis
 from .paulibasis import PauliBasis
@@ -47,8 +57,9 @@ def state_tomography_circuits(
         circuit: QuantumCircuit,
         measured_qubits: QuantumRegister,
         meas_labels: Union[str, Tuple[str], List[Tuple[str]]] = 'Pauli',
-        meas_basis: Union[str, TomographyBasis] = 'Pauli'
-) -> List[QuantumCircuit]:
+        meas_basis: Union[str, TomographyBasis] = 'Pauli',
+        lazy: bool = False
+) -> Union[List[QuantumCircuit], Iterator[QuantumCircuit]]:
     """
     Return a list of quantum state tomography circuits.
 
@@ -62,6 +73,8 @@ def state_tomography_circuits(
             individual QuantumRegister qubit tuples.
         meas_labels: (default: 'Pauli') The measurement operator labels.
         meas_basis: (default: 'Pauli') The measurement basis.
+        lazy: (default: False) return a generator which creates the
+            circuits as they are iterated over instead of a list.
 
     Returns:
         A list containing copies of the original circuit
@@ -70,13 +83,17 @@ def state_tomography_circuits(
     Additional Information:
         The returned circuits are named by the measurement basis.
 
+        The measurement gates are only generated once for each label and
+        qubit, and copied into each of the returned circuits.
+
         To perform tomography measurement in a custom basis, or to generate
         a subset of state tomography circuits for a partial tomography
         experiment use the general function `tomography_circuits`.
     """
     return _tomography_circuits(circuit, measured_qubits, None,
                                 meas_labels=meas_labels, meas_basis=meas_basis,
-                                prep_labels=None, prep_basis=None)
+                                prep_labels=None, prep_basis=None,
+                                lazy=lazy)
 
 
 ###########################################################################
@@ -90,8 +107,9 @@ def process_tomography_circuits(
         meas_labels: Union[str, Tuple[str], List[Tuple[str]]] = 'Pauli',
         meas_basis: Union[str, TomographyBasis] = 'Pauli',
         prep_labels: Union[str, Tuple[str], List[Tuple[str]]] = 'Pauli',
-        prep_basis: Union[str, TomographyBasis] = 'Pauli'
-) -> List[QuantumCircuit]:
+        prep_basis: Union[str, TomographyBasis] = 'Pauli',
+        lazy: bool = False
+) -> Union[List[QuantumCircuit], Iterator[QuantumCircuit]]:
     r"""Return a list of quantum process tomography circuits.
 
     This performs preparation in the minimial Pauli-basis eigenstates
@@ -117,6 +135,8 @@ def process_tomography_circuits(
         meas_basis: (default: 'Pauli') The measurement basis.
         prep_labels: (default: 'Pauli') The preparation operator labels.
         prep_basis: (default: 'Pauli') The preparation basis.
+        lazy: (default: False) return a generator which creates the
+            circuits as they are iterated over instead of a list.
 
     Returns:
         A list of QuantumCircuit objects containing the original circuit
@@ -124,11 +144,476 @@ def process_tomography_circuits(
         appended.
 
     The returned circuits are named by the preparation and measurement
-    basis.
+    basis. The circuit being tomographed is only composed with each of the
+    :math:`4^n` preparation circuits once, and the preparation and
+    measurement gates are only generated once for each label and qubit.
     """
     return _tomography_circuits(circuit, measured_qubits, prepared_qubits,
                                 meas_labels=meas_labels, meas_basis=meas_basis,
-                                prep_labels=prep_labels, prep_basis=prep_basis)
+                                prep_labels=prep_labels, prep_basis=prep_basis,
+                                lazy=lazy)
+
+
+###########################################################################
+# Parameterized tomography circuit templates
+###########################################################################
+
+def tomography_circuit_template(
+        circuit: QuantumCircuit,
+        measured_qubits: QuantumRegister,
+        prepared_qubits: Optional[QuantumRegister] = None,
+        meas_labels: Union[str, Tuple[str], List[Tuple[str]]] = 'Pauli',
+        meas_basis: Union[str, TomographyBasis] = 'Pauli',
+        prep_labels: Optional[Union[str, Tuple[str],
+                                    List[Tuple[str]]]] = None,
+        prep_basis: Union[str, TomographyBasis] = 'Pauli'
+) -> Tuple[QuantumCircuit, Dict[Tuple, Dict[Parameter, float]]]:
+    """Return a parameterized tomography circuit and its parameter bindings.
+
+    Instead of a distinct circuit for every tomography label this returns a
+    single circuit where the preparation and measurement basis changes on
+    each qubit are parameterized ``U3`` gates, together with the parameter
+    values for each label. The template only needs to be transpiled once,
+    and can then be bound to all tomography labels by a backend supporting
+    parameter binds, or by :func:`bind_tomography_circuits`.
+
+    Args:
+        circuit: the QuantumCircuit circuit to be tomographed.
+        measured_qubits: the qubits to be measured.
+            This can also be a list of whole QuantumRegisters or
+            individual QuantumRegister qubit tuples.
+        prepared_qubits: the qubits to have state
+            preparation applied, if different from measured_qubits. If None
+            measured_qubits will be used for prepared qubits
+        meas_labels: (default: 'Pauli') The measurement operator labels.
+        meas_basis: (default: 'Pauli') The measurement basis.
+        prep_labels: (default: None) The preparation operator labels. If
+            None a state tomography template is returned.
+        prep_basis: (default: 'Pauli') The preparation basis.
+
+    Returns:
+        A tuple ``(template, bindings)`` of the parameterized circuit and a
+        dictionary of the parameter values for each tomography label. The
+        labels are the names of the corresponding tomography circuits
+        returned by :func:`state_tomography_circuits` or
+        :func:`process_tomography_circuits`.
+
+    Raises:
+        QiskitError: If the measurement/preparation basis is invalid.
+
+    Additional Information:
+        The basis circuits for each label are converted to ``U3`` gate
+        parameters, so the measurement basis circuits must consist of
+        single-qubit gates followed by a measurement.
+    """
+    meas_qubits, prep_qubits, qubit_registers = _tomography_qubits(
+        circuit, measured_qubits, prepared_qubits)
+    num_qubits = len(meas_qubits)
+
+    measurement = default_basis(meas_basis)
+    if not isinstance(measurement, TomographyBasis) or \
+            measurement.measurement is not True:
+        raise QiskitError("Invalid measurement basis")
+    if isinstance(meas_labels, str):
+        meas_labels = _default_measurement_labels(meas_labels)
+    meas_labels = _generate_labels(meas_labels, num_qubits)
+    if prep_labels is not None:
+        preparation = default_basis(prep_basis)
+        if not isinstance(preparation, TomographyBasis) or \
+                preparation.preparation is not True:
+            raise QiskitError("Invalid preparation basis")
+        if isinstance(prep_labels, str):
+            prep_labels = _default_preparation_labels(prep_labels)
+        prep_labels = _generate_labels(prep_labels, num_qubits)
+
+    clbits = ClassicalRegister(num_qubits)
+    template = QuantumCircuit(*qubit_registers, clbits)
+    qubit = QuantumRegister(1)
+    clbit = ClassicalRegister(1)
+
+    # Preparation U3 gates and angles for each label
+    prep_params = None
+    if prep_labels is not None:
+        prep_params = ParameterVector('prep', 3 * num_qubits)
+        for j in range(num_qubits):
+            template.append(U3Gate(*prep_params[3 * j: 3 * j + 3]),
+                            [prep_qubits[j]])
+        template.barrier(*qubit_registers)
+        prep_angles = {}
+        for op in set(op for label in prep_labels for op in label):
+            prep_angles[op] = _u3_angles(
+                preparation.preparation_circuit(op, qubit[0]))
+    # Compose the circuit on its own qubits and clbits of the template
+    for register in circuit.qregs + circuit.cregs:
+        if register not in template.qregs + template.cregs:
+            template.add_register(register)
+    template.compose(circuit,
+                     qubits=[template.qubits.index(q) for q in circuit.qubits],
+                     clbits=[template.clbits.index(c) for c in circuit.clbits],
+                     inplace=True)
+
+    # Measurement U3 gates and angles for each label
+    meas_params = ParameterVector('meas', 3 * num_qubits)
+    template.barrier(*qubit_registers)
+    for j in range(num_qubits):
+        template.append(U3Gate(*meas_params[3 * j: 3 * j + 3]),
+                        [meas_qubits[j]])
+        template.measure(meas_qubits[j], clbits[j])
+    meas_angles = {}
+    for op in set(op for label in meas_labels for op in label):
+        meas_angles[op] = _u3_angles(
+            measurement.measurement_circuit(op, qubit[0], clbit[0]))
+
+    def _label_binds(params, angles, label):
+        vals = [val for op in label for val in angles[op]]
+        return dict(zip(params, vals))
+
+    bindings = {}
+    if prep_labels is None:
+        for meas_label in meas_labels:
+            bindings[meas_label] = _label_binds(meas_params, meas_angles,
+                                                meas_label)
+    else:
+        for prep_label, meas_label in it.product(prep_labels, meas_labels):
+            binds = _label_binds(prep_params, prep_angles, prep_label)
+            binds.update(_label_binds(meas_params, meas_angles, meas_label))
+            bindings[(prep_label, meas_label)] = binds
+    return template, bindings
+
+
+def bind_tomography_circuits(
+        template: QuantumCircuit,
+        bindings: Dict[Tuple, Dict[Parameter, float]]
+) -> List[QuantumCircuit]:
+    """Return the tomography circuits for a parameterized template.
+
+    Args:
+        template: a parameterized tomography circuit returned by
+            :func:`tomography_circuit_template`, or a transpiled copy of it.
+        bindings: the parameter bindings for each tomography label.
+
+    Returns:
+        A list of the bound tomography circuits, named by their tomography
+        labels so that they can be used with the tomography fitters.
+    """
+    circuits = []
+    for label, binds in bindings.items():
+        circ = template.assign_parameters(binds)
+        circ.name = str(label)
+        circuits.append(circ)
+    return circuits
+
+
+###########################################################################
+# Local state tomography circuits for k-qubit reduced density matrices
+###########################################################################
+
+def local_tomography_circuits(
+        circuit: QuantumCircuit,
+        measured_qubits: QuantumRegister,
+        k: int = 2,
+        meas_labels: Union[str, Tuple[str]] = 'Pauli',
+        meas_basis: Union[str, TomographyBasis] = 'Pauli',
+        seed: Optional[int] = None
+) -> List[QuantumCircuit]:
+    """
+    Return a list of local quantum state tomography circuits.
+
+    This generates a set of measurement settings such that the measurements
+    restricted to every k-qubit subset of the measured qubits contain all
+    :math:`3^k` local Pauli-basis settings, allowing all k-qubit reduced
+    density matrices to be reconstructed from the same data. The settings are
+    the rows of a strength-k covering array constructed by a greedy
+    algorithm, whose size grows logarithmically with the number of qubits
+    rather than as the :math:`3^n` circuits of full state tomography.
+
+    Args:
+        circuit: the state preparation circuit to be tomographed.
+        measured_qubits: the qubits to be measured.
+            This can also be a list of whole QuantumRegisters or
+            individual QuantumRegister qubit tuples.
+        k: (default: 2) the size of the subsystems to be tomographed.
+        meas_labels: (default: 'Pauli') The single-qubit measurement
+            operator labels.
+        meas_basis: (default: 'Pauli') The measurement basis.
+        seed: (default: None) seed for the random number generator used
+            in the covering array construction.
+
+    Returns:
+        A list containing copies of the original circuit
+        with state tomography measurements appended at the end.
+
+    Raises:
+        QiskitError: If k is larger than the number of measured qubits.
+
+    Additional Information:
+        The returned circuits are named by the measurement basis, and the
+        data can be fitted using the :class:`LocalTomographyFitter`.
+    """
+    if isinstance(measured_qubits, list):
+        num_qubits = len(_format_registers(*measured_qubits))
+    else:
+        num_qubits = len(_format_registers(measured_qubits))
+    if k < 1 or k > num_qubits:
+        raise QiskitError("Invalid subsystem size {} for {} measured "
+                          "qubits.".format(k, num_qubits))
+    if isinstance(meas_labels, str):
+        meas_labels = _default_measurement_labels(meas_labels)
+    array = _covering_array(num_qubits, k, len(meas_labels), seed=seed)
+    labels = [tuple(meas_labels[i] for i in row) for row in array]
+    return _tomography_circuits(circuit, measured_qubits, None,
+                                meas_labels=labels, meas_basis=meas_basis,
+                                prep_labels=None, prep_basis=None)
+
+
+###########################################################################
+# Classical shadow circuits for randomized Pauli measurements
+###########################################################################
+
+def shadow_tomography_circuits(
+        circuit: QuantumCircuit,
+        measured_qubits: QuantumRegister,
+        num_settings: int = 100,
+        seed: Optional[int] = None
+) -> List[QuantumCircuit]:
+    """
+    Return a list of classical shadow tomography circuits.
+
+    This performs measurement in a uniformly random Pauli-basis on each
+    qubit for ``num_settings`` randomly sampled measurement settings. Each
+    measurement shot of the returned circuits is a classical shadow snapshot
+    of the state, which can be used to estimate many observables of large
+    states with the :class:`ShadowTomographyFitter`.
+
+    Args:
+        circuit: the state preparation circuit to be tomographed.
+        measured_qubits: the qubits to be measured.
+            This can also be a list of whole QuantumRegisters or
+            individual QuantumRegister qubit tuples.
+        num_settings: (default: 100) the number of random measurement
+            settings to sample.
+        seed: (default: None) seed for the random number generator.
+
+    Returns:
+        A list containing copies of the original circuit
+        with random Pauli measurements appended at the end.
+
+    Additional Information:
+        The returned circuits are named by the measurement basis. Repeated
+        samples of the same measurement setting are only returned once, so
+        fewer than ``num_settings`` circuits may be returned. Since every
+        setting is equally likely to be sampled, executing each returned
+        circuit with the same number of shots still gives uniformly random
+        measurement bases.
+    """
+    if isinstance(measured_qubits, list):
+        num_qubits = len(_format_registers(*measured_qubits))
+    else:
+        num_qubits = len(_format_registers(measured_qubits))
+    meas_labels = _default_measurement_labels('Pauli')
+    rng = np.random.default_rng(seed)
+    settings = rng.integers(len(meas_labels),
+                            size=(num_settings, num_qubits))
+    # Remove duplicate settings while preserving the sampled order
+    labels = list(dict.fromkeys(
+        tuple(meas_labels[i] for i in row) for row in settings))
+    return _tomography_circuits(circuit, measured_qubits, None,
+                                meas_labels=labels, meas_basis='Pauli',
+                                prep_labels=None, prep_basis=None)
+
+
+###########################################################################
+# Direct fidelity estimation circuits for a known target
+###########################################################################
+
+def direct_fidelity_circuits(
+        circuit: QuantumCircuit,
+        measured_qubits: QuantumRegister,
+        target: Union[Statevector, DensityMatrix, Operator,
+                      QuantumChannel, np.array],
+        prepared_qubits: Optional[QuantumRegister] = None,
+        num_settings: int = 100,
+        seed: Optional[int] = None,
+        process: bool = False
+) -> Tuple[List[QuantumCircuit], Dict[Union[str, Tuple[str, str]],
+                                      Tuple[int, float]]]:
+    r"""Return direct fidelity estimation circuits for a target.
+
+    Instead of measuring every tomography setting, ``num_settings`` Pauli
+    observables are importance-sampled from the characteristic function of
+    the target and only their measurement settings are returned. The
+    fidelity with the target is then estimated by the
+    :class:`DirectFidelityFitter`.
+
+    Args:
+        circuit: the QuantumCircuit circuit to be characterized.
+        measured_qubits: the qubits to be measured.
+            This can also be a list of whole QuantumRegisters or
+            individual QuantumRegister qubit tuples.
+        target: the target state, or the target unitary or channel if
+            ``process=True``.
+        prepared_qubits: the qubits to have state preparation applied
+            for process fidelity estimation, if different from
+            measured_qubits. If None measured_qubits will be used.
+        num_settings: (default: 100) the number of Pauli observables to
+            sample.
+        seed: (default: None) seed for the random number generator.
+        process: (default: False) estimate the process fidelity of the
+            circuit instead of the fidelity of its output state.
+
+    Returns:
+        A tuple ``(circuits, settings)`` of the circuits to execute and a
+        dictionary of the number of samples and the estimator coefficient of
+        each sampled Pauli observable, which should be passed to the
+        :class:`DirectFidelityFitter`.
+
+    Raises:
+        QiskitError: If the target dimension does not match the number of
+            measured qubits.
+
+    Additional Information:
+        For a state target :math:`\rho` the Pauli observables :math:`W_k`
+        are sampled with probability :math:`\text{Tr}[\rho W_k]^2 /
+        (d\,\text{Tr}[\rho^2])`. Since
+
+        .. math::
+            \text{Tr}[\rho\sigma] = \frac{1}{d}\sum_k
+            \text{Tr}[\rho W_k] \text{Tr}[\sigma W_k]
+
+        the mean over the samples of
+        :math:`\text{Tr}[\rho^2]\text{Tr}[\sigma W_k] / \text{Tr}[\rho W_k]`
+        is an unbiased estimator of the overlap with the measured state
+        :math:`\sigma`, which is the fidelity for a pure target. For process
+        targets the pairs of Pauli observables are sampled from the squared
+        Pauli transfer matrix of the target, and every eigenstate of the
+        input Pauli is prepared to estimate the Pauli transfer matrix
+        element of the circuit. For unitary targets this estimates the
+        process fidelity.
+
+        The circuits are named by their tomography labels as for
+        :func:`state_tomography_circuits` and
+        :func:`process_tomography_circuits`, using Z-basis measurements for
+        qubits where the sampled Pauli is the identity. Settings shared by
+        several sampled observables are only returned once. Pauli strings
+        use the ordering of :class:`qiskit.quantum_info.Pauli`, with the
+        rightmost character acting on qubit-0.
+
+        References:
+
+        [1] S. T. Flammia and Y.-K. Liu, Phys. Rev. Lett. 106, 230501
+            (2011). Open access: arXiv:1104.4695 [quant-ph].
+        [2] M. P. da Silva, O. Landon-Cardinal and D. Poulin, Phys. Rev.
+            Lett. 107, 210404 (2011). Open access: arXiv:1104.3835
+            [quant-ph].
+    """
+    if isinstance(measured_qubits, list):
+        num_qubits = len(_format_registers(*measured_qubits))
+    else:
+        num_qubits = len(_format_registers(measured_qubits))
+    dim = 2 ** num_qubits
+
+    if process:
+        if not isinstance(target, QuantumChannel):
+            target = Operator(target)
+        if target.dim != (dim, dim):
+            raise QiskitError("Target process dimension does not match the "
+                              "number of measured qubits.")
+        # Pauli transfer matrix Tr[W_k E(W_l)] / d of the target
+        chars = np.real(PTM(target).data).ravel()
+        scale = np.sum(chars ** 2) / dim ** 2
+    else:
+        target = DensityMatrix(target)
+        if target.dim != dim:
+            raise QiskitError("Target state dimension does not match the "
+                              "number of measured qubits.")
+        chars = _pauli_expectation_vector(target.data)
+        scale = np.sum(chars ** 2) / dim
+
+    probs = chars ** 2
+    probs[probs < 1e-12 * np.max(probs)] = 0
+    probs /= np.sum(probs)
+    rng = np.random.default_rng(seed)
+    indices, samples = np.unique(rng.choice(len(probs), size=num_settings,
+                                            p=probs), return_counts=True)
+
+    settings = {}
+    groups = {}
+    for index, num in zip(indices, samples):
+        if process:
+            meas, prep = divmod(int(index), dim ** 2)
+            key = (_pauli_string(meas, num_qubits),
+                   _pauli_string(prep, num_qubits))
+            if meas == 0 and prep == 0:
+                # Trace preserving channels have Tr[E(I)] / d = 1
+                settings[key] = (int(num), scale / chars[index])
+                continue
+            meas_label = _pauli_setting(key[0])
+            groups.setdefault(key[1], []).append(meas_label)
+        else:
+            key = _pauli_string(int(index), num_qubits)
+            if index != 0:
+                groups.setdefault(None, []).append(_pauli_setting(key))
+        settings[key] = (int(num), scale / chars[index])
+
+    circuits = {}
+    for prep, meas_labels in groups.items():
+        prep_labels = None
+        if prep is not None:
+            prep_labels = list(it.product(*[
+                ('Zp', 'Zm') if op == 'I' else (op + 'p', op + 'm')
+                for op in reversed(prep)]))
+        meas_labels = list(dict.fromkeys(meas_labels))
+        for circ in _tomography_circuits(
+                circuit, measured_qubits, prepared_qubits,
+                meas_labels=meas_labels, meas_basis='Pauli',
+                prep_labels=prep_labels, prep_basis='Pauli'):
+            circuits.setdefault(circ.name, circ)
+    return list(circuits.values()), settings
+
+
+def _pauli_string(index: int, num_qubits: int) -> str:
+    """Return the Pauli string of a Pauli transfer matrix index."""
+    return ''.join('IXYZ'[(index >> (2 * qubit)) & 3]
+                   for qubit in reversed(range(num_qubits)))
+
+
+def _pauli_setting(pauli: str) -> Tuple[str]:
+    """Return the measurement label of a Pauli string."""
+    return tuple('Z' if op == 'I' else op for op in reversed(pauli))
+
+
+def _pauli_expectation_vector(rho: np.array) -> np.array:
+    r"""Return the expectation values of all Pauli operators for a state.
+
+    Args:
+        rho: a density matrix.
+
+    Returns:
+        The expectation values :math:`\text{Tr}[\rho W_k]` ordered by
+        the Pauli transfer matrix index of :math:`W_k`.
+    """
+    dim = len(rho)
+    num_qubits = int(np.log2(dim))
+    index = np.arange(dim)
+    # For W = i^{x.z} X^x Z^z we have Tr[rho W] = i^{x.z} sum_i (-1)^{z.i}
+    # rho[i, i ^ x], which is a Walsh-Hadamard transform over i
+    vals = rho[index[None, :], index[None, :] ^ index[:, None]]
+    for qubit in range(num_qubits):
+        vals = vals.reshape(dim, -1, 2, 2 ** qubit)
+        vals = np.stack([vals[:, :, 0] + vals[:, :, 1],
+                         vals[:, :, 0] - vals[:, :, 1]], axis=2)
+    vals = vals.reshape(dim, dim)
+    xbits = np.zeros(dim, dtype=int)
+    zbits = np.zeros(dim, dtype=int)
+    ybits = np.zeros((dim, dim), dtype=int)
+    for qubit in range(num_qubits):
+        bit = (index >> qubit) & 1
+        xbits |= bit << (2 * qubit)
+        zbits |= (3 * bit) << (2 * qubit)
+        ybits += bit[:, None] & bit[None, :]
+    expvals = np.zeros(dim ** 2)
+    expvals[xbits[:, None] ^ zbits[None, :]] = np.real(vals * 1j ** ybits)
+    return expvals
 
 
 ###########################################################################
@@ -142,7 +627,7 @@ def gateset_tomography_circuits(measured_qubits: Optional[List[int]] = None,
     r"""Return a list of quantum gate set tomography (GST) circuits.
 
     The circuits are fully constructed from the data given in gateset_basis.
-    Note that currently this is only implemented for the single-qubits.
+    The default gateset basis is available for 1 and 2 measured qubits.
 
     Args:
         measured_qubits: The qubits to perform GST. If None GST will be
@@ -155,7 +640,8 @@ def gateset_tomography_circuits(measured_qubits: Optional[List[int]] = None,
         appended.
 
     Raises:
-        QiskitError: If called for more than 1 measured qubit.
+        QiskitError: If the number of measured qubits does not match the
+            number of qubits of the gateset basis.
 
     Additional Information:
         Gate set tomography is performed on a gate set (G0, G1,...,Gm)
@@ -185,68 +671,182 @@ def gateset_tomography_circuits(measured_qubits: Optional[List[int]] = None,
     """
     if measured_qubits is None:
         measured_qubits = [0]
+    measured_qubits = list(measured_qubits)
 
-    if len(measured_qubits) > 1:
-        raise QiskitError("Only 1-qubit gate set tomography "
-                          "is currently supported")
+    if gateset_basis == 'default':
+        if len(measured_qubits) > 2:
+            raise QiskitError("Only 1 and 2-qubit gate set tomography "
+                              "is currently supported")
+        gateset_basis = default_gateset_basis(len(measured_qubits))
+    if len(measured_qubits) != getattr(gateset_basis, 'num_qubits', 1):
+        raise QiskitError("The number of measured qubits does not match "
+                          "the gateset basis")
     num_qubits = 1 + max(measured_qubits)
+    spam_labels = gateset_basis.spam_labels
 
     all_circuits = []
-    if gateset_basis == 'default':
-        gateset_basis = default_gateset_basis()
-    meas_basis = gateset_basis.get_tomography_basis()
-    prep_basis = gateset_basis.get_tomography_basis()
-    meas_labels = meas_basis.measurement_labels
-    prep_labels = prep_basis.preparation_labels
-#    qubit = QuantumRegister(num_qubits)
     # Experiments of the form <E|F_i G_k F_j|rho>
     for gate in gateset_basis.gate_labels:
-        circuit = QuantumCircuit(num_qubits)
-        # we assume only 1 qubit for now
-        qubit = circuit.qubits[measured_qubits[0]]
-        gateset_basis.add_gate_to_circuit(circuit, qubit, gate)
-        gst_circuits = _tomography_circuits(circuit, qubit, qubit,
-                                            meas_labels=meas_labels,
-                                            meas_basis=meas_basis,
-                                            prep_labels=prep_labels,
-                                            prep_basis=prep_basis)
-        for tomography_circuit in gst_circuits:
-            # Getting the names of Fi and Fj using regex
-            res = re.search("'(.*)'.*'(.*)'", tomography_circuit.name)
-            tomography_circuit.name = str((res.group(1), gate, res.group(2)))
-        all_circuits = all_circuits + gst_circuits
+        for prep, meas in it.product(spam_labels, spam_labels):
+            all_circuits.append(_gateset_circuit(
+                gateset_basis, num_qubits, measured_qubits,
+                prep, gate, meas, str((prep, gate, meas))))
 
     # Experiments of the form <E|F_i F_j|rho>
     # Can be skipped if one of the gates is ideal identity
-    circuit = QuantumCircuit(num_qubits)
-    qubit = circuit.qubits[measured_qubits[0]]
-    gst_circuits = _tomography_circuits(circuit, qubit, qubit,
-                                        meas_labels=meas_labels,
-                                        meas_basis=meas_basis,
-                                        prep_labels=prep_labels,
-                                        prep_basis=prep_basis)
-    for tomography_circuit in gst_circuits:
-        # Getting the names of Fi and Fj using regex
-        res = re.search("'(.*)'.*'(.*)'", tomography_circuit.name)
-        tomography_circuit.name = str((res.group(1), res.group(2)))
-    all_circuits = all_circuits + gst_circuits
+    for prep, meas in it.product(spam_labels, spam_labels):
+        all_circuits.append(_gateset_circuit(
+            gateset_basis, num_qubits, measured_qubits,
+            prep, None, meas, str((prep, meas))))
 
     # Experiments of the form <E|F_j|rho>
-    circuit = QuantumCircuit(num_qubits)
-    qubit = circuit.qubits[measured_qubits[0]]
-    gst_circuits = _tomography_circuits(circuit, qubit, qubit,
-                                        meas_labels=meas_labels,
-                                        meas_basis=meas_basis,
-                                        prep_labels=None,
-                                        prep_basis=None)
-    for tomography_circuit in gst_circuits:
-        # Getting the name of Fj using regex
-        res = re.search("'(.*)'", tomography_circuit.name)
-        tomography_circuit.name = str((res.group(1),))
-    all_circuits = all_circuits + gst_circuits
+    for meas in spam_labels:
+        all_circuits.append(_gateset_circuit(
+            gateset_basis, num_qubits, measured_qubits,
+            None, None, meas, str((meas,))))
 
     return all_circuits
 
+
+def _gateset_circuit(gateset_basis: GateSetBasis,
+                     num_qubits: int,
+                     measured_qubits: List[int],
+                     prep: Optional[str],
+                     gate: Optional[str],
+                     meas: str,
+                     name: str
+                     ) -> QuantumCircuit:
+    """Return a gate set tomography circuit <E|F_meas G_gate F_prep|rho>.
+
+    Args:
+        gateset_basis: The gateset and SPAM data.
+        num_qubits: the number of qubits of the circuit.
+        measured_qubits: the qubits of the gate set.
+        prep: the preparation SPAM label, or None for no preparation.
+        gate: the gate label, or None for no gate.
+        meas: the measurement SPAM label.
+        name: the name of the circuit.
+
+    Returns:
+        The gate set tomography circuit.
+    """
+    circuit = QuantumCircuit(QuantumRegister(num_qubits, 'q'),
+                             ClassicalRegister(len(measured_qubits)),
+                             name=name)
+    qubits = [circuit.qubits[qubit] for qubit in measured_qubits]
+    # Single-qubit gate sets are applied to a qubit and multi-qubit
+    # gate sets to the list of qubits
+    qargs = qubits[0] if len(qubits) == 1 else qubits
+    if prep is not None:
+        gateset_basis.add_spam_to_circuit(circuit, qargs, prep)
+        circuit.barrier()
+    if gate is not None:
+        gateset_basis.add_gate_to_circuit(circuit, qargs, gate)
+    circuit.barrier()
+    gateset_basis.add_spam_to_circuit(circuit, qargs, meas)
+    circuit.measure(qubits, circuit.clbits)
+    return circuit
+
+
+def long_gst_circuits(
+        measured_qubits: Optional[List[int]] = None,
+        gateset_basis: Union[str, GateSetBasis] = 'default',
+        germs: Optional[List[Tuple[str]]] = None,
+        max_lengths: Optional[List[int]] = None
+) -> List[QuantumCircuit]:
+    r"""Return a list of long-sequence gate set tomography (GST) circuits.
+
+    Args:
+        measured_qubits: The qubits to perform GST. If None GST will be
+                         performed on qubit-0.
+        gateset_basis: The gateset and SPAM data.
+        germs: (default: None) the germs given as tuples of gate labels.
+               If None each gate of the gateset is a germ.
+        max_lengths: (default: None) the maximum lengths L of the germ
+                     powers. If None the lengths 1, 2 and 4 are used.
+
+    Returns:
+        A list of QuantumCircuit objects, one for each distinct gate
+        string, named by the tuple of gate labels of the gate string in the
+        order in which the gates are applied.
+
+    Raises:
+        QiskitError: If the number of measured qubits does not match the
+            number of qubits of the gateset basis.
+
+    Additional Information:
+        For each maximum length L and germ g the gate string
+        :math:`F_j g^p F_i` is measured for all SPAM circuits
+        :math:`F_j, F_i`, where the germ power p is the largest power for
+        which :math:`g^p` has at most L gates. Germ powers amplify gate
+        errors, so the long sequences estimate gates with an accuracy that
+        improves with L. A maximum length of 0 gives the gate strings
+        :math:`F_j F_i` of the SPAM circuits only.
+
+        Gate strings which are equal for different lengths, germs or SPAM
+        circuits are only measured once. The gate instructions are only
+        generated once for each gate label and copied into the circuits.
+
+        References:
+
+        [1] E Nielsen et al., Quantum 5, 557 (2021).
+            Open access: arXiv:2009.07301 [quant-ph].
+    """
+    if measured_qubits is None:
+        measured_qubits = [0]
+    measured_qubits = list(measured_qubits)
+
+    if gateset_basis == 'default':
+        if len(measured_qubits) > 2:
+            raise QiskitError("Only 1 and 2-qubit gate set tomography "
+                              "is currently supported")
+        gateset_basis = default_gateset_basis(len(measured_qubits))
+    if len(measured_qubits) != getattr(gateset_basis, 'num_qubits', 1):
+        raise QiskitError("The number of measured qubits does not match "
+                          "the gateset basis")
+    if germs is None:
+        germs = [(gate,) for gate in gateset_basis.gate_labels]
+    if max_lengths is None:
+        max_lengths = [1, 2, 4]
+
+    # Distinct gate strings in the order of generation
+    spam = [tuple(gateset_basis.spam_spec[label])
+            for label in gateset_basis.spam_labels]
+    sequences = {}
+    for length in max_lengths:
+        germ_powers = [()] if length == 0 else [
+            tuple(germ) * (length // len(germ)) for germ in germs
+            if length >= len(germ)]
+        for germ_power in germ_powers:
+            for prep, meas in it.product(spam, spam):
+                sequences[prep + germ_power + meas] = None
+
+    # The gate, barrier and measurement instructions are generated once
+    # and copied into each circuit
+    qreg = QuantumRegister(1 + max(measured_qubits), 'q')
+    creg = ClassicalRegister(len(measured_qubits))
+    gate_data = {}
+    for gate in gateset_basis.gate_labels:
+        scratch = QuantumCircuit(qreg, creg)
+        qubits = [qreg[qubit] for qubit in measured_qubits]
+        gateset_basis.add_gate_to_circuit(
+            scratch, qubits[0] if len(qubits) == 1 else qubits, gate)
+        scratch.barrier()
+        gate_data[gate] = scratch.data
+    scratch = QuantumCircuit(qreg, creg)
+    scratch.measure([qreg[qubit] for qubit in measured_qubits], creg)
+    meas_data = scratch.data
+
+    circuits = []
+    for sequence in sequences:
+        circuit = QuantumCircuit(qreg, creg, name=str(sequence))
+        for gate in sequence:
+            _append_data(circuit, gate_data[gate])
+        _append_data(circuit, meas_data)
+        circuits.append(circuit)
+    return circuits
+
+
 ###########################################################################
 # General state and process tomography circuit functions
 ###########################################################################
@@ -259,8 +859,9 @@ def _tomography_circuits(
         meas_labels: Union[str, Tuple[str], List[Tuple[str]]] = 'Pauli',
         meas_basis: Union[str, TomographyBasis] = 'Pauli',
         prep_labels: Union[str, Tuple[str], List[Tuple[str]]] = 'Pauli',
-        prep_basis: Union[str, TomographyBasis] = 'Pauli'
-) -> List[QuantumCircuit]:
+        prep_basis: Union[str, TomographyBasis] = 'Pauli',
+        lazy: bool = False
+) -> Union[List[QuantumCircuit], Iterator[QuantumCircuit]]:
     """Return a list of quantum tomography circuits.
     This is the general circuit preparation function called by
     `state_tomography_circuits` and `process_tomography_circuits` and
@@ -283,13 +884,15 @@ def _tomography_circuits(
             labels. If None no preparations will be appended. See additional
             information for details
         prep_basis: (default: 'Pauli') The preparation basis.
+        lazy: (default: False) return a generator of the circuits instead
+            of a list.
     Raises:
         QiskitError: If the measurement/preparation basis is invalid.
         ValueError: If the measurement/preparation basis is not specified
     Returns:
         A list of QuantumCircuit objects containing the original circuit
         with state preparation circuits prepended, and measurement circuits
-        appended.
+        appended. If ``lazy=True`` a generator of the circuits is returned.
 
     Additional Information
 
@@ -366,51 +969,9 @@ def _tomography_circuits(
         prep_circuit_fn='SIC'.
     """
 
-    # Check for different prepared qubits
-    if prepared_qubits is None:
-        prepared_qubits = measured_qubits
-    # Check input circuit for measurements and measured qubits
-    if isinstance(measured_qubits, (list, tuple)):
-        # Unroll list of registers
-        if isinstance((measured_qubits[0]), int):
-            measured_qubits = [circuit.qubits[i] for i in measured_qubits]
-        meas_qubits = _format_registers(*measured_qubits)
-    else:
-        meas_qubits = _format_registers(measured_qubits)
-    if isinstance(prepared_qubits, (list, tuple)):
-        # Unroll list of registers
-        if isinstance(prepared_qubits[0], int):
-            prepared_qubits = [circuit.qubits[i] for i in prepared_qubits]
-        prep_qubits = _format_registers(*prepared_qubits)
-    else:
-        prep_qubits = _format_registers(prepared_qubits)
-    if len(prep_qubits) != len(meas_qubits):
-        raise QiskitError(
-            "prepared_qubits and measured_qubits are different length.")
+    meas_qubits, prep_qubits, qubit_registers = _tomography_qubits(
+        circuit, measured_qubits, prepared_qubits)
     num_qubits = len(meas_qubits)
-    meas_qubit_registers = set(q.register for q in meas_qubits)
-    # Check qubits being measured are defined in circuit
-    for reg in meas_qubit_registers:
-        if reg not in circuit.qregs:
-            logger.warning('WARNING: circuit does not contain '
-                           'measured QuantumRegister: %s', reg.name)
-
-    prep_qubit_registers = set(q.register for q in prep_qubits)
-    # Check qubits being measured are defined in circuit
-    for reg in prep_qubit_registers:
-        if reg not in circuit.qregs:
-            logger.warning('WARNING: circuit does not contain '
-                           'prepared QuantumRegister: %s', reg.name)
-
-    # Get combined registers
-    qubit_registers = prep_qubit_registers.union(meas_qubit_registers)
-
-    # Check if there are already measurements in the circuit
-    for op in circuit:
-        if isinstance(op, Measure):
-            logger.warning('WARNING: circuit already contains measurements')
-        if isinstance(op, Reset):
-            logger.warning('WARNING: circuit contains resets')
 
     # Load built-in circuit functions
     if callable(meas_basis):
@@ -455,35 +1016,57 @@ def _tomography_circuits(
         clbits = ClassicalRegister(num_qubits)
         registers.add(clbits)
 
-    # Generate the circuits
-    qst_circs = []
-    for prep_label in prep_labels:
-        prep = QuantumCircuit(*registers)
-        # Generate preparation circuit
-        if prep_label is not None:
-            for j in range(num_qubits):
-                prep += preparation(prep_label[j], prep_qubits[j])
-            prep.barrier(*qubit_registers)
-        # Add circuit being tomographed
-        prep += circuit
-        # Generate Measurement circuit
-        for meas_label in meas_labels:
-            meas = QuantumCircuit(*registers)
-            if meas_label is not None:
-                meas.barrier(*qubit_registers)
+    # The single-qubit preparation and measurement instructions are only
+    # generated once for each label and qubit, and copied into each of the
+    # returned circuits.
+    barrier = QuantumCircuit(*registers)
+    barrier.barrier(*qubit_registers)
+    barrier = barrier.data
+    prep_cache = {}
+    meas_cache = {}
+
+    def _prep_data(op, j):
+        if (op, j) not in prep_cache:
+            prep_cache[(op, j)] = preparation(op, prep_qubits[j]).data
+        return prep_cache[(op, j)]
+
+    def _meas_data(op, j):
+        if (op, j) not in meas_cache:
+            meas_cache[(op, j)] = measurement(op, meas_qubits[j],
+                                              clbits[j]).data
+        return meas_cache[(op, j)]
+
+    def _generate_circuits():
+        for prep_label in prep_labels:
+            # The preparation and circuit being tomographed are only
+            # composed once for each preparation label
+            prep = QuantumCircuit(*registers)
+            if prep_label is not None:
                 for j in range(num_qubits):
-                    meas += measurement(meas_label[j],
-                                        meas_qubits[j],
-                                        clbits[j])
-            circ = prep + meas
-            if prep_label is None:
-                # state tomography circuit
-                circ.name = str(meas_label)
-            else:
-                # process tomography circuit
-                circ.name = str((prep_label, meas_label))
-            qst_circs.append(circ)
-    return qst_circs
+                    _append_data(prep, _prep_data(prep_label[j], j))
+                _append_data(prep, barrier)
+            prep += circuit
+            for meas_label in meas_labels:
+                if prep_label is None:
+                    # state tomography circuit
+                    name = str(meas_label)
+                else:
+                    # process tomography circuit
+                    name = str((prep_label, meas_label))
+                circ = QuantumCircuit(*prep.qregs, *prep.cregs, name=name)
+                circ.global_phase = prep.global_phase
+                # The instructions of the preparation and of the circuit
+                # being tomographed are shared, as when composing circuits
+                _append_data(circ, prep.data, share=True)
+                if meas_label is not None:
+                    _append_data(circ, barrier)
+                    for j in range(num_qubits):
+                        _append_data(circ, _meas_data(meas_label[j], j))
+                yield circ
+
+    if lazy:
+        return _generate_circuits()
+    return list(_generate_circuits())
 
 
 ###########################################################################
@@ -623,6 +1206,116 @@ def _generate_labels(labels: Optional[Union[Tuple[str],
         'Invalid labels specification: must be None, list, string, or tuple')
 
 
+def _tomography_qubits(circuit: QuantumCircuit,
+                       measured_qubits: QuantumRegister,
+                       prepared_qubits: Optional[QuantumRegister] = None
+                       ) -> Tuple[List[Qubit], List[Qubit], set]:
+    """Return the measured and prepared qubits of a tomography experiment.
+
+    Args:
+        circuit: the QuantumCircuit circuit to be tomographed.
+        measured_qubits: the qubits to be measured.
+        prepared_qubits: the qubits to have state preparation applied, if
+            different from measured_qubits.
+    Raises:
+        QiskitError: If the prepared and measured qubits are different
+            length.
+    Returns:
+        A tuple of the list of measured qubits, the list of prepared
+        qubits, and the set of their quantum registers.
+    """
+    # Check for different prepared qubits
+    if prepared_qubits is None:
+        prepared_qubits = measured_qubits
+    # Check input circuit for measurements and measured qubits
+    if isinstance(measured_qubits, (list, tuple)):
+        # Unroll list of registers
+        if isinstance((measured_qubits[0]), int):
+            measured_qubits = [circuit.qubits[i] for i in measured_qubits]
+        meas_qubits = _format_registers(*measured_qubits)
+    else:
+        meas_qubits = _format_registers(measured_qubits)
+    if isinstance(prepared_qubits, (list, tuple)):
+        # Unroll list of registers
+        if isinstance(prepared_qubits[0], int):
+            prepared_qubits = [circuit.qubits[i] for i in prepared_qubits]
+        prep_qubits = _format_registers(*prepared_qubits)
+    else:
+        prep_qubits = _format_registers(prepared_qubits)
+    if len(prep_qubits) != len(meas_qubits):
+        raise QiskitError(
+            "prepared_qubits and measured_qubits are different length.")
+    meas_qubit_registers = set(q.register for q in meas_qubits)
+    # Check qubits being measured are defined in circuit
+    for reg in meas_qubit_registers:
+        if reg not in circuit.qregs:
+            logger.warning('WARNING: circuit does not contain '
+                           'measured QuantumRegister: %s', reg.name)
+
+    prep_qubit_registers = set(q.register for q in prep_qubits)
+    # Check qubits being measured are defined in circuit
+    for reg in prep_qubit_registers:
+        if reg not in circuit.qregs:
+            logger.warning('WARNING: circuit does not contain '
+                           'prepared QuantumRegister: %s', reg.name)
+
+    # Get combined registers
+    qubit_registers = prep_qubit_registers.union(meas_qubit_registers)
+
+    # Check if there are already measurements in the circuit
+    for op in circuit:
+        if isinstance(op, Measure):
+            logger.warning('WARNING: circuit already contains measurements')
+        if isinstance(op, Reset):
+            logger.warning('WARNING: circuit contains resets')
+    return meas_qubits, prep_qubits, qubit_registers
+
+
+def _u3_angles(circuit: QuantumCircuit) -> Tuple[float, float, float]:
+    """Return the U3 gate angles of a single-qubit basis circuit.
+
+    Args:
+        circuit: a single-qubit preparation or measurement basis circuit.
+            Any measurements in the circuit are ignored.
+    Raises:
+        QiskitError: If the circuit contains non-unitary instructions.
+    Returns:
+        The ``(theta, phi, lam)`` angles of the equivalent U3 gate.
+    """
+    unitary = QuantumCircuit(*circuit.qregs)
+    for inst, qargs, _ in circuit.data:
+        if isinstance(inst, Measure):
+            continue
+        if isinstance(inst, Reset) or inst.name == 'barrier':
+            raise QiskitError("Tomography basis circuit is not a "
+                              "single-qubit unitary.")
+        unitary.append(inst, qargs)
+    return OneQubitEulerDecomposer('U3').angles(Operator(unitary).data)
+
+
+def _append_data(circuit: QuantumCircuit, data: List,
+                 share: bool = False) -> None:
+    """Append circuit instructions to a circuit.
+
+    Unless they are shared, each instruction and its parameter list are
+    copied, so that the circuits built from the same cached instruction
+    data can be modified independently (e.g. with ``c_if``). The
+    instructions are on qubits and clbits of the circuit and are appended
+    without validation.
+
+    Args:
+        circuit: the circuit to append to.
+        data: a list of ``(instruction, qargs, cargs)`` on qubits and clbits
+            of the circuit.
+        share: if True append the instructions without copying them.
+    """
+    for inst, qargs, cargs in data:
+        if not share:
+            inst = copy.copy(inst)
+            inst.params = inst.params
+        circuit._append(inst, qargs, cargs)
+
+
 def _format_registers(*registers: Union[Qubit, QuantumRegister]
                       ) -> List[Qubit]:
     """Return a list of qubit QuantumRegister tuples.
@@ -18,7 +18,8 @@ Gate set tomography preparation and measurement basis
 
 # Needed for functions
 import functools
-from typing import Tuple, Callable, Union, Optional, Dict
+import itertools
+from typing import Tuple, Callable, Union, Optional, Dict, List
 import numpy as np
 
 # Import QISKit classes
@@ -46,11 +47,16 @@ class GateSetBasis:
         which adds to circ at qubit the gate labeled by op
     3) The labels of the SPAM circuits for the gate set tomography
     4) For SPAM label, tuple of gate labels for the gates in this SPAM circuit
+
+    For a multi-qubit gate set the gate functions are called with the list
+    of qubits instead of a single qubit, and gates given as Gate objects
+    must act on all of the qubits.
     """
     def __init__(self,
                  name: str,
                  gates: Dict[str, Union[Callable, Gate]],
-                 spam: Dict[str, Tuple[str]]
+                 spam: Dict[str, Tuple[str]],
+                 num_qubits: int = 1
                  ):
         """
         Initialize the gate set basis data
@@ -59,8 +65,10 @@ class GateSetBasis:
             name: Name of the basis.
             gates: The gate data (name -> gate/gate function)
             spam: The spam data (name -> sequence of gate names)
+            num_qubits: (default: 1) The number of qubits of the gate set.
         """
         self.name = name
+        self.num_qubits = num_qubits
         self.gate_labels = list(gates.keys())
         self.gates = gates
         self.gate_matrices = {name: np.real(self._gate_matrix(gate))
@@ -73,11 +81,25 @@ class GateSetBasis:
         if isinstance(gate, Gate):
             return PTM(gate).data
         if callable(gate):
-            c = QuantumCircuit(1)
-            gate(c, c.qubits[0])
+            c = QuantumCircuit(self.num_qubits)
+            gate(c, self._qargs(c.qubits))
             return PTM(c).data
         return None
 
+    def _qargs(self, qubits: List) -> Union[List, object]:
+        """Returns the qubit argument of the gate functions.
+
+        Args:
+            qubits: the list of qubits of the gate set
+
+        Returns:
+            The qubit for a single-qubit gate set, or the list of qubits
+            for a multi-qubit gate set.
+        """
+        if self.num_qubits == 1:
+            return qubits[0]
+        return list(qubits)
+
     def add_gate(self, gate: Union[Callable, Gate], name: Optional[str] = None):
         """Adds a new gate to the gateset
             Args:
@@ -108,7 +130,8 @@ class GateSetBasis:
 
         Args:
             circ: the circuit to apply op on
-            qubit: qubit to be operated on
+            qubit: qubit to be operated on, or the list of qubits for a
+                multi-qubit gate set
             op: gate name
 
         Raises:
@@ -120,7 +143,8 @@ class GateSetBasis:
         if callable(gate):
             gate(circ, qubit)
         if isinstance(gate, Gate):
-            circ.append(gate, [qubit], [])
+            qargs = qubit if isinstance(qubit, list) else [qubit]
+            circ.append(gate, qargs, [])
 
     def add_spam_to_circuit(self,
                             circ: QuantumCircuit,
@@ -132,7 +156,8 @@ class GateSetBasis:
 
         Args:
             circ: the circuit to apply op on
-            qubit: qubit to be operated on
+            qubit: qubit to be operated on, or the list of qubits for a
+                multi-qubit gate set
             op: SPAM circuit name
 
         Raises:
@@ -154,13 +179,20 @@ class GateSetBasis:
 
         Params:
             op: SPAM circuit name
-            qubit: qubit to be operated on and measured
-            clbit: clbit for measurement outcome.
+            qubit: qubit to be operated on and measured, or the list of
+                qubits for a multi-qubit gate set
+            clbit: clbit for measurement outcome, or the list of clbits
+                for a multi-qubit gate set.
 
         Returns:
             The measurement circuit
         """
-        circ = QuantumCircuit(qubit.register, clbit.register)
+        if isinstance(qubit, list):
+            registers = list(dict.fromkeys(
+                bit.register for bit in qubit + clbit))
+            circ = QuantumCircuit(*registers)
+        else:
+            circ = QuantumCircuit(qubit.register, clbit.register)
         self.add_spam_to_circuit(circ, qubit, op)
         circ.measure(qubit, clbit)
         return circ
@@ -246,20 +278,54 @@ class GateSetBasis:
                                             self.preparation_matrix))
 
 
-def default_gateset_basis():
+def default_gateset_basis(num_qubits: int = 1):
     """Returns a default tomographically-complete gateset basis
-        Return value: The gateset given as example 3.4.1 in arXiv:1509.02921
 
+    Args:
+        num_qubits: (default: 1) the number of qubits of the gate set.
+
+    Returns:
+        The gateset given as example 3.4.1 in arXiv:1509.02921. For two
+        qubits the gates are the single-qubit gates of this gateset on each
+        qubit, and the SPAM circuits are all products of the single-qubit
+        SPAM circuits on each qubit.
+
+    Raises:
+        RuntimeError: if the number of qubits is not 1 or 2.
     """
-    default_gates = {
-        'Id': lambda circ, qubit: None,
-        'X_Rot_90': lambda circ, qubit: circ.append(U2Gate(-np.pi / 2, np.pi / 2), [qubit]),
-        'Y_Rot_90': lambda circ, qubit: circ.append(U2Gate(np.pi, np.pi), [qubit])
-    }
+    x_rot = U2Gate(-np.pi / 2, np.pi / 2)
+    y_rot = U2Gate(np.pi, np.pi)
     default_spam = {
         'F0': ('Id',),
         'F1': ('X_Rot_90',),
         'F2': ('Y_Rot_90',),
         'F3': ('X_Rot_90', 'X_Rot_90')
     }
-    return GateSetBasis('Default GST', default_gates, default_spam)
+    if num_qubits == 1:
+        default_gates = {
+            'Id': lambda circ, qubit: None,
+            'X_Rot_90': lambda circ, qubit: circ.append(x_rot, [qubit]),
+            'Y_Rot_90': lambda circ, qubit: circ.append(y_rot, [qubit])
+        }
+        return GateSetBasis('Default GST', default_gates, default_spam)
+    if num_qubits != 2:
+        raise RuntimeError("No default gateset for {} qubits".format(
+            num_qubits))
+
+    def _rotation(gate, qubit):
+        return lambda circ, qubits: circ.append(gate, [qubits[qubit]])
+
+    default_gates = {'Id': lambda circ, qubits: None}
+    for qubit in range(num_qubits):
+        default_gates['X_Rot_90_{}'.format(qubit)] = _rotation(x_rot, qubit)
+        default_gates['Y_Rot_90_{}'.format(qubit)] = _rotation(y_rot, qubit)
+    spam = {}
+    for i, (spam0, spam1) in enumerate(itertools.product(
+            sorted(default_spam), repeat=2)):
+        gates = tuple('{}_0'.format(gate) for gate in default_spam[spam1]
+                      if gate != 'Id')
+        gates += tuple('{}_1'.format(gate) for gate in default_spam[spam0]
+                       if gate != 'Id')
+        spam['F{}'.format(i)] = gates if gates else ('Id',)
+    return GateSetBasis('Default 2-qubit GST', default_gates, spam,
+                        num_qubits=num_qubits)
@@ -21,4 +21,7 @@ Quantum tomography fitter functions
 from .state_fitter import StateTomographyFitter
 from .process_fitter import ProcessTomographyFitter
 from .gateset_fitter import GatesetTomographyFitter
+from .local_fitter import LocalTomographyFitter
+from .shadow_fitter import ShadowTomographyFitter
+from .dfe_fitter import DirectFidelityFitter
 from .base_fitter import TomographyFitter
@@ -17,24 +17,41 @@
 Maximum-Likelihood estimation quantum tomography fitter
 """
 
+import os
+import re
+import json
 import logging
+import tempfile
 import itertools as it
+from collections import OrderedDict
 from typing import List, Union, Optional, Dict, Tuple, Callable
 from ast import literal_eval
 import numpy as np
+from scipy import linalg as la
 
 
 from qiskit import QiskitError
 from qiskit import QuantumCircuit
 from qiskit.result import Result
+from qiskit.quantum_info import Choi, state_fidelity, process_fidelity
+from qiskit.tools import parallel_map
 from ..basis import TomographyBasis, default_basis
 from ..data import marginal_counts, combine_counts, count_keys
 from .lstsq_fit import lstsq_fit
 from .cvx_fit import cvx_fit, _HAS_CVX
+from .mle_pg_fit import mle_pg_fit
 
 # Create logger
 logger = logging.getLogger(__name__)
 
+# Basis matrices and unweighted pseudo-inverses of the most recently fitted
+# configurations, keyed by the names of the tomography bases and the
+# tomography labels (which also fix the number of qubits), so that new
+# fitters of the same configuration reuse them. Only a few configurations
+# are kept since process tomography basis matrices can be large.
+_BASIS_CACHE = OrderedDict()
+_BASIS_CACHE_SIZE = 2
+
 
 class TomographyFitter:
     """Base maximum-likelihood estimate tomography fitter class"""
@@ -43,15 +60,17 @@ class TomographyFitter:
     _HAS_SDP_SOLVER_NOT_SCS = False
 
     def __init__(self,
-                 result: Union[Result, List[Result]],
-                 circuits: Union[List[QuantumCircuit], List[str]],
+                 result: Optional[Union[Result, List[Result]]],
+                 circuits: Optional[Union[List[QuantumCircuit], List[str]]],
                  meas_basis: Union[TomographyBasis, str] = 'Pauli',
                  prep_basis: Union[TomographyBasis, str] = 'Pauli'):
         """Initialize tomography fitter with experimental data.
 
         Args:
             result: a Qiskit Result object obtained from executing
-                tomography circuits.
+                tomography circuits. If None the fitter is initialized
+                without data, which can be added using :meth:`add_data`
+                or :meth:`load_data`.
             circuits: a list of circuits or circuit names to extract
                 count information from the result object.
             meas_basis: (default: 'Pauli') A function to return
@@ -65,14 +84,18 @@ class TomographyFitter:
         # Set the measure and prep basis
         self._meas_basis = None
         self._prep_basis = None
+        # Basis matrix and unweighted pseudo-inverse of the last fitted
+        # configuration, shared with the module cache
+        self._basis_cache = {}
         self.set_measure_basis(meas_basis)
         self.set_preparation_basis(prep_basis)
 
         # Add initial data
         self._data = {}
-        if isinstance(result, Result):
-            result = [result]  # unify results handling
-        self.add_data(result, circuits)
+        if result is not None:
+            if isinstance(result, Result):
+                result = [result]  # unify results handling
+            self.add_data(result, circuits)
 
     def set_measure_basis(self, basis: Union[TomographyBasis, str]):
         """Set the measurement basis
@@ -126,6 +149,9 @@ class TomographyFitter:
         The ``'cvx'`` fitter method uses the CVXPY convex optimization package
         with a SDP solver.
         The ``'lstsq'`` method uses least-squares fitting.
+        The ``'mle_pg'`` method uses an accelerated projected gradient
+        method implemented with NumPy which solves the same constrained
+        problem as ``'cvx'`` without requiring CVXPY or an SDP solver.
         The ``'auto'`` method will use ``'cvx'`` if the both the CVXPY and a suitable
         SDP solver packages are found on the system, otherwise it will default
         to ``'lstsq'``.
@@ -184,7 +210,7 @@ class TomographyFitter:
             `arXiv:1106.5458 <https://arxiv.org/abs/1106.5458>`_ [quant-ph].
 
         Args:
-            method: The fitter method 'auto', 'cvx' or 'lstsq'.
+            method: The fitter method 'auto', 'cvx', 'lstsq' or 'mle_pg'.
             standard_weights: (default: True) Apply weights to
                 tomography data based on count probability
             beta: hedging parameter for converting counts
@@ -207,38 +233,149 @@ class TomographyFitter:
                                                         beta)
         # Choose automatic method
         if method == 'auto':
-            self._check_for_sdp_solver()
-            if self._HAS_SDP_SOLVER_NOT_SCS:
-                # We don't use the SCS solver for automatic method as it has
-                # lower accuracy than the other supported SDP solvers which
-                # typically results in the returned matrix not being
-                # completely positive.
-                method = 'cvx'
-            else:
-                method = 'lstsq'
-        if method == 'lstsq':
-            return lstsq_fit(data, basis_matrix,
-                             weights=weights,
-                             psd=psd,
-                             trace=trace,
-                             **kwargs)
-
-        if method == 'cvx':
-            return cvx_fit(data, basis_matrix,
-                           weights=weights,
-                           psd=psd,
-                           trace=trace,
+            method = self._auto_method()
+        if method == 'lstsq' and weights is None:
+            kwargs.setdefault('pinv_matrix', self._basis_pinv())
+        return _fit_matrix(method, data, basis_matrix, weights,
+                           psd=psd, trace=trace,
                            trace_preserving=trace_preserving,
                            **kwargs)
 
-        raise QiskitError('Unrecognized fit method {}'.format(method))
+    def bootstrap(self,
+                  num_samples: int = 100,
+                  target: Optional[object] = None,
+                  method: str = 'lstsq',
+                  parametric: bool = False,
+                  confidence: float = 0.95,
+                  standard_weights: bool = True,
+                  beta: float = 0.5,
+                  seed: Optional[int] = None,
+                  **kwargs) -> Dict[str, Union[np.array, Tuple[float]]]:
+        r"""Estimate error bars of the fit by bootstrap resampling.
+
+        For each bootstrap sample new measurement counts are drawn from a
+        multinomial distribution for every tomography label with the same
+        number of shots as the tomography data, and the resampled data is
+        refitted. The basis matrix of the tomography data is computed once
+        and shared by all refits, which are run in parallel using
+        :func:`qiskit.tools.parallel_map`.
+
+        **Resampling**
+
+        If ``parametric=False`` the counts are resampled from the observed
+        outcome frequencies (non-parametric bootstrap). If ``parametric=True``
+        they are resampled from the outcome probabilities predicted by the
+        fitted matrix (parametric bootstrap).
+
+        **Confidence intervals**
+
+        The purity :math:`\text{Tr}[\rho^2]` of the normalized fitted
+        matrix, and if a ``target`` is specified its state fidelity (state
+        tomography) or process fidelity (process tomography) with the target,
+        are computed for each bootstrap sample. Confidence intervals are
+        computed from the percentiles of the bootstrap samples.
+
+        Args:
+            num_samples: (default: 100) the number of bootstrap samples.
+            target: (default: None) the target state for state tomography,
+                or the target channel for process tomography, to compute
+                fidelities with.
+            method: (default: 'lstsq') the fitter method used for refitting.
+                See :meth:`fit` for the available methods.
+            parametric: (default: False) resample from the fitted model
+                instead of the observed frequencies.
+            confidence: (default: 0.95) the confidence level of the
+                returned intervals.
+            standard_weights: (default: True) Apply weights to
+                tomography data based on count probability
+            beta: (default: 0.5) hedging parameter for converting counts
+                to probabilities
+            seed: (default: None) seed for the random number generator.
+            **kwargs: kwargs for fitter method.
+
+        Returns:
+            A dictionary containing the array of bootstrap samples for the
+            ``'purity'``, and the ``'purity_interval'`` tuple
+            ``(lower, upper)`` of the confidence interval. If a target is
+            specified the ``'fidelity'`` samples and ``'fidelity_interval'``
+            are also included.
+        """
+        # Fitter data for all labels is computed once and reused for all
+        # of the bootstrap samples
+        _, basis_matrix, _ = self._fitter_data(False, beta)
+        counts = self._counts_array()
+        shots = np.sum(counts, axis=1)
+
+        if method == 'auto':
+            method = self._auto_method()
+        options = self._fit_options(basis_matrix)
+        if method == 'lstsq' and not standard_weights:
+            options['pinv_matrix'] = self._basis_pinv()
+        options.update(kwargs)
+
+        if parametric:
+            # Outcome probabilities predicted by the fitted matrix
+            data, _, weights = self._fitter_data(standard_weights, beta)
+            fit = _fit_matrix(method, data, basis_matrix, weights, **options)
+            probs = np.real(basis_matrix @ fit.ravel(order='F'))
+            probs = np.clip(probs.reshape(counts.shape), 0, None)
+        else:
+            probs = counts.astype(float)
+        probs /= np.sum(probs, axis=1, keepdims=True)
+
+        seeds = np.random.default_rng(seed).integers(
+            np.iinfo(np.int32).max, size=num_samples)
+        samples = parallel_map(
+            _bootstrap_sample, seeds,
+            task_args=(probs, shots, basis_matrix, method, options,
+                       standard_weights, beta, target, self._is_qpt()))
+
+        alpha = 100 * (1 - confidence) / 2
+        ret = {}
+        for j, name in enumerate(['purity', 'fidelity']):
+            if name == 'fidelity' and target is None:
+                break
+            vals = np.array([sample[j] for sample in samples])
+            ret[name] = vals
+            ret[name + '_interval'] = (np.percentile(vals, alpha),
+                                       np.percentile(vals, 100 - alpha))
+        return ret
+
+    def _auto_method(self) -> str:
+        """Return the fitter method to use for the 'auto' method."""
+        self._check_for_sdp_solver()
+        if self._HAS_SDP_SOLVER_NOT_SCS:
+            # We don't use the SCS solver for automatic method as it has
+            # lower accuracy than the other supported SDP solvers which
+            # typically results in the returned matrix not being
+            # completely positive.
+            return 'cvx'
+        return 'lstsq'
+
+    def _fit_options(self, basis_matrix: np.array) -> Dict:
+        """Return the default fitter constraints for this fitter.
+
+        Args:
+            basis_matrix: the basis matrix of the tomography data.
+
+        Returns:
+            The default ``psd``, ``trace`` and ``trace_preserving`` kwargs
+            for the fitter methods.
+        """
+        # pylint: disable=unused-argument
+        return {}
 
     @property
     def data(self):
         """
         Return tomography data
         """
-        return self._data
+        if not any(isinstance(cts, _StoredCounts)
+                   for cts in self._data.values()):
+            return self._data
+        return {label: _counts_dict(cts)
+                if isinstance(cts, _StoredCounts) else cts
+                for label, cts in self._data.items()}
 
     def add_data(self,
                  results: List[Result],
@@ -282,11 +419,150 @@ class TomographyFitter:
             if marginalize:
                 counts = marginal_counts(counts, range(len(tup[0])))
             if tup in self._data:
-                self._data[tup] = combine_counts(self._data[tup], counts)
+                self._data[tup] = _combine_data(self._data[tup], counts)
             else:
                 self._data[tup] = counts
 
-    def _fitter_data(self, standard_weights, beta):
+    def save_data(self,
+                  path: str,
+                  fits: Optional[Dict[str, np.array]] = None):
+        """Save the tomography data to an on-disk data store.
+
+        Args:
+            path: the directory of the data store. It is created if it
+                does not exist.
+            fits: (default: None) fitted matrices to save with the data,
+                by name. The names may only contain letters, digits,
+                underscores and hyphens. A saved fit replaces any fit of
+                the same name previously saved to the data store.
+
+        Raises:
+            QiskitError: If the fitter has no data, if its counts do not
+                have the number of outcomes of the data store, or if a fit
+                name is invalid.
+
+        Additional Information:
+            The data store consists of the file ``index.json`` with the
+            number of outcomes and the tomography labels of each segment
+            of counts, the NumPy files ``counts_<n>.npy`` with the array
+            of shape ``(num_labels, num_outcomes)`` of the counts of each
+            segment, and the NumPy files ``fit_<name>.npy`` of the saved
+            fits. Saving never rewrites existing counts: only the counts
+            of the fitter that were not loaded from or saved to the data
+            store are appended, and the saved counts are then memory-mapped
+            from the store. The data can be loaded
+            with :meth:`load_data`, so that tomography data collected over
+            several jobs can be accumulated and refit without the original
+            results. For example::
+
+                fitter = StateTomographyFitter(None, None)
+                fitter.load_data(path)
+                fitter.add_data([result], circuits)
+                fitter.save_data(path, fits={'lstsq': fitter.fit()})
+        """
+        if not self._data:
+            raise QiskitError("No tomography data to save")
+        fits = fits or {}
+        for name in fits:
+            if not isinstance(name, str) or \
+                    not re.fullmatch(r'[A-Za-z0-9_\-]+', name):
+                raise QiskitError("Invalid fit name {}".format(repr(name)))
+        path = os.path.abspath(path)
+        os.makedirs(path, exist_ok=True)
+        index = _read_index(path)
+
+        # Split the counts of each label into the rows already in the data
+        # store and the counts to append to it
+        stored = {}
+        data = {}
+        for label, cts in self._data.items():
+            stored[label], other = _split_stored(cts, path)
+            if other is not None:
+                data[label] = other
+        if data:
+            counts = self._counts_array(data)
+            if index['num_outcomes'] is None:
+                index['num_outcomes'] = counts.shape[1]
+            elif index['num_outcomes'] != counts.shape[1]:
+                raise QiskitError(
+                    "Counts with {} outcomes cannot be saved to a data store "
+                    "with {} outcomes".format(counts.shape[1],
+                                              index['num_outcomes']))
+            segment = 'counts_{}.npy'.format(len(index['segments']))
+            _write_file(path, segment, lambda file: np.save(file, counts))
+            index['segments'].append({'file': segment,
+                                      'labels': list(data)})
+        for name, fit in fits.items():
+            _write_file(path, 'fit_{}.npy'.format(name),
+                        lambda file, fit=fit: np.save(file, np.asarray(fit)))
+            if name not in index['fits']:
+                index['fits'].append(name)
+        # The index is written last, so that an interrupted save leaves
+        # the data store unchanged.
+        _write_file(path, 'index.json',
+                    lambda file: file.write(json.dumps(index).encode()))
+        if data:
+            # Memory-map the saved counts instead of keeping them in memory
+            counts = np.load(os.path.join(path, segment), mmap_mode='r')
+            for j, label in enumerate(data):
+                self._data[label] = _StoredCounts(stored[label] +
+                                                  [(counts, j)])
+
+    def load_data(self, path: str):
+        """Load tomography data from an on-disk data store.
+
+        The counts are memory-mapped, so they are only read from disk when
+        the fitter data is used. Loaded counts are combined with the
+        counts of any tomography labels already in the fitter. Counts the
+        fitter already loaded from or saved to the data store are not
+        loaded again.
+
+        Args:
+            path: the directory of a data store written by
+                :meth:`save_data`.
+
+        Raises:
+            QiskitError: If there is no data store in the directory.
+        """
+        path = os.path.abspath(path)
+        index = _read_index(path)
+        if not index['segments']:
+            raise QiskitError("No tomography data store in {}".format(path))
+        # The files of the counts already memory-mapped by the fitter
+        loaded = set(array.filename for cts in self._data.values()
+                     if isinstance(cts, _StoredCounts)
+                     for array, _ in cts.rows
+                     if getattr(array, 'filename', None))
+        for segment in index['segments']:
+            filename = os.path.join(path, segment['file'])
+            if filename in loaded:
+                continue
+            counts = np.load(filename, mmap_mode='r')
+            for j, label in enumerate(segment['labels']):
+                label = _to_tuple(label)
+                cts = _StoredCounts([(counts, j)])
+                if label in self._data:
+                    self._data[label] = _combine_data(self._data[label], cts)
+                else:
+                    self._data[label] = cts
+
+    @staticmethod
+    def load_fits(path: str) -> Dict[str, np.array]:
+        """Load the fits saved to an on-disk data store.
+
+        Args:
+            path: the directory of a data store written by
+                :meth:`save_data`.
+
+        Returns:
+            The memory-mapped fitted matrices saved to the data store, by
+            name.
+        """
+        return {name: np.load(os.path.join(path, 'fit_{}.npy'.format(name)),
+                              mmap_mode='r')
+                for name in _read_index(path)['fits']}
+
+    def _fitter_data(self, standard_weights, beta, tomo_data=None):
         """Generate tomography fitter data from a tomography data dictionary.
 
         Args:
@@ -294,6 +570,8 @@ class TomographyFitter:
                 and data based on count probability (default: True)
             beta (float): hedging parameter for 0, 1
             probabilities (default: 0.5)
+            tomo_data (dict, optional): tomography data dictionary to use
+                instead of the fitter data (default: None)
 
         Returns:
             tuple: (data, basis_matrix, weights) where `data`
@@ -320,39 +598,34 @@ class TomographyFitter:
         else:
             preparation = None
 
-        data = []
+        if tomo_data is None:
+            tomo_data = self._data
         basis_blocks = []
-        if standard_weights:
-            weights = []
-        else:
-            weights = None
 
         # Check if input data is state or process tomography data based
         # on the label tuples
-        label = next(iter(self._data))
-        is_qpt = (isinstance(label, tuple) and len(label) == 2 and
-                  isinstance(label[0], tuple) and isinstance(label[1], tuple))
-        # Generate counts keys for converting to np array
-        if is_qpt:
-            ctkeys = count_keys(len(label[1]))
+        is_qpt = self._is_qpt(tomo_data)
+
+        # Get probabilities and binomial weights for all labels at once
+        counts = self._counts_array(tomo_data)
+        shots = np.sum(counts, axis=1, keepdims=True)
+        data = (counts / shots).ravel()
+        if standard_weights is True:
+            weights = self._binomial_weights(counts, beta).ravel()
         else:
-            ctkeys = count_keys(len(label))
-        for label, cts in self._data.items():
-
-            # Convert counts dict to numpy array
-            if isinstance(cts, dict):
-                cts = np.array([cts.get(key, 0) for key in ctkeys])
-
-            # Get probabilities
-            shots = np.sum(cts)
-            probs = np.array(cts) / shots
-            data += list(probs)
-
-            # Compute binomial weights
-            if standard_weights is True:
-                wts = self._binomial_weights(cts, beta)
-                weights += list(wts)
+            weights = None
 
+        key = (getattr(self._meas_basis, 'name', None),
+               getattr(self._prep_basis, 'name', None),
+               tuple(tomo_data))
+        if self._basis_cache.get('key') == key:
+            return data, self._basis_cache['basis_matrix'], weights
+        if key in _BASIS_CACHE:
+            _BASIS_CACHE.move_to_end(key)
+            self._basis_cache = _BASIS_CACHE[key]
+            return data, self._basis_cache['basis_matrix'], weights
+
+        for label in tomo_data:
             # Get reconstruction basis operators
             if is_qpt:
                 prep_label = label[0]
@@ -366,9 +639,64 @@ class TomographyFitter:
                 [np.kron(prep_op.T, mop) for mop in meas_ops])
             basis_blocks.append(block)
 
-        return data, np.vstack(basis_blocks), weights
+        # The cached basis matrix is shared by all fits of the configuration
+        basis_matrix = np.vstack(basis_blocks)
+        basis_matrix.setflags(write=False)
+        self._basis_cache = {'key': key, 'basis_matrix': basis_matrix}
+        _BASIS_CACHE[key] = self._basis_cache
+        while len(_BASIS_CACHE) > _BASIS_CACHE_SIZE:
+            _BASIS_CACHE.popitem(last=False)
+        return data, basis_matrix, weights
 
-    def _binomial_weights(self, counts: Dict[str, int],
+    def _basis_pinv(self) -> np.array:
+        """Return the pseudo-inverse of the last computed basis matrix.
+
+        The pseudo-inverse is computed once for each configuration and
+        cached with its basis matrix for unweighted least-squares fits.
+        """
+        if 'pinv' not in self._basis_cache:
+            pinv = la.pinv(self._basis_cache['basis_matrix'])
+            pinv.setflags(write=False)
+            self._basis_cache['pinv'] = pinv
+        return self._basis_cache['pinv']
+
+    def _is_qpt(self, data: Optional[Dict] = None) -> bool:
+        """Return True if the data is process tomography data."""
+        # Check if input data is state or process tomography data based
+        # on the label tuples
+        if data is None:
+            data = self._data
+        label = next(iter(data))
+        return (isinstance(label, tuple) and len(label) == 2 and
+                isinstance(label[0], tuple) and isinstance(label[1], tuple))
+
+    def _counts_array(self, data: Optional[Dict] = None) -> np.array:
+        """Return the tomography counts as an array.
+
+        Args:
+            data: (default: None) tomography data dictionary to use instead
+                of the fitter data.
+
+        Returns:
+            An array of shape ``(num_labels, num_outcomes)`` of the counts
+            for each tomography label, in the order of the fitter data.
+        """
+        if data is None:
+            data = self._data
+        label = next(iter(data))
+        if self._is_qpt(data):
+            ctkeys = count_keys(len(label[1]))
+        else:
+            ctkeys = count_keys(len(label))
+        counts = []
+        for cts in data.values():
+            if isinstance(cts, dict):
+                cts = [cts.get(key, 0) for key in ctkeys]
+            counts.append(np.asarray(cts))
+        return np.array(counts)
+
+    @staticmethod
+    def _binomial_weights(counts: Union[Dict[str, int], np.array],
                           beta: float = 0.5
                           ) -> np.array:
         """
@@ -376,7 +704,9 @@ class TomographyFitter:
 
         Args:
             counts: A set of measurement counts for
-                all outcomes of a given measurement configuration.
+                all outcomes of a given measurement configuration, or an
+                array of shape ``(num_labels, num_outcomes)`` of the counts
+                of several measurement configurations.
             beta: (default: 0.5) A nonnegative hedging parameter used to bias
             probabilities computed from input counts away from 0 or 1.
 
@@ -400,31 +730,37 @@ class TomographyFitter:
             mcts = marginal_counts(counts, pad_zeros=True)
             ordered_keys = sorted(list(mcts))
             counts = np.array([mcts[k] for k in ordered_keys])
-        # Assume counts are already sorted if a list
+        # Assume counts are already sorted if a list or array
         else:
-            counts = np.array(counts)
-        shots = np.sum(counts)
+            counts = np.asarray(counts)
+        single = counts.ndim == 1
+        counts = np.atleast_2d(counts)
+        shots = np.sum(counts, axis=1, keepdims=True)
 
         # If beta is 0 check if we would be dividing by zero
-        # If so change beta value and log warning.
+        # If so change beta value for those counts and log warning.
 
         if beta < 0:
             raise ValueError('beta = {} must be non-negative.'.format(beta))
-        if beta == 0 and (shots in counts or 0 in counts):
-            beta = 0.5
-            msg = ("Counts result in probabilities of 0 or 1 "
-                   "in binomial weights "
-                   "calculation. Setting hedging "
-                   "parameter beta={} to prevent "
-                   "dividing by zero.".format(beta))
-            logger.warning(msg)
-
-        outcomes_num = len(counts)
+        betas = np.full(shots.shape, float(beta))
+        if beta == 0:
+            hedge = np.any((counts == 0) | (counts == shots), axis=1)
+            if np.any(hedge):
+                betas[hedge] = 0.5
+                msg = ("Counts result in probabilities of 0 or 1 "
+                       "in binomial weights "
+                       "calculation. Setting hedging "
+                       "parameter beta={} to prevent "
+                       "dividing by zero.".format(0.5))
+                logger.warning(msg)
+
+        outcomes_num = counts.shape[1]
         # Compute hedged frequencies which are shifted to never be 0 or 1.
-        freqs_hedged = (counts + beta) / (shots + outcomes_num * beta)
+        freqs_hedged = (counts + betas) / (shots + outcomes_num * betas)
 
         # Return gaussian weights for 2-outcome measurements.
-        return np.sqrt(shots / (freqs_hedged * (1 - freqs_hedged)))
+        weights = np.sqrt(shots / (freqs_hedged * (1 - freqs_hedged)))
+        return weights[0] if single else weights
 
     def _basis_operator_matrix(self, basis: List[np.array]) -> np.array:
         """Return a basis measurement matrix of the input basis.
@@ -546,3 +882,213 @@ class TomographyFitter:
                     except cvxpy.error.SolverError:
                         pass
             cls._HAS_SDP_SOLVER = False
+
+
+###########################################################################
+# Helper Functions
+###########################################################################
+
+class _StoredCounts:
+    """Counts of a tomography label in memory-mapped data store segments.
+
+    The rows of the segments are only read from disk, and summed, when the
+    counts are converted to an array.
+    """
+
+    def __init__(self, rows: List[Tuple[np.array, int]]):
+        self.rows = rows
+
+    def __len__(self):
+        array, _ = self.rows[0]
+        return array.shape[1]
+
+    def __array__(self, dtype=None):
+        total = sum(np.asarray(array[j]) for array, j in self.rows)
+        return np.asarray(total, dtype=dtype)
+
+
+def _combine_data(counts1: Union[Dict[str, int], np.array, _StoredCounts],
+                  counts2: Union[Dict[str, int], np.array, _StoredCounts]
+                  ) -> Union[Dict[str, int], np.array, _StoredCounts]:
+    """Combine the counts of a tomography label.
+
+    Args:
+        counts1: counts dictionary, array of counts of all outcomes or
+            stored counts.
+        counts2: counts dictionary, array of counts of all outcomes or
+            stored counts.
+
+    Returns:
+        The combined counts dictionary if both counts are dictionaries,
+        the combined stored counts if either counts are stored counts, and
+        otherwise the combined array of counts.
+    """
+    if isinstance(counts1, dict) and isinstance(counts2, dict):
+        return combine_counts(counts1, counts2)
+    arrays = []
+    for cts in [counts1, counts2]:
+        if isinstance(cts, dict):
+            size = len(counts2 if cts is counts1 else counts1)
+            num_qubits = int(np.log2(size))
+            cts = [cts.get(key, 0) for key in count_keys(num_qubits)]
+        arrays.append(cts)
+    if not any(isinstance(cts, _StoredCounts) for cts in arrays):
+        return np.asarray(arrays[0]) + np.asarray(arrays[1])
+    # Keep stored counts unread until they are used
+    rows = []
+    for cts in arrays:
+        if isinstance(cts, _StoredCounts):
+            rows += cts.rows
+        else:
+            rows.append((np.asarray(cts)[None, :], 0))
+    return _StoredCounts(rows)
+
+
+def _split_stored(counts: Union[Dict[str, int], np.array, _StoredCounts],
+                  path: str
+                  ) -> Tuple[List, Optional[Union[Dict[str, int], np.array,
+                                                  _StoredCounts]]]:
+    """Split the counts of a tomography label by a data store.
+
+    Args:
+        counts: counts dictionary, array of counts of all outcomes or
+            stored counts.
+        path: the absolute path of the data store.
+
+    Returns:
+        The rows of the stored counts memory-mapped from the data store,
+        and the other counts, or `None` if there are none.
+    """
+    if not isinstance(counts, _StoredCounts):
+        return [], counts
+    stored = []
+    other = []
+    for array, j in counts.rows:
+        filename = getattr(array, 'filename', None)
+        if filename and os.path.dirname(filename) == path:
+            stored.append((array, j))
+        else:
+            other.append((array, j))
+    return stored, _StoredCounts(other) if other else None
+
+
+def _counts_dict(counts: Union[np.array, _StoredCounts]) -> Dict[str, int]:
+    """Convert an array of counts of all outcomes to a counts dictionary."""
+    counts = np.asarray(counts)
+    keys = count_keys(int(np.log2(len(counts))))
+    return {key: int(val) for key, val in zip(keys, counts) if val}
+
+
+def _to_tuple(label: Union[List, str]) -> Union[Tuple, str]:
+    """Convert a JSON decoded tomography label back to a tuple."""
+    if isinstance(label, list):
+        return tuple(_to_tuple(item) for item in label)
+    return label
+
+
+def _read_index(path: str) -> Dict:
+    """Read the index of a tomography data store, or an empty index."""
+    try:
+        with open(os.path.join(path, 'index.json'), encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {'num_outcomes': None, 'segments': [], 'fits': []}
+
+
+def _write_file(path: str, name: str, write: Callable):
+    """Write a file of a tomography data store.
+
+    The file is written to a temporary file that then replaces it, since a
+    previous version of the file may be memory-mapped by a fitter.
+    """
+    with tempfile.NamedTemporaryFile(dir=path, delete=False) as file:
+        write(file)
+    os.replace(file.name, os.path.join(path, name))
+
+
+def _fit_matrix(method: str,
+                data: np.array,
+                basis_matrix: np.array,
+                weights: Optional[np.array] = None,
+                psd: bool = True,
+                trace: Optional[int] = None,
+                trace_preserving: bool = False,
+                **kwargs) -> np.array:
+    """Fit a matrix to tomography data using the specified method.
+
+    Args:
+        method: The fitter method 'cvx', 'lstsq' or 'mle_pg'.
+        data: vector of expectation values.
+        basis_matrix: matrix of measurement operators.
+        weights: weights to apply to the objective function.
+        psd: Enforced the fitted matrix to be positive semidefinite.
+        trace: trace constraint for the fitted matrix.
+        trace_preserving: Enforce the fitted matrix to be trace preserving.
+            This is ignored by the 'lstsq' fitter method.
+        **kwargs: kwargs for fitter method.
+    Raises:
+        QiskitError: In case the fitting method is unrecognized.
+    Returns:
+        The fitted matrix.
+    """
+    if method == 'lstsq':
+        return lstsq_fit(data, basis_matrix,
+                         weights=weights,
+                         psd=psd,
+                         trace=trace,
+                         **kwargs)
+
+    if method == 'cvx':
+        return cvx_fit(data, basis_matrix,
+                       weights=weights,
+                       psd=psd,
+                       trace=trace,
+                       trace_preserving=trace_preserving,
+                       **kwargs)
+
+    if method == 'mle_pg':
+        return mle_pg_fit(data, basis_matrix,
+                          weights=weights,
+                          psd=psd,
+                          trace=trace,
+                          trace_preserving=trace_preserving,
+                          **kwargs)
+
+    raise QiskitError('Unrecognized fit method {}'.format(method))
+
+
+def _bootstrap_sample(seed: int,
+                      probs: np.array,
+                      shots: np.array,
+                      basis_matrix: np.array,
+                      method: str,
+                      options: Dict,
+                      standard_weights: bool,
+                      beta: float,
+                      target: Optional[object],
+                      is_qpt: bool) -> Tuple[float, Optional[float]]:
+    """Resample tomography counts and refit for a single bootstrap sample.
+
+    Returns:
+        The purity and, if a target is specified, the fidelity of the
+        refitted matrix.
+    """
+    rng = np.random.default_rng(seed)
+    counts = np.array([rng.multinomial(shot, prob)
+                       for shot, prob in zip(shots, probs)])
+    data = (counts / shots[:, None]).ravel()
+    weights = None
+    if standard_weights:
+        weights = TomographyFitter._binomial_weights(counts, beta).ravel()
+    fit = _fit_matrix(method, data, basis_matrix, weights, **options)
+    fit = fit / np.trace(fit)
+    purity = np.real(np.trace(fit @ fit))
+    if target is None:
+        return purity, None
+    if is_qpt:
+        dim = int(np.sqrt(len(fit)))
+        fidelity = process_fidelity(Choi(dim * fit), target,
+                                    require_cp=False, require_tp=False)
+    else:
+        fidelity = state_fidelity(target, fit, validate=False)
+    return purity, fidelity
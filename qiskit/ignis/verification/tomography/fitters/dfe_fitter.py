@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Direct fidelity estimation from importance-sampled Pauli measurements
+"""
+
+import itertools as it
+from typing import List, Union, Dict, Tuple
+import numpy as np
+
+from qiskit import QiskitError
+from qiskit import QuantumCircuit
+from qiskit.result import Result
+from .base_fitter import TomographyFitter
+
+
+class DirectFidelityFitter:
+    """Direct fidelity estimator for sampled Pauli measurement data."""
+
+    def __init__(self,
+                 result: Union[Result, List[Result]],
+                 circuits: Union[List[QuantumCircuit], List[str]],
+                 settings: Dict[Union[str, Tuple[str, str]],
+                                Tuple[int, float]]
+                 ):
+        """Initialize direct fidelity estimation fitter with experimental data.
+
+        Args:
+            result: a Qiskit Result object obtained from executing
+                direct fidelity estimation circuits.
+            circuits: a list of circuits or circuit names to extract
+                count information from the result object, typically
+                generated by :func:`direct_fidelity_circuits`.
+            settings: the sampled Pauli observables returned by
+                :func:`direct_fidelity_circuits`.
+        """
+        fitter = TomographyFitter(result, circuits)
+        self._rows = {label: j for j, label in enumerate(fitter.data)}
+        self._counts = fitter._counts_array()  # pylint: disable=protected-access
+        self._settings = settings
+
+    @property
+    def num_settings(self) -> int:
+        """Return the total number of sampled Pauli observables."""
+        return sum(num for num, _ in self._settings.values())
+
+    def fidelity(self) -> float:
+        """Estimate the fidelity with the target.
+
+        Raises:
+            QiskitError: If the data for a sampled Pauli observable is
+                missing.
+
+        Returns:
+            The state fidelity estimate for state targets, or the process
+            fidelity estimate for process targets. Since the estimator is a
+            sample mean of importance weighted Pauli expectation values the
+            estimate may be outside of the interval [0, 1].
+        """
+        keys = list(self._settings)
+        samples = np.array([self._settings[key][0] for key in keys])
+        coeffs = np.array([self._settings[key][1] for key in keys])
+        if isinstance(keys[0], tuple):
+            values = self._ptm_values(keys)
+        else:
+            values = self._expectation_values(keys)
+        return np.sum(samples * coeffs * values) / np.sum(samples)
+
+    def _expectation_values(self, paulis: List[str]) -> np.array:
+        """Return the measured expectation values of Pauli observables."""
+        values = np.ones(len(paulis))
+        # The identity expectation value is one and has no circuit
+        inds = [j for j, pauli in enumerate(paulis) if _pauli_mask(pauli)]
+        if inds:
+            rows = np.array([[self._row(None, paulis[j])] for j in inds])
+            masks = np.array([_pauli_mask(paulis[j]) for j in inds])
+            values[inds] = self._parity_values(rows, masks)[:, 0]
+        return values
+
+    def _ptm_values(self, paulis: List[Tuple[str, str]]) -> np.array:
+        r"""Return the measured Pauli transfer matrix elements.
+
+        The element :math:`\text{Tr}[W_k E(W_l)] / d` is the signed sum
+        of the :math:`W_k` expectation values over the eigenstates of
+        :math:`W_l`.
+        """
+        num_qubits = len(paulis[0][0])
+        rows = []
+        signs = []
+        for meas, prep in paulis:
+            if _pauli_mask(meas) == 0 and _pauli_mask(prep) == 0:
+                rows.append(None)
+                signs.append(None)
+                continue
+            ops = [('Zp', 'Zm') if op == 'I' else (op + 'p', op + 'm')
+                   for op in reversed(prep)]
+            sgns = [(1, 1) if op == 'I' else (1, -1)
+                    for op in reversed(prep)]
+            rows.append([self._row(label, meas)
+                         for label in it.product(*ops)])
+            signs.append(np.prod(list(it.product(*sgns)), axis=1))
+
+        values = np.ones(len(paulis))
+        inds = [j for j, row in enumerate(rows) if row is not None]
+        if inds:
+            masks = np.array([_pauli_mask(paulis[j][0]) for j in inds])
+            expvals = self._parity_values(np.array([rows[j] for j in inds]),
+                                          masks)
+            values[inds] = np.sum(np.array([signs[j] for j in inds])
+                                  * expvals, axis=1) / 2 ** num_qubits
+        return values
+
+    def _row(self, prep: Tuple[str], meas: str) -> int:
+        """Return the counts array row of a measured Pauli observable."""
+        label = tuple('Z' if op == 'I' else op for op in reversed(meas))
+        if prep is not None:
+            label = (prep, label)
+        if label not in self._rows:
+            raise QiskitError("No data for Pauli measurement "
+                              "{}".format(label))
+        return self._rows[label]
+
+    def _parity_values(self, rows: np.array, masks: np.array) -> np.array:
+        """Return the expectation values of parity observables.
+
+        Args:
+            rows: array of shape ``(num_obs, num_rows)`` of the counts array
+                rows to evaluate each observable on.
+            masks: array of the bit masks of the measured qubits of each
+                observable.
+
+        Returns:
+            An array of shape ``(num_obs, num_rows)`` of the expectation
+            values.
+        """
+        outcomes = np.arange(self._counts.shape[1])
+        parity = np.zeros((len(masks), len(outcomes)), dtype=int)
+        bits = outcomes[None, :] & masks[:, None]
+        while np.any(bits):
+            parity ^= bits & 1
+            bits >>= 1
+        # Since bitstrings have qubit-0 as least significant bit
+        signs = 1 - 2 * parity
+        cts = self._counts[rows]
+        return (np.einsum('ors,os->or', cts, signs)
+                / np.sum(cts, axis=-1))
+
+
+def _pauli_mask(pauli: str) -> int:
+    """Return the bit mask of the non-identity qubits of a Pauli string."""
+    return sum(1 << qubit for qubit, op in enumerate(reversed(pauli))
+               if op != 'I')
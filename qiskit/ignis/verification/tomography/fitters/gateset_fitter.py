@@ -18,6 +18,7 @@
 Quantum gate set tomography fitter
 """
 
+import functools
 import itertools
 from typing import Union, List, Dict, Tuple, Optional
 import numpy as np
@@ -73,13 +74,18 @@ class GatesetTomographyFitter:
             result_gates = fitter.fit()
             result_gate = result_gates[gate.name]
         """
+        data = TomographyFitter(result, circuits).data
         self.gateset_basis = gateset_basis
         if gateset_basis == 'default':
-            self.gateset_basis = default_gateset_basis()
-        data = TomographyFitter(result, circuits).data
+            # the number of measured qubits of the circuits, as used by
+            # gateset_tomography_circuits to choose the default basis
+            outcome = next(iter(next(iter(data.values()))))
+            self.gateset_basis = default_gateset_basis(
+                len(outcome.replace(' ', '')))
+        ground = '0' * getattr(self.gateset_basis, 'num_qubits', 1)
         self.probs = {}
         for key, vals in data.items():
-            self.probs[key] = vals.get('0', 0) / sum(vals.values())
+            self.probs[key] = vals.get(ground, 0) / sum(vals.values())
 
     def linear_inversion(self) -> Dict[str, PTM]:
         """
@@ -148,15 +154,20 @@ class GatesetTomographyFitter:
 
     def _default_init_state(self, size):
         """Returns the PTM representation of the usual ground state"""
-        if size == 4:
-            return np.array([[np.sqrt(0.5)], [0], [0], [np.sqrt(0.5)]])
-        raise RuntimeError("No default init state for more than 1 qubit")
+        num_qubits = _ptm_num_qubits(size)
+        if num_qubits is None:
+            raise RuntimeError("No default init state of size {}".format(size))
+        # The ground state PTM vector is the (0, 0) entry of the normalized
+        # Pauli matrices, which is nonzero only for I and Z factors.
+        return _pauli_ptm_basis(num_qubits)[:, 0, 0].real.reshape(size, 1)
 
     def _default_measurement_op(self, size):
         """The PTM representation of the usual Z-basis measurement"""
-        if size == 4:
-            return np.array([[np.sqrt(0.5), 0, 0, np.sqrt(0.5)]])
-        raise RuntimeError("No default measurement op for more than 1 qubit")
+        num_qubits = _ptm_num_qubits(size)
+        if num_qubits is None:
+            raise RuntimeError("No default measurement op of size "
+                               "{}".format(size))
+        return _pauli_ptm_basis(num_qubits)[:, 0, 0].real.reshape(1, size)
 
     def _ideal_gateset(self, size):
         ideal_gateset = {label: PTM(self.gateset_basis.gate_matrices[label])
@@ -190,7 +201,9 @@ class GatesetTomographyFitter:
         optimizer = GST_Optimize(self.gateset_basis.gate_labels,
                                  self.gateset_basis.spam_labels,
                                  self.gateset_basis.spam_spec,
-                                 self.probs)
+                                 self.probs,
+                                 qubits=getattr(self.gateset_basis,
+                                                'num_qubits', 1))
         optimizer.set_initial_value(past_gauge_gateset)
         optimization_results = optimizer.optimize()
         return optimization_results
@@ -277,13 +290,51 @@ class GaugeOptimize():
                                          self.ideal_gateset['rho'])
         return result
 
+    def _obj_fn_grad(self, x: np.array) -> np.array:
+        """The gradient of the norm-based score function
+        Args:
+            x: An array representation of the B matrix
+
+        Returns:
+            The gradient of the score function with respect to x
+
+        Additional information:
+            For a gate term ||S - G_ideal|| with S = B^-1 G B the gradient
+            with respect to B is (B^-1 G)^T R - B^-T R S^T with
+            R = (S - G_ideal) / ||S - G_ideal||, and similarly for the
+            E and rho terms.
+        """
+        B = np.array(x).reshape((self.d, self.d))
+        BB = np.linalg.inv(B)
+
+        def _residual(diff):
+            norm = np.linalg.norm(diff)
+            return diff / norm if norm > 0 else np.zeros_like(diff)
+
+        grad = np.zeros((self.d, self.d), dtype=complex)
+        for label in self.gateset_basis.gate_labels:
+            G = BB @ self.initial_gateset[label].data
+            S = G @ B
+            R = _residual(S - self.ideal_gateset[label].data)
+            grad += G.T @ R - BB.T @ R @ S.T
+        E = self.initial_gateset['E']
+        grad += E.T @ _residual(E @ B - self.ideal_gateset['E'])
+        rho = BB @ self.initial_gateset['rho']
+        R = _residual(rho - self.ideal_gateset['rho'])
+        grad -= BB.T @ R @ rho.T
+        return np.real(grad).ravel()
+
     def optimize(self) -> List[np.array]:
         """The main optimization method
         Returns:
             The optimal gateset found by the gauge optimization
         """
-        initial_value = np.array([(F @ self.rho).T[0] for F in self.Fs]).T
-        result = opt.minimize(self._obj_fn, initial_value)
+        # The linear inversion gates are B^-1 G B for the matrix B of the
+        # ideal prepared states F_j rho, so its inverse is the ideal gauge
+        spam_states = np.array([(F @ self.rho).T[0] for F in self.Fs]).T
+        initial_value = np.linalg.inv(spam_states).ravel()
+        result = opt.minimize(self._obj_fn, initial_value,
+                              jac=self._obj_fn_grad)
         return self._x_to_gateset(result.x)
 
 
@@ -326,6 +377,11 @@ class GST_Optimize():
         self.qubits = qubits
         self.obj_fn_data = self._compute_objective_function_data()
         self.initial_value = None
+        self._ptm_map = self._choi_to_ptm_map(2 ** qubits)
+        self._constraint_indices = self._compute_constraint_indices()
+        # Constraint penalty weights of the multi-qubit MLE optimization
+        self.penalty_weights = (1e1, 1e3, 1e5)
+        self._jacobian_cache = (None, None)
 
     # auxiliary functions
     @staticmethod
@@ -368,33 +424,171 @@ class GST_Optimize():
         mvec = M.reshape(M.size)
         return list(np.concatenate([mvec.real, mvec.imag]))
 
-    def _compute_objective_function_data(self) -> List:
+    def _compute_objective_function_data(self) -> Tuple[List, np.array]:
         """Computes auxiliary data needed for efficient computation
         of the objective function.
 
         Returns:
-             The objective function data list
+             The objective function data tuple (spam_gates, m) where
+             spam_gates[i] is the list of gate indices of the SPAM circuit
+             F_i and m[i, j, k] is the measured value m_{ijk}.
         Additional information:
             The objective function is
             sum_{ijk}(<|E*R_Fi*G_k*R_Fj*Rho|>-m_{ijk})^2
-            We expand R_Fi*G_k*R_Fj to a sequence of G-gates and store
-            indices. We also obtain the m_{ijk} value from the probs list
-            all that remains when computing the function is thus
-            performing the matrix multiplications and remaining algebra.
+            We expand each R_Fi to a sequence of G-gates and store
+            indices. We also obtain the m_{ijk} values from the probs list
+            so that all that remains when computing the function is
+            computing the SPAM vectors E*R_Fi and R_Fj*Rho and contracting
+            them with the gates.
         """
         m = len(self.Fs)
         n = len(self.Gs)
-        obj_fn_data = []
+        spam_gates = [[self.Gs.index(gate) for gate in self.Fs[Fi]]
+                      for Fi in self.Fs_names]
+        m_ijk = np.zeros((m, m, n))
         for (i, j) in itertools.product(range(m), repeat=2):
             for k in range(n):
                 Fi = self.Fs_names[i]
                 Fj = self.Fs_names[j]
-                m_ijk = (self.probs[(Fj, self.Gs[k], Fi)])
-                Fi_matrices = [self.Gs.index(gate) for gate in self.Fs[Fi]]
-                Fj_matrices = [self.Gs.index(gate) for gate in self.Fs[Fj]]
-                matrices = Fj_matrices + [k] + Fi_matrices
-                obj_fn_data.append((matrices, m_ijk))
-        return obj_fn_data
+                m_ijk[i, j, k] = self.probs[(Fj, self.Gs[k], Fi)]
+        return spam_gates, m_ijk
+
+    @staticmethod
+    def _choi_to_ptm_map(d: int) -> np.array:
+        """Returns the matrix of the linear map from Choi to PTM matrices
+
+        Args:
+            d: The dimension of the gates
+
+        Returns:
+            The matrix K such that PTM(Choi(J)).data.ravel() equals
+            K @ J.ravel() for every dxd-dimensional Choi matrix J.
+        """
+        ds = d ** 2
+        basis = np.eye(ds ** 2, dtype=complex).reshape(ds ** 2, ds, ds)
+        return np.array([PTM(Choi(mat)).data.ravel() for mat in basis]).T
+
+    def _compute_constraint_indices(self) -> Dict[str, np.array]:
+        """Computes the indices of the constrained PTM matrix values
+
+        Returns:
+            A dictionary with the indices 'eq' of the PTM matrix values
+            with equality constraints and their constrained values
+            'eq_values', the indices 'ineq' of the PTM matrix values with
+            inequality constraints, and the coefficients 'trace' of the
+            trace of rho as a linear function of the rho matrix.
+
+        Additional information:
+            The PTM matrix values of each gate G consist of the real part
+            of G followed by its imaginary part. The first row of the real
+            part has equality constraints, and the remaining rows of the
+            real part have inequality constraints (see
+            _bounds_eq_constraint and _bounds_ineq_constraint).
+        """
+        n = len(self.Gs)
+        d = (2 ** self.qubits)
+        ds = d ** 2
+        real_part = np.zeros((ds, ds), dtype=bool)
+        real_part[0] = True
+        # The imaginary part of the PTM of a Hermitian Choi matrix is zero
+        # for any T, so constraining it only makes the constraint
+        # Jacobian singular.
+        eq_mask = np.concatenate([real_part.ravel(),
+                                  np.zeros(ds ** 2, dtype=bool)])
+        ineq_mask = np.concatenate([~real_part.ravel(),
+                                    np.zeros(ds ** 2, dtype=bool)])
+        eq_values = np.zeros(2 * ds ** 2)
+        eq_values[0] = 1  # G_{0,0} is 1
+        eq_mask = np.tile(eq_mask, n)
+        trace = np.array([np.trace(self._convert_from_ptm(vec))
+                          for vec in np.eye(ds)]).reshape(d, d)
+        return {'eq': np.nonzero(eq_mask)[0],
+                'eq_values': np.tile(eq_values, n)[eq_mask],
+                'ineq': np.nonzero(np.tile(ineq_mask, n))[0],
+                'trace': trace}
+
+    def _split_t_matrices(self, x: np.array) -> Tuple:
+        """Reconstruct the T matrices of the GST data from its vector
+        Args:
+            x: The vector representation of the GST data
+
+        Returns:
+            The T matrices (E_T, rho_T, Gs_T) such that E = E_T E_T^dagger,
+            rho = rho_T rho_T^dagger and the Choi matrices of the gates are
+            Gs_T[k] Gs_T[k]^dagger.
+        """
+        n = len(self.Gs)
+        d = (2 ** self.qubits)
+        ds = d ** 2  # d squared - the dimension of the density operator
+
+        d_t = 2 * d ** 2
+        ds_t = 2 * ds ** 2
+        T_vars = self._split_list(x, [d_t, d_t] + [ds_t] * n)
+
+        E_T = self._vec_to_complex_matrix(T_vars[0])
+        rho_T = self._vec_to_complex_matrix(T_vars[1])
+        Gs_T = np.array([self._vec_to_complex_matrix(T_vars[2 + i])
+                         for i in range(n)]).reshape(n, ds, ds)
+        return E_T, rho_T, Gs_T
+
+    def _spam_vectors(self,
+                      E: np.array,
+                      rho: np.array,
+                      Gs: np.array
+                      ) -> Tuple[List[List[np.array]], List[List[np.array]]]:
+        """Computes the measurement and preparation vectors of the SPAM
+        circuits.
+
+        Args:
+            E: The POVM measurement operator
+            rho: The initial state
+            Gs: The gates array
+
+        Returns:
+            Two lists (left, right) where left[i] is the list of partial
+            products E, E*G_l, ..., E*R_Fi ending with the measurement
+            vector E*R_Fi, and right[j] is the list of partial products
+            rho, G_f*rho, ..., R_Fj*rho ending with the preparation vector
+            R_Fj*rho.
+        """
+        spam_gates, _ = self.obj_fn_data
+        # SPAM circuits of multi-qubit gate sets share gate sequences, so
+        # the partial products are cached by their gate sequence.
+        left_cache = {(): E[0]}
+        right_cache = {(): rho[:, 0]}
+        left = []
+        right = []
+        for gates in spam_gates:
+            chain = [E[0]]
+            for s in range(len(gates)):
+                key = tuple(gates[len(gates) - s - 1:])
+                if key not in left_cache:
+                    left_cache[key] = chain[-1] @ Gs[key[0]]
+                chain.append(left_cache[key])
+            left.append(chain)
+            chain = [rho[:, 0]]
+            for s in range(len(gates)):
+                key = tuple(gates[:s + 1])
+                if key not in right_cache:
+                    right_cache[key] = Gs[key[-1]] @ chain[-1]
+                chain.append(right_cache[key])
+            right.append(chain)
+        return left, right
+
+    @staticmethod
+    def _t_matrix_grad(A: np.array, T: np.array) -> np.array:
+        """The gradient with respect to T of Re(sum(A * (T T^dagger)))
+
+        Args:
+            A: The gradient with respect to the matrix M = T T^dagger
+            T: The T matrix
+
+        Returns:
+            The gradient with respect to the real and imaginary parts
+            of T in the vector representation of T.
+        """
+        grad = (A.T + np.conj(A)) @ T
+        return np.concatenate([grad.real.ravel(), grad.imag.ravel()])
 
     def _split_input_vector(self, x: np.array) -> Tuple:
         """Reconstruct the GST data from its vector representation
@@ -417,21 +611,16 @@ class GST_Optimize():
             T such that M = T @ T^{dagger}.
             Hence, x stores those T matrices for E, rho and the Gs
         """
-        n = len(self.Gs)
-        d = (2 ** self.qubits)
-        ds = d ** 2  # d squared - the dimension of the density operator
-
-        d_t = 2 * d ** 2
-        ds_t = 2 * ds ** 2
-        T_vars = self._split_list(x, [d_t, d_t] + [ds_t] * n)
-
-        E_T = self._vec_to_complex_matrix(T_vars[0])
-        rho_T = self._vec_to_complex_matrix(T_vars[1])
-        Gs_T = [self._vec_to_complex_matrix(T_vars[2+i]) for i in range(n)]
+        E_T, rho_T, Gs_T = self._split_t_matrices(x)
+        n, ds, _ = Gs_T.shape
 
         E = np.reshape(E_T @ np.conj(E_T.T), (1, ds))
         rho = np.reshape(rho_T @ np.conj(rho_T.T), (ds, 1))
-        Gs = [PTM(Choi(G_T @ np.conj(G_T.T))).data for G_T in Gs_T]
+        # The Choi to PTM conversion is linear, so we apply it to all
+        # of the gates at once.
+        Gs_Choi = Gs_T @ np.conj(np.transpose(Gs_T, (0, 2, 1)))
+        Gs = (Gs_Choi.reshape(n, ds ** 2) @ self._ptm_map.T).reshape(
+            n, ds, ds)
 
         return (E, rho, Gs)
 
@@ -487,19 +676,72 @@ class GST_Optimize():
             For additional info, see section 3.5 in arXiv:1509.02921
         """
         E, rho, G_matrices = self._split_input_vector(x)
-        val = 0
-        for term in self.obj_fn_data:
-            term_val = rho
-            for G_index in term[0]:
-                term_val = G_matrices[G_index] @ term_val
-            term_val = E @ term_val
-            term_val = np.real(term_val[0][0])
-            term_val = term_val - term[1]  # m_{ijk}
-            term_val = term_val ** 2
-            val = val + term_val
-        return val
-
-    def _ptm_matrix_values(self, x: np.array) -> List[np.array]:
+        left, right = self._spam_vectors(E, rho, G_matrices)
+        left = np.array([chain[-1] for chain in left])
+        right = np.array([chain[-1] for chain in right])
+        p_ijk = np.real(np.einsum('ia,kab,jb->ijk',
+                                  left, G_matrices, right))
+        return np.sum((p_ijk - self.obj_fn_data[1]) ** 2)
+
+    def _obj_fn_grad(self, x: np.array) -> np.array:
+        """The gradient of the MLE objective function
+        Args:
+            x: The vector representation of the GST data (E, rho, Gs)
+
+        Returns:
+            The gradient of the MLE cost function with respect to x
+
+        Additional information:
+            The predicted results p_{ijk} are linear in E, rho and each
+            of the gates, so the gradient with respect to these is
+            computed by contracting the residuals with the SPAM vectors,
+            and is backpropagated through the gate products of the SPAM
+            circuits. The gradient with respect to the T matrices of
+            x is then obtained using the linearity of the Choi to PTM map.
+        """
+        spam_gates, m_ijk = self.obj_fn_data
+        E_T, rho_T, Gs_T = self._split_t_matrices(x)
+        E, rho, Gs = self._split_input_vector(x)
+        left, right = self._spam_vectors(E, rho, Gs)
+        L = np.array([chain[-1] for chain in left])
+        R = np.array([chain[-1] for chain in right])
+
+        GR = np.einsum('kab,jb->kja', Gs, R)
+        res = 2 * (np.real(np.einsum('ia,kja->ijk', L, GR)) - m_ijk)
+
+        # Gradients with respect to the gates and SPAM vectors
+        grad_Gs = np.einsum('ijk,ia,jb->kab', res, L, R).astype(complex)
+        grad_L = np.einsum('ijk,kja->ia', res, GR)
+        grad_R = np.einsum('ijk,ia,kab->jb', res, L, Gs)
+        grad_E = np.zeros(len(L), dtype=complex)
+        grad_rho = np.zeros(len(L), dtype=complex)
+
+        # Backpropagate through the SPAM circuit gate products
+        for i, gates in enumerate(spam_gates):
+            w = grad_L[i]
+            for s, G_index in enumerate(gates):
+                # left[i][-s-1] = left[i][-s-2] @ Gs[G_index]
+                grad_Gs[G_index] += np.outer(left[i][-s - 2], w)
+                w = Gs[G_index] @ w
+            grad_E += w
+            z = grad_R[i]
+            for s in reversed(range(len(gates))):
+                # right[i][s+1] = Gs[gates[s]] @ right[i][s]
+                grad_Gs[gates[s]] += np.outer(z, right[i][s])
+                z = z @ Gs[gates[s]]
+            grad_rho += z
+
+        d = len(E_T)
+        n, ds, _ = Gs_T.shape
+        grad_Choi = (grad_Gs.reshape(n, ds ** 2) @ self._ptm_map).reshape(
+            n, ds, ds)
+        grad = [self._t_matrix_grad(grad_E.reshape(d, d), E_T),
+                self._t_matrix_grad(grad_rho.reshape(d, d), rho_T)]
+        grad += [self._t_matrix_grad(grad_Choi[k], Gs_T[k])
+                 for k in range(n)]
+        return np.concatenate(grad)
+
+    def _ptm_matrix_values(self, x: np.array) -> np.array:
         """Returns a vectorization of the gates matrices
         Args:
             x: The vector representation of the GST data
@@ -516,10 +758,52 @@ class GST_Optimize():
             converted into the PTM representation of G.
         """
         _, _, G_matrices = self._split_input_vector(x)
-        result = []
-        for G in G_matrices:
-            result = result + self._complex_matrix_to_vec(G)
-        return result
+        n = len(G_matrices)
+        return np.hstack([G_matrices.real.reshape(n, -1),
+                          G_matrices.imag.reshape(n, -1)]).ravel()
+
+    def _ptm_matrix_jacobian(self, x: np.array) -> np.array:
+        """Returns the Jacobian of the vectorization of the gates matrices
+        Args:
+            x: The vector representation of the GST data
+
+        Returns:
+            The Jacobian matrix of _ptm_matrix_values with respect to x
+
+        Additional information:
+            For a gate with Choi matrix J = T T^dagger the derivatives of J
+            with respect to the real and imaginary parts of T[p, q] are
+            E_pq T^dagger + T E_qp and i (E_pq T^dagger - T E_qp), where
+            E_pq is the matrix unit. These are mapped to the PTM
+            representation using the linear Choi to PTM map.
+
+            Since the PTM entries are quadratic in the T matrices the
+            Jacobian depends on x and cannot be precomputed. Only the
+            Choi to PTM map and the constraint indices are constant, and
+            the Jacobian is cached for the last evaluated x.
+        """
+        # The equality and inequality constraint Jacobians are evaluated
+        # at the same point by the optimizer
+        cached_x, cached_jac = self._jacobian_cache
+        if cached_x is not None and np.array_equal(cached_x, x):
+            return cached_jac
+        _, _, Gs_T = self._split_t_matrices(x)
+        n, ds, _ = Gs_T.shape
+        d_t = 2 * (2 ** self.qubits) ** 2
+        ds_t = 2 * ds ** 2
+        eye = np.eye(ds)
+        jac = np.zeros((n * ds_t, 2 * d_t + n * ds_t))
+        for k, T in enumerate(Gs_T):
+            left = np.einsum('ap,bq->abpq', eye, np.conj(T))
+            right = np.einsum('aq,bp->abpq', T, eye)
+            d_re = (left + right).reshape(ds ** 2, ds ** 2)
+            d_im = 1j * (left - right).reshape(ds ** 2, ds ** 2)
+            d_ptm = self._ptm_map @ np.hstack([d_re, d_im])
+            rows = slice(k * ds_t, (k + 1) * ds_t)
+            cols = slice(2 * d_t + k * ds_t, 2 * d_t + (k + 1) * ds_t)
+            jac[rows, cols] = np.vstack([d_ptm.real, d_ptm.imag])
+        self._jacobian_cache = (np.copy(x), jac)
+        return jac
 
     def _rho_trace(self, x: np.array) -> Tuple[float]:
         """Returns the trace of the GST initial state
@@ -529,13 +813,12 @@ class GST_Optimize():
             The trace of rho - the initial state of the GST. The real
             and imaginary part are returned separately.
         """
-        _, rho, _ = self._split_input_vector(x)
-        d = (2 ** self.qubits)  # rho is dxd and starts at variable d^2
-        rho = self._convert_from_ptm(rho.reshape((d, d)))
-        trace = sum([rho[i][i] for i in range(d)])
+        _, rho_T, _ = self._split_t_matrices(x)
+        rho = rho_T @ np.conj(rho_T.T)
+        trace = np.sum(self._constraint_indices['trace'] * rho)
         return (np.real(trace), np.imag(trace))
 
-    def _bounds_eq_constraint(self, x: np.array) -> List[float]:
+    def _bounds_eq_constraint(self, x: np.array) -> np.array:
         """Equality MLE constraints on the GST data
 
         Args:
@@ -549,31 +832,17 @@ class GST_Optimize():
             the PTM representation we are using:
             1) G_{0,0} is 1 for every gate G
             2) The rest of the first row of each G is 0.
-            3) G only has real values, so imaginary part is 0.
+
+            G only has real values since its Choi matrix is Hermitian,
+            so its imaginary part is not constrained.
 
             For additional info, see section 3.5.2 in arXiv:1509.02921
         """
         ptm_matrix = self._ptm_matrix_values(x)
-        bounds_eq = []
-        n = len(self.Gs)
-        d = (2 ** self.qubits)  # rho is dxd and starts at variable d^2
-        ds = d ** 2
+        indices = self._constraint_indices
+        return ptm_matrix[indices['eq']] - indices['eq_values']
 
-        i = 0
-        for _ in range(n):  # iterate over all Gs
-            bounds_eq.append(ptm_matrix[i] - 1)  # G^k_{0,0} is 1
-            i += 1
-            for _ in range(ds - 1):
-                bounds_eq.append(ptm_matrix[i] - 0)  # G^k_{0,i} is 0
-                i += 1
-            for _ in range((ds - 1) * ds):  # rest of G^k
-                i += 1
-            for _ in range(ds ** 2):  # the complex part of G^k
-                bounds_eq.append(ptm_matrix[i] - 0)  # G^k_{0,i} is 0
-                i += 1
-        return bounds_eq
-
-    def _bounds_ineq_constraint(self, x: np.array) -> List[float]:
+    def _bounds_ineq_constraint(self, x: np.array) -> np.array:
         """Inequality MLE constraints on the GST data
 
         Args:
@@ -592,23 +861,9 @@ class GST_Optimize():
             For additional info, see section 3.5.2 in arXiv:1509.02921
         """
         ptm_matrix = self._ptm_matrix_values(x)
-        bounds_ineq = []
-        n = len(self.Gs)
-        d = (2 ** self.qubits)  # rho is dxd and starts at variable d^2
-        ds = d ** 2
-
-        i = 0
-        for _ in range(n):  # iterate over all Gs
-            i += 1
-            for _ in range(ds - 1):
-                i += 1
-            for _ in range((ds - 1) * ds):  # rest of G^k
-                bounds_ineq.append(ptm_matrix[i] + 1)  # G_k[i] >= -1
-                bounds_ineq.append(-ptm_matrix[i] + 1)  # G_k[i] <= 1
-                i += 1
-            for _ in range(ds ** 2):  # the complex part of G^k
-                i += 1
-        return bounds_ineq
+        values = ptm_matrix[self._constraint_indices['ineq']]
+        # G_k[i] >= -1 and G_k[i] <= 1
+        return np.stack([values + 1, 1 - values], axis=1).ravel()
 
     def _rho_trace_constraint(self, x: np.array) -> List[float]:
         """The constraint Tr(rho) = 1
@@ -619,10 +874,50 @@ class GST_Optimize():
             The list of computed constraint values (should be equal 0)
 
         Additional information:
-            We demand real(Tr(rho)) == 1 and imag(Tr(rho)) == 0
+            We demand real(Tr(rho)) == 1. The imaginary part of Tr(rho)
+            is zero for any x since rho = T T^dagger is Hermitian.
         """
         trace = self._rho_trace(x)
-        return [trace[0] - 1, trace[1]]
+        return [trace[0] - 1]
+
+    def _rho_trace_constraint_jac(self, x: np.array) -> np.array:
+        """The Jacobian of the constraint Tr(rho) = 1
+        Args:
+            x: The vector representation of the GST data
+
+        Return:
+            The Jacobian matrix of the real part of Tr(rho)
+        """
+        _, rho_T, _ = self._split_t_matrices(x)
+        d = len(rho_T)
+        coeffs = self._constraint_indices['trace']
+        jac = np.zeros((1, len(x)))
+        rows = slice(2 * d ** 2, 4 * d ** 2)
+        jac[0, rows] = self._t_matrix_grad(coeffs, rho_T)
+        return jac
+
+    def _bounds_eq_constraint_jac(self, x: np.array) -> np.array:
+        """The Jacobian of the equality MLE constraints on the GST data
+        Args:
+            x: The vector representation of the GST data
+
+        Return:
+            The Jacobian matrix of _bounds_eq_constraint
+        """
+        jac = self._ptm_matrix_jacobian(x)
+        return jac[self._constraint_indices['eq']]
+
+    def _bounds_ineq_constraint_jac(self, x: np.array) -> np.array:
+        """The Jacobian of the inequality MLE constraints on the GST data
+        Args:
+            x: The vector representation of the GST data
+
+        Return:
+            The Jacobian matrix of _bounds_ineq_constraint
+        """
+        jac = self._ptm_matrix_jacobian(x)[self._constraint_indices['ineq']]
+        # Each entry has a lower and an upper bound constraint
+        return np.stack([jac, -jac], axis=1).reshape(-1, jac.shape[1])
 
     def _constraints(self) -> List[Dict]:
         """Generates the constraints for the MLE optimization
@@ -637,19 +932,19 @@ class GST_Optimize():
             that are being constrained.
         """
         cons = []
-        cons.append({'type': 'eq', 'fun': self._rho_trace_constraint})
-        cons.append({'type': 'eq', 'fun': self._bounds_eq_constraint})
-        cons.append({'type': 'ineq', 'fun': self._bounds_ineq_constraint})
+        cons.append({'type': 'eq', 'fun': self._rho_trace_constraint,
+                     'jac': self._rho_trace_constraint_jac})
+        cons.append({'type': 'eq', 'fun': self._bounds_eq_constraint,
+                     'jac': self._bounds_eq_constraint_jac})
+        cons.append({'type': 'ineq', 'fun': self._bounds_ineq_constraint,
+                     'jac': self._bounds_ineq_constraint_jac})
         return cons
 
     def _convert_from_ptm(self, vector):
         """Converts a vector back from PTM representation"""
-        Id = np.sqrt(0.5) * np.array([[1, 0], [0, 1]])
-        X = np.sqrt(0.5) * np.array([[0, 1], [1, 0]])
-        Y = np.sqrt(0.5) * np.array([[0, -1j], [1j, 0]])
-        Z = np.sqrt(0.5) * np.array([[1, 0], [0, -1]])
-        v = vector.reshape(4)
-        return v[0] * Id + v[1] * X + v[2] * Y + v[3] * Z
+        basis = _pauli_ptm_basis(self.qubits)
+        v = vector.reshape(len(basis))
+        return np.tensordot(v, basis, axes=1)
 
     def _process_result(self, x: np.array) -> Dict:
         """Transforms the optimization result to a friendly format
@@ -686,8 +981,105 @@ class GST_Optimize():
         """
         if initial_value is not None:
             self.initial_value = initial_value
-        result = opt.minimize(self._obj_fn, self.initial_value,
-                              method='SLSQP',
-                              constraints=self._constraints())
-        formatted_result = self._process_result(result.x)
+        if self.qubits == 1:
+            result = opt.minimize(self._obj_fn, self.initial_value,
+                                  method='SLSQP',
+                                  jac=self._obj_fn_grad,
+                                  constraints=self._constraints())
+            x = result.x
+        else:
+            x = self.initial_value
+            for weight in self.penalty_weights:
+                result = opt.minimize(self._penalty_fn, x, args=(weight,),
+                                      method='L-BFGS-B', jac=True)
+                x = result.x
+        formatted_result = self._process_result(x)
         return formatted_result
+
+    def _penalty_fn(self, x: np.array, weight: float) -> Tuple:
+        """The MLE objective function with quadratic constraint penalties
+        Args:
+            x: The vector representation of the GST data
+            weight: The weight of the constraint penalties
+
+        Returns:
+            The penalized objective function and its gradient
+
+        Additional information:
+            The sum of squares of the equality constraint values and of
+            the violated inequality constraint values is added to the
+            objective function. Minimizing this function with increasing
+            weights approximates the constrained MLE optimization without
+            the dense quadratic programs solved by SLSQP, which are too
+            slow for the number of parameters of multi-qubit gate sets.
+        """
+        indices = self._constraint_indices
+        ptm_matrix = self._ptm_matrix_values(x)
+        eq = ptm_matrix[indices['eq']] - indices['eq_values']
+        values = ptm_matrix[indices['ineq']]
+        below = np.minimum(values + 1, 0)
+        above = np.minimum(1 - values, 0)
+        trace = self._rho_trace_constraint(x)[0]
+        value = self._obj_fn(x) + weight * (
+            eq @ eq + below @ below + above @ above + trace ** 2)
+
+        # Gradient of the penalties with respect to the PTM matrix values
+        grad_ptm = np.zeros(len(ptm_matrix))
+        grad_ptm[indices['eq']] = 2 * weight * eq
+        grad_ptm[indices['ineq']] = 2 * weight * (below - above)
+        grad = self._obj_fn_grad(x) + self._ptm_matrix_vjp(x, grad_ptm)
+        grad += 2 * weight * trace * self._rho_trace_constraint_jac(x)[0]
+        return value, grad
+
+    def _ptm_matrix_vjp(self, x: np.array, w: np.array) -> np.array:
+        """Returns the product of a vector with the Jacobian of the
+        vectorization of the gates matrices
+        Args:
+            x: The vector representation of the GST data
+            w: A vector of the size of _ptm_matrix_values(x)
+
+        Returns:
+            The gradient of w @ _ptm_matrix_values(x) with respect to x,
+            computed without the full _ptm_matrix_jacobian matrix.
+        """
+        E_T, _, Gs_T = self._split_t_matrices(x)
+        n, ds, _ = Gs_T.shape
+        w = w.reshape(n, 2, ds ** 2)
+        # Re((w_re - i w_im) * G) = w_re * Re(G) + w_im * Im(G)
+        grad_Gs = w[:, 0] - 1j * w[:, 1]
+        grad_Choi = (grad_Gs @ self._ptm_map).reshape(n, ds, ds)
+        grad = [np.zeros(4 * E_T.size)]
+        grad += [self._t_matrix_grad(grad_Choi[k], Gs_T[k])
+                 for k in range(n)]
+        return np.concatenate(grad)
+
+
+@functools.lru_cache(maxsize=None)
+def _pauli_ptm_basis(num_qubits: int) -> np.array:
+    """Returns the normalized Pauli basis of the PTM representation
+
+    Args:
+        num_qubits: The number of qubits
+
+    Returns:
+        An array of the 4^n matrices P_i / sqrt(2^n) in the order of the
+        PTM representation, where qubit-0 is the least significant index.
+    """
+    paulis = np.sqrt(0.5) * np.array([[[1, 0], [0, 1]],
+                                      [[0, 1], [1, 0]],
+                                      [[0, -1j], [1j, 0]],
+                                      [[1, 0], [0, -1]]])
+    basis = np.ones((1, 1, 1))
+    for _ in range(num_qubits):
+        basis = np.array([np.kron(pauli, mat)
+                          for pauli in paulis for mat in basis])
+    return basis
+
+
+def _ptm_num_qubits(size: int) -> Optional[int]:
+    """Returns the number of qubits of a PTM vector size, or None if the
+    size is not a power of 4"""
+    num_qubits = int(round(np.log2(size))) // 2
+    if 4 ** num_qubits != size:
+        return None
+    return num_qubits
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Local quantum state tomography fitter for k-qubit reduced density matrices
+"""
+
+import itertools as it
+from typing import List, Union, Dict, Tuple, Optional
+import numpy as np
+
+from qiskit import QiskitError
+from qiskit import QuantumCircuit
+from qiskit.result import Result
+from qiskit.tools import parallel_map
+from ..basis import TomographyBasis
+from .state_fitter import StateTomographyFitter
+from .base_fitter import _fit_matrix
+
+
+class LocalTomographyFitter(StateTomographyFitter):
+    """Local state tomography fitter for k-qubit reduced density matrices."""
+
+    def __init__(self,
+                 result: Union[Result, List[Result]],
+                 circuits: Union[List[QuantumCircuit], List[str]],
+                 k: int = 2,
+                 meas_basis: Union[TomographyBasis, str] = 'Pauli'
+                 ):
+        """Initialize local tomography fitter with experimental data.
+
+        Args:
+            result: a Qiskit Result object obtained from executing
+                tomography circuits.
+            circuits: a list of circuits or circuit names to extract
+                count information from the result object, typically
+                generated by :func:`local_tomography_circuits`.
+            k: (default: 2) the size of the subsystems to reconstruct.
+            meas_basis: (default: 'Pauli') A function to return measurement
+                operators corresponding to measurement outcomes.
+
+        Additional Information:
+            The inherited :meth:`save_data` and :meth:`load_data` save and
+            load the counts of the full measured register, so any
+            subsystems can be fitted after loading them. The subsystem size
+            ``k`` is not saved. :meth:`bootstrap` is not supported.
+        """
+        super().__init__(result, circuits, meas_basis)
+        self._strength = k
+
+    @property
+    def num_qubits(self) -> int:
+        """Return the number of measured qubits."""
+        return len(next(iter(self._data)))
+
+    def fit(self,
+            method: str = 'auto',
+            standard_weights: bool = True,
+            beta: float = 0.5,
+            *,
+            subsystems: Optional[List[Tuple[int]]] = None,
+            **kwargs) -> Dict[Tuple[int], np.array]:
+        r"""Reconstruct the k-qubit reduced density matrices.
+
+        The counts of every tomography circuit are marginalized onto each
+        subsystem, and the counts of measurement settings which agree on the
+        subsystem are combined. Each reduced density matrix is then fitted
+        using the state tomography ``method`` with the PSD and unit trace
+        constraints. The subsystems are fitted in parallel using
+        :func:`qiskit.tools.parallel_map`.
+
+        Args:
+            method: (default: 'auto') The fitter method 'auto', 'cvx',
+                'lstsq' or 'mle_pg'. See :meth:`StateTomographyFitter.fit`.
+            standard_weights: (default: True) Apply weights to
+                tomography data based on count probability
+            beta: (default: 0.5) hedging parameter for converting counts
+                to probabilities
+            subsystems: (default: None) the subsystems to reconstruct given
+                as tuples of measured qubit indices. If None all k-qubit
+                subsystems are reconstructed.
+            **kwargs: kwargs for fitter method.
+        Raises:
+            QiskitError: If the data for a subsystem is not informationally
+                complete.
+        Returns:
+            A dictionary of the fitted density matrix for each subsystem.
+            The subsystem density matrices use the same qubit ordering as
+            :func:`qiskit.quantum_info.partial_trace`, with the first qubit
+            of the subsystem as the least significant qubit.
+        """
+        if subsystems is None:
+            subsystems = list(it.combinations(range(self.num_qubits),
+                                              self._strength))
+        subsystems = [tuple(sorted(sub)) for sub in subsystems]
+
+        # Convert counts to arrays of integer outcomes for marginalization
+        outcomes = []
+        for label, cts in self._data.items():
+            if isinstance(cts, dict):
+                keys = np.array([int(key.replace(' ', ''), 2)
+                                 for key in cts])
+                vals = np.array(list(cts.values()))
+            else:
+                keys = np.arange(len(cts))
+                vals = np.asarray(cts)
+            outcomes.append((label, keys, vals))
+        symbols = set(op for label in self._data for op in label)
+
+        fitter_data = []
+        for sub in subsystems:
+            tomo_data = self._subsystem_data(outcomes, sub)
+            if len(tomo_data) != len(symbols) ** len(sub):
+                raise QiskitError("Tomography data for subsystem {} is not "
+                                  "informationally complete.".format(sub))
+            fitter_data.append(self._fitter_data(standard_weights, beta,
+                                                 tomo_data))
+
+        if method == 'auto':
+            method = self._auto_method()
+        options = {'psd': True, 'trace': 1}
+        options.update(kwargs)
+        fits = parallel_map(_fit_subsystem, fitter_data,
+                            task_args=(method, options))
+        return dict(zip(subsystems, fits))
+
+    def bootstrap(self, *args, **kwargs):
+        """Bootstrap resampling is not supported for local tomography.
+
+        Raises:
+            QiskitError: always, since the bootstrap of the base fitter
+                refits the full density matrix instead of the subsystems.
+        """
+        raise QiskitError("bootstrap is not supported by "
+                          "LocalTomographyFitter")
+
+    @staticmethod
+    def _subsystem_data(outcomes: List[Tuple],
+                        subsystem: Tuple[int]
+                        ) -> Dict[Tuple[str], np.array]:
+        """Return the marginal tomography data for a subsystem.
+
+        Args:
+            outcomes: list of the ``(label, outcomes, counts)`` arrays of
+                each tomography label.
+            subsystem: the measured qubit indices of the subsystem.
+        Returns:
+            A dictionary of the combined marginal counts arrays for each
+            subsystem measurement label.
+        """
+        num_outcomes = 2 ** len(subsystem)
+        tomo_data = {}
+        for label, keys, vals in outcomes:
+            # Since bitstrings have qubit-0 as least significant bit
+            index = np.zeros(len(keys), dtype=int)
+            for j, qubit in enumerate(subsystem):
+                index |= ((keys >> qubit) & 1) << j
+            cts = np.bincount(index, weights=vals, minlength=num_outcomes)
+            sub_label = tuple(label[qubit] for qubit in subsystem)
+            if sub_label in tomo_data:
+                tomo_data[sub_label] = tomo_data[sub_label] + cts
+            else:
+                tomo_data[sub_label] = cts
+        return tomo_data
+
+
+def _fit_subsystem(fitter_data: Tuple,
+                   method: str,
+                   options: Dict) -> np.array:
+    """Fit a subsystem density matrix from its fitter data."""
+    data, basis_matrix, weights = fitter_data
+    return _fit_matrix(method, data, basis_matrix, weights, **options)
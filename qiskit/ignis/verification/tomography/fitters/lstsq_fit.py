@@ -26,7 +26,8 @@ def lstsq_fit(data: np.array,
               basis_matrix: np.array,
               weights: Optional[np.array] = None,
               psd: bool = True,
-              trace: Optional[int] = None
+              trace: Optional[int] = None,
+              pinv_matrix: Optional[np.array] = None
               ) -> np.array:
     r"""
     Reconstruct a density matrix using MLE least-squares fitting.
@@ -40,6 +41,9 @@ def lstsq_fit(data: np.array,
             semidefinite (default: True)
         trace: trace constraint for the fitted matrix
             (default: None).
+        pinv_matrix: the pseudo-inverse of the basis matrix, used for
+            unweighted fits instead of solving the least-squares problem
+            (default: None).
     Raises:
         ValueError: If the fitted vector is not a square matrix
     Returns:
@@ -68,6 +72,14 @@ def lstsq_fit(data: np.array,
         constraint the fitted matrix is rescaled using the method proposed in
         Reference [1].
 
+        Solver reuse
+        ------------
+        If the pseudo-inverse of the basis matrix is given unweighted fits
+        only compute a matrix-vector product, so the tomography fitters
+        reuse it when refitting the same configuration with new data.
+        Weighted fits depend on the weights through the weighted basis
+        matrix and are always solved with ``scipy.linalg.lstsq``.
+
         Trace constraint
         ----------------
         In general the trace of the fitted matrix will be determined by the
@@ -96,8 +108,12 @@ def lstsq_fit(data: np.array,
         meas_matrix = weights_array[:, None] * meas_matrix
         exp_values = weights_array * exp_values
 
-    # Perform least squares fit using Scipy.linalg lstsq function
-    rho_fit, _, _, _ = lstsq(meas_matrix, exp_values)
+    if weights is None and pinv_matrix is not None:
+        # Reuse the pseudo-inverse of the basis matrix of previous fits
+        rho_fit = pinv_matrix @ exp_values
+    else:
+        # Perform least squares fit using Scipy.linalg lstsq function
+        rho_fit, _, _, _ = lstsq(meas_matrix, exp_values)
 
     # Reshape fit to a density matrix
     size = len(rho_fit)
@@ -122,16 +138,25 @@ def lstsq_fit(data: np.array,
 ###########################################################################
 
 def make_positive_semidefinite(mat: np.array,
-                               epsilon: Optional[float] = 0
+                               epsilon: Optional[float] = 0,
+                               rank: Optional[int] = None
                                ) -> np.array:
     """
     Rescale a Hermitian matrix to nearest postive semidefinite matrix.
 
     Args:
-        mat: a hermitian matrix.
+        mat: a hermitian matrix, or an array of shape ``(..., dim, dim)``
+            of hermitian matrices to be rescaled independently.
         epsilon: (default: 0) the threshold for setting
             eigenvalues to zero. If epsilon > 0 positive eigenvalues
             below epsilon will also be set to zero.
+        rank: (default: None) if specified, first attempt the rescaling
+            using only the ``rank + 1`` largest eigenvalues of each matrix.
+            This is faster for large matrices that are close to a low rank
+            (eg. nearly pure) state. If the rescaled matrix would not have
+            rank at most ``rank`` a full eigendecomposition is used instead,
+            so the returned matrix is the same in either case. This is only
+            used if ``epsilon=0``.
     Raises:
         ValueError: If epsilon is negative
     Returns:
@@ -145,27 +170,82 @@ def make_positive_semidefinite(mat: np.array,
     if epsilon < 0:
         raise ValueError('epsilon must be non-negative.')
 
+    mat = np.asarray(mat)
+    batch_shape = mat.shape[:-2]
+    dim = mat.shape[-1]
+    mats = mat.reshape((-1, dim, dim))
+
+    mats_psd = np.zeros(mats.shape, dtype=complex)
+    full = np.ones(len(mats), dtype=bool)
+
+    # Partial spectral rescaling for matrices which are close to low rank
+    if rank is not None and epsilon == 0 and 0 < rank < dim - 1:
+        for j, single in enumerate(mats):
+            vals, vecs = _eigh_largest(single, rank + 1)
+            # The rescaling with epsilon = 0 is the projection of the
+            # eigenvalues onto the simplex with the same trace, so if the
+            # kept eigenvalues are known the shift is fixed by the trace
+            shift = (np.real(np.trace(single)) - np.sum(vals[1:])) / rank
+            if vals[1] + shift >= 0 and vals[0] <= -shift:
+                vals = vals[1:] + shift
+                vecs = vecs[:, 1:]
+                mats_psd[j] = (vecs * vals) @ vecs.conj().T
+                full[j] = False
+
     # Get the eigenvalues and eigenvectors of rho
     # eigenvalues are sorted in increasing order
     # v[i] <= v[i+1]
+    if np.any(full):
+        v, w = np.linalg.eigh(mats[full])
+        mats_psd[full] = (w * _wizard_rescale(v, epsilon)[:, None, :]) @ \
+            np.conj(np.swapaxes(w, -1, -2))
+
+    return mats_psd.reshape(batch_shape + (dim, dim))
+
 
-    dim = len(mat)
-    v, w = la.eigh(mat)
-    for j in range(dim):
-        if v[j] < epsilon:
-            tmp = v[j]
-            v[j] = 0.
-            # Rescale remaining eigenvalues
-            x = 0.
-            for k in range(j + 1, dim):
-                x += tmp / (dim - (j + 1))
-                v[k] = v[k] + tmp / (dim - (j + 1))
-
-    # Build positive matrix from the rescaled eigenvalues
-    # and the original eigenvectors
-
-    mat_psd = np.zeros([dim, dim], dtype=complex)
-    for j in range(dim):
-        mat_psd += v[j] * np.outer(w[:, j], np.conj(w[:, j]))
-
-    return mat_psd
+def _wizard_rescale(v: np.array, epsilon: float = 0) -> np.array:
+    """Rescale sorted eigenvalues using the wizard method.
+
+    Args:
+        v: array of shape ``(num_matrices, dim)`` of eigenvalues sorted in
+            increasing order.
+        epsilon: the threshold for setting eigenvalues to zero.
+
+    Returns:
+        The rescaled eigenvalues.
+
+    Additional Information:
+        Each eigenvalue below epsilon is set to zero and its value is
+        distributed evenly over the remaining larger eigenvalues. Since the
+        zeroed eigenvalues are always the smallest ones, if the first ``z``
+        eigenvalues are zeroed the remaining eigenvalues are all shifted by
+        ``sum(v[:z]) / (dim - z)``. The j-th eigenvalue is zeroed if all
+        smaller eigenvalues were zeroed and it is below epsilon after the
+        shift accumulated from them.
+    """
+    dim = v.shape[-1]
+    exclusive_sums = np.cumsum(v, axis=-1) - v
+    shifted = v + exclusive_sums / (dim - np.arange(dim))
+    num_zero = np.sum(np.cumprod(shifted < epsilon, axis=-1), axis=-1)
+
+    rows = np.arange(len(v))
+    totals = np.concatenate([np.zeros((len(v), 1)), np.cumsum(v, axis=-1)],
+                            axis=-1)
+    remaining = np.maximum(dim - num_zero, 1)
+    shift = totals[rows, num_zero] / remaining
+    return np.where(np.arange(dim) < num_zero[:, None], 0.,
+                    v + shift[:, None])
+
+
+def _eigh_largest(mat: np.array, num: int):
+    """Return the largest eigenvalues and eigenvectors of a Hermitian matrix.
+
+    The eigenvalues are in increasing order. Older scipy versions without
+    the ``subset_by_index`` kwarg compute the full eigendecomposition.
+    """
+    dim = mat.shape[-1]
+    try:
+        return la.eigh(mat, subset_by_index=[dim - num, dim - 1])
+    except TypeError:
+        vals, vecs = la.eigh(mat)
+        return vals[dim - num:], vecs[:, dim - num:]
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+"""
+Projected-gradient maximum-likelihood quantum tomography fitter
+"""
+
+from typing import Optional
+import numpy as np
+from scipy import linalg as la
+
+from ....utils import _project_simplex
+
+
+def mle_pg_fit(data: np.array,
+               basis_matrix: np.array,
+               weights: Optional[np.array] = None,
+               psd: bool = True,
+               trace: Optional[int] = None,
+               trace_preserving: bool = False,
+               max_iter: int = 1000,
+               tol: float = 1e-8
+               ) -> np.array:
+    r"""
+    Reconstruct a quantum state using accelerated projected gradient descent.
+
+    **Objective function**
+
+    This fitter solves the same constrained least-squares minimization as
+    the ``cvx`` fitter:
+    :math:`minimize: ||a * x - b ||_2`
+
+    subject to:
+
+    * :math:`x >> 0` (PSD, optional)
+    * :math:`\text{trace}(x) = t` (trace, optional)
+    * :math:`\text{partial_trace}(x)` = identity (trace_preserving, optional)
+
+    where:
+    * a is the matrix of measurement operators :math:`a[i] = vec(M_i).H`
+    * b is the vector of expectation value data for each projector
+      :math:`b[i] ~ \text{Tr}[M_i.H * x] = (a * x)[i]`
+    * x is the vectorized density matrix (or Choi-matrix) to be fitted
+
+    The minimization is performed using only NumPy and SciPy by the
+    accelerated (FISTA) projected gradient method of Reference [1] with
+    adaptive restarts and a backtracking step size.
+
+    **PSD and trace constraints**
+
+    The projection onto the set of PSD matrices with a fixed trace is
+    computed from an eigendecomposition of the iterate by projecting its
+    eigenvalues onto the scaled probability simplex. If ``trace=None`` the
+    negative eigenvalues are set to zero instead.
+
+    **Trace preserving (TP) constraint**
+
+    The trace_preserving keyword constrains the fitted matrix to be TP.
+    This should only be used for process tomography, not state tomography.
+    When combined with the PSD constraint the projection onto the set of
+    CPTP Choi-matrices is computed using Dykstra's alternating projection
+    algorithm as proposed in Reference [2].
+
+    References:
+        [1] A Beck, M Teboulle, SIAM J. Imaging Sci. 2, 183 (2009).
+        [2] GC Knee, E Bolduc, J Leach, EM Gauger, Phys. Rev. A 98, 062336
+            (2018). Open access: arXiv:1803.10062 [quant-ph].
+
+    Args:
+        data: (vector like) vector of expectation values
+        basis_matrix: (matrix like) measurement operators
+        weights: (vector like) weights to apply to the
+            objective function (default: None)
+        psd: (default: True) enforces the fitted matrix to be positive
+            semidefinite (default: True)
+        trace: trace constraint for the fitted matrix
+            (default: None).
+        trace_preserving: (default: False) Enforce the fitted matrix to be
+            trace preserving when fitting a Choi-matrix in quantum process
+            tomography (default: False).
+        max_iter: (default: 1000) the maximum number of gradient iterations.
+        tol: (default: 1e-8) the convergence tolerance on the relative
+            change of the fitted matrix between iterations.
+    Raises:
+        ValueError: If the fitted vector is not a square matrix
+    Returns:
+        The fitted matrix rho that minimizes
+            :math:`||basis_matrix * vec(rho) - data||_2`.
+    """
+    basis_matrix = np.asarray(basis_matrix)
+    data = np.asarray(data, dtype=float)
+
+    # Optionally apply a weights vector to the data and projectors
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        basis_matrix = weights[:, None] * basis_matrix
+        data = weights * data
+
+    size = basis_matrix.shape[1]
+    dim = int(np.sqrt(size))
+    if dim * dim != size:
+        raise ValueError("fitted vector is not a square matrix.")
+
+    # The objective ||A.x - b||^2 only depends on the basis matrix through
+    # the Gram matrix A^H.A, which is much smaller than the basis matrix
+    # for tomography data, so we precompute it once.
+    gram = basis_matrix.conj().T @ basis_matrix
+    grad_const = basis_matrix.conj().T @ data
+    data_norm = np.real(np.vdot(data, data))
+
+    def objective(vec):
+        return np.real(np.vdot(vec, gram @ vec)) \
+            - 2 * np.real(np.vdot(grad_const, vec)) + data_norm
+
+    def gradient(vec):
+        # Gradient of the objective with respect to the Hermitian matrix
+        grad = 2 * (gram @ vec - grad_const)
+        grad = grad.reshape(dim, dim, order='F')
+        return 0.5 * (grad + grad.conj().T)
+
+    def project(mat):
+        return _project_constraints(mat, psd, trace, trace_preserving)
+
+    # Initial step size from the largest eigenvalue of the Gram matrix
+    lipschitz = max(2 * _max_eigenvalue(gram), 1e-12)
+
+    # Initialize with the maximally mixed state satisfying the constraints
+    if trace_preserving:
+        rho = np.eye(dim, dtype=complex) / int(np.sqrt(dim))
+    elif trace is not None:
+        rho = trace * np.eye(dim, dtype=complex) / dim
+    else:
+        rho = np.eye(dim, dtype=complex) / dim
+    rho = project(rho)
+
+    momentum = rho
+    step = 1.
+    fval = objective(_vec(rho))
+    for _ in range(max_iter):
+        mom_vec = _vec(momentum)
+        mom_fval = objective(mom_vec)
+        grad = gradient(mom_vec)
+
+        # Backtracking line search on the quadratic upper bound
+        while True:
+            rho_next = project(momentum - grad / lipschitz)
+            delta = rho_next - momentum
+            fval_next = objective(_vec(rho_next))
+            bound = mom_fval + np.real(np.vdot(grad, delta)) \
+                + 0.5 * lipschitz * np.real(np.vdot(delta, delta))
+            if fval_next <= bound + 1e-12 * abs(bound):
+                break
+            lipschitz *= 2
+
+        # Adaptive restart of the momentum if the objective increases
+        if fval_next > fval:
+            step = 1.
+            momentum = rho
+            continue
+
+        change = la.norm(rho_next - rho)
+        step_next = 0.5 * (1 + np.sqrt(1 + 4 * step ** 2))
+        momentum = rho_next + ((step - 1) / step_next) * (rho_next - rho)
+        rho, fval, step = rho_next, fval_next, step_next
+        if change <= tol * max(1., la.norm(rho)):
+            break
+
+    return rho
+
+
+###########################################################################
+# Helper Functions
+###########################################################################
+
+def _vec(mat: np.array) -> np.array:
+    """Vectorize a matrix in column-major (Fortran) order."""
+    return mat.ravel(order='F')
+
+
+def _max_eigenvalue(mat: np.array, iters: int = 50) -> float:
+    """Estimate the largest eigenvalue of a Hermitian PSD matrix."""
+    vec = np.ones(mat.shape[0], dtype=complex) / np.sqrt(mat.shape[0])
+    val = 0.
+    for _ in range(iters):
+        vec = mat @ vec
+        val = la.norm(vec)
+        if val == 0:
+            return 0.
+        vec /= val
+    return val
+
+
+def _project_psd(mat: np.array, trace: Optional[float] = None) -> np.array:
+    """Project a Hermitian matrix onto the PSD cone with optional trace."""
+    vals, vecs = la.eigh(0.5 * (mat + mat.conj().T))
+    if trace is None:
+        vals = np.maximum(vals, 0)
+    else:
+        vals = _project_simplex(vals, trace)
+    return (vecs * vals) @ vecs.conj().T
+
+
+def _project_tp(mat: np.array) -> np.array:
+    """Project a Choi-matrix onto the affine set of TP Choi-matrices."""
+    dim = len(mat)
+    sdim = int(np.sqrt(dim))
+    ptr = np.trace(mat.reshape(sdim, sdim, sdim, sdim), axis1=1, axis2=3)
+    return mat - np.kron(ptr - np.eye(sdim), np.eye(sdim)) / sdim
+
+
+def _project_constraints(mat: np.array,
+                         psd: bool,
+                         trace: Optional[float],
+                         trace_preserving: bool,
+                         max_iter: int = 200,
+                         tol: float = 1e-12
+                         ) -> np.array:
+    """Project a matrix onto the fitter constraint set."""
+    mat = 0.5 * (mat + mat.conj().T)
+    if trace_preserving:
+        if not psd:
+            return _project_tp(mat)
+        # Dykstra's algorithm for the intersection of the PSD cone and the
+        # TP affine subspace. The TP constraint fixes the trace.
+        sdim = int(np.sqrt(len(mat)))
+        ret = mat
+        psd_inc = np.zeros_like(mat)
+        tp_inc = np.zeros_like(mat)
+        for _ in range(max_iter):
+            tmp = _project_psd(ret + psd_inc, sdim)
+            psd_inc = ret + psd_inc - tmp
+            ret_next = _project_tp(tmp + tp_inc)
+            tp_inc = tmp + tp_inc - ret_next
+            done = la.norm(ret_next - ret) <= tol * max(1., la.norm(ret))
+            ret = ret_next
+            if done:
+                break
+        return ret
+    if psd:
+        return _project_psd(mat, trace)
+    if trace is not None:
+        return mat + (trace - np.trace(mat)) * np.eye(len(mat)) / len(mat)
+    return mat
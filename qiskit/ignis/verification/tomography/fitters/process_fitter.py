@@ -17,12 +17,14 @@
 Maximum-Likelihood estimation quantum process tomography fitter
 """
 
+from typing import Dict
 import numpy as np
 from qiskit import QiskitError
 from qiskit.quantum_info.operators import Choi
 from .base_fitter import TomographyFitter
 from .cvx_fit import cvx_fit
 from .lstsq_fit import lstsq_fit
+from .mle_pg_fit import mle_pg_fit
 
 
 class ProcessTomographyFitter(TomographyFitter):
@@ -47,6 +49,8 @@ class ProcessTomographyFitter(TomographyFitter):
 
         The ``cvx`` fitter method used CVXPY convex optimization package.
         The ``lstsq`` method uses least-squares fitting (linear inversion).
+        The ``mle_pg`` method uses NumPy accelerated projected gradient
+        descent to solve the same constrained problem as ``cvx``.
         The ``auto`` method will use ``cvx`` if the CVXPY package is found on
         the system, otherwise it will default to ``lstsq``.
 
@@ -93,7 +97,8 @@ class ProcessTomographyFitter(TomographyFitter):
         Note that the TP constraint implicitly enforces the trace of the fitted
         matrix to be equal to the square-root of the matrix dimension. If a
         trace constraint is also specified that differs from this value the fit
-        will likely fail. Note that this can only be used for the CVX method.
+        will likely fail. Note that this can only be used for the ``cvx`` and
+        ``mle_pg`` methods.
 
         **CVXPY Solvers:**
 
@@ -108,7 +113,8 @@ class ProcessTomographyFitter(TomographyFitter):
             (2012). Open access: arXiv:1106.5458 [quant-ph].
 
         Args:
-            method: (default: 'auto') the fitter method 'auto', 'cvx' or 'lstsq'.
+            method: (default: 'auto') the fitter method 'auto', 'cvx',
+                'lstsq' or 'mle_pg'.
             standard_weights: (default: True) apply weights
                 to tomography data based on count probability
             beta: (default: 0.5) hedging parameter for converting counts
@@ -137,15 +143,30 @@ class ProcessTomographyFitter(TomographyFitter):
                              "to a process matrix.")
         # Choose automatic method
         if method == 'auto':
-            self._check_for_sdp_solver()
-            if self._HAS_SDP_SOLVER:
-                method = 'cvx'
-            else:
-                method = 'lstsq'
+            method = self._auto_method()
         if method == 'lstsq':
+            if weights is None:
+                kwargs.setdefault('pinv_matrix', self._basis_pinv())
             return Choi(lstsq_fit(data, basis_matrix, weights=weights,
                                   trace=dim, **kwargs))
         if method == 'cvx':
             return Choi(cvx_fit(data, basis_matrix, weights=weights, trace=dim,
                                 trace_preserving=True, **kwargs))
+        if method == 'mle_pg':
+            return Choi(mle_pg_fit(data, basis_matrix, weights=weights,
+                                   trace=dim, trace_preserving=True,
+                                   **kwargs))
         raise QiskitError('Unrecognized fit method {}'.format(method))
+
+    def _auto_method(self) -> str:
+        """Return the fitter method to use for the 'auto' method."""
+        self._check_for_sdp_solver()
+        if self._HAS_SDP_SOLVER:
+            return 'cvx'
+        return 'lstsq'
+
+    def _fit_options(self, basis_matrix: np.array) -> Dict:
+        """Return the default fitter constraints for process tomography."""
+        _, cols = np.shape(basis_matrix)
+        dim = int(np.sqrt(np.sqrt(cols)))
+        return {'psd': True, 'trace': dim, 'trace_preserving': True}
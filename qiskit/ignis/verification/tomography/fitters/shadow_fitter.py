@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Classical shadow estimation of observables from randomized Pauli measurements
+"""
+
+from typing import List, Union, Optional
+import numpy as np
+
+from qiskit import QiskitError
+from qiskit import QuantumCircuit
+from qiskit.result import Result
+from qiskit.quantum_info import Statevector, DensityMatrix
+from .base_fitter import TomographyFitter
+
+# Single-qubit Pauli matrices indexed by the measurement basis code
+_PAULI_CODES = {'X': 0, 'Y': 1, 'Z': 2}
+_PAULI_MATS = np.array([[[0, 1], [1, 0]],
+                        [[0, -1j], [1j, 0]],
+                        [[1, 0], [0, -1]]], dtype=complex)
+
+
+class ShadowTomographyFitter:
+    """Classical shadow estimator for randomized Pauli measurement data."""
+
+    def __init__(self,
+                 result: Union[Result, List[Result]],
+                 circuits: Union[List[QuantumCircuit], List[str]],
+                 seed: Optional[int] = None
+                 ):
+        r"""Initialize classical shadow fitter with experimental data.
+
+        Args:
+            result: a Qiskit Result object obtained from executing
+                shadow tomography circuits.
+            circuits: a list of circuits or circuit names to extract
+                count information from the result object, typically
+                generated by :func:`shadow_tomography_circuits`.
+            seed: (default: None) seed for the random number generator
+                used to partition the snapshots into batches for the
+                median-of-means estimators.
+
+        Raises:
+            QiskitError: If the data is not Pauli measurement data.
+
+        Additional Information:
+            Every measurement shot with measurement bases :math:`b_q` and
+            outcomes :math:`o_q` is a snapshot of the classical shadow
+
+            .. math::
+                \hat{\rho} = \bigotimes_q \left(3 U_{b_q}^\dagger
+                |o_q\rangle\langle o_q| U_{b_q} - I\right)
+                = \bigotimes_q \frac{1}{2}\left(I + 3 (-1)^{o_q}
+                \sigma_{b_q}\right)
+
+            which is an unbiased estimator of the measured state. Shots with
+            the same measurement setting and outcome give the same snapshot,
+            so estimators are evaluated once for each unique snapshot.
+
+            References:
+
+            [1] H-Y Huang, R Kueng, J Preskill, Nature Physics 16, 1050
+                (2020). Open access: arXiv:2002.08953 [quant-ph].
+        """
+        data = TomographyFitter(result, circuits).data
+        num_qubits = len(next(iter(data)))
+
+        bases = []
+        outcomes = []
+        counts = []
+        for label, cts in data.items():
+            if any(op not in _PAULI_CODES for op in label):
+                raise QiskitError("Invalid Pauli measurement label "
+                                  "{}".format(label))
+            keys = np.array([int(key.replace(' ', ''), 2) for key in cts])
+            bases.append(np.tile([_PAULI_CODES[op] for op in label],
+                                 (len(keys), 1)))
+            # Since bitstrings have qubit-0 as least significant bit
+            outcomes.append((keys[:, None] >> np.arange(num_qubits)) & 1)
+            counts.append(list(cts.values()))
+
+        self._num_qubits = num_qubits
+        self._bases = np.vstack(bases).astype(np.int8)
+        self._signs = (1 - 2 * np.vstack(outcomes)).astype(np.int8)
+        counts = np.concatenate(counts).astype(int)
+        # Random order of all shots for partitioning into batches
+        rng = np.random.default_rng(seed)
+        self._shots = rng.permutation(np.repeat(np.arange(len(counts)),
+                                                counts))
+
+    @property
+    def num_qubits(self) -> int:
+        """Return the number of measured qubits."""
+        return self._num_qubits
+
+    @property
+    def num_snapshots(self) -> int:
+        """Return the total number of snapshots."""
+        return len(self._shots)
+
+    def expectation_values(self,
+                           paulis: Union[str, List[str]],
+                           num_batches: int = 10
+                           ) -> np.array:
+        """Estimate the expectation values of Pauli observables.
+
+        Args:
+            paulis: a Pauli string, or list of Pauli strings, such as
+                ``'IXZ'``. As for :class:`qiskit.quantum_info.Pauli` the
+                rightmost character is the operator on qubit-0.
+            num_batches: (default: 10) the number of batches for the
+                median-of-means estimator.
+
+        Raises:
+            QiskitError: If a Pauli string is invalid.
+
+        Returns:
+            The estimated expectation values of the Pauli observables. The
+            snapshots are split into ``num_batches`` batches and the median
+            of the batch means is returned for each observable.
+        """
+        if isinstance(paulis, str):
+            return self.expectation_values([paulis], num_batches)[0]
+
+        codes = np.full((len(paulis), self._num_qubits), -1, dtype=np.int8)
+        for i, pauli in enumerate(paulis):
+            if len(pauli) != self._num_qubits:
+                raise QiskitError("Invalid Pauli string length for "
+                                  "{}".format(pauli))
+            for qubit, op in enumerate(reversed(pauli)):
+                if op in _PAULI_CODES:
+                    codes[i, qubit] = _PAULI_CODES[op]
+                elif op != 'I':
+                    raise QiskitError("Invalid Pauli string {}".format(pauli))
+
+        # Group observables by weight to vectorize over both the
+        # snapshots and observables of the same support size
+        values = np.ones((len(self._bases), len(paulis)))
+        weights = np.sum(codes >= 0, axis=1)
+        for weight in np.unique(weights):
+            if weight == 0:
+                continue
+            inds = np.nonzero(weights == weight)[0]
+            support = np.argsort(codes[inds] < 0, axis=1,
+                                 kind='stable')[:, :weight]
+            ops = np.take_along_axis(codes[inds], support, axis=1)
+            # Limit the size of intermediate arrays
+            chunk = max(1, 2 ** 24 // (len(self._bases) * weight))
+            for start in range(0, len(inds), chunk):
+                sub = slice(start, start + chunk)
+                match = self._bases[:, support[sub]] == ops[sub]
+                vals = np.where(match, 3 * self._signs[:, support[sub]], 0)
+                values[:, inds[sub]] = np.prod(vals, axis=-1)
+        return self._median_of_means(values, num_batches)
+
+    def fidelity(self,
+                 state: Union[Statevector, DensityMatrix, np.array],
+                 num_batches: int = 10
+                 ) -> float:
+        r"""Estimate the fidelity of the measured state with a target state.
+
+        Args:
+            state: the target state. If a density matrix is given the
+                overlap :math:`\text{Tr}[\sigma\rho]` is estimated, which is
+                equal to the state fidelity for a pure target state.
+            num_batches: (default: 10) the number of batches for the
+                median-of-means estimator.
+
+        Raises:
+            QiskitError: If the target state has the wrong dimension.
+
+        Returns:
+            The median-of-means estimate of the fidelity.
+        """
+        if isinstance(state, DensityMatrix) or (
+                not isinstance(state, Statevector) and
+                np.ndim(state) == 2):
+            # Decompose the target into a mixture of pure states
+            evals, evecs = np.linalg.eigh(np.asarray(state))
+            keep = evals > 1e-10
+            vecs = evecs[:, keep].T
+            probs = evals[keep]
+        else:
+            vecs = np.asarray(state)[None, :]
+            probs = np.ones(1)
+        dim = 2 ** self._num_qubits
+        if vecs.shape[1] != dim:
+            raise QiskitError("Target state dimension does not match the "
+                              "number of measured qubits.")
+
+        # Single-qubit snapshot operators (I + 3 s sigma_b) / 2
+        mats = 0.5 * (np.eye(2) + 3 * self._signs[:, :, None, None]
+                      * _PAULI_MATS[self._bases])
+
+        values = np.zeros(len(self._bases))
+        chunk = max(1, 2 ** 22 // dim)
+        for prob, vec in zip(probs, vecs):
+            for start in range(0, len(mats), chunk):
+                ops = mats[start:start + chunk]
+                psi = np.broadcast_to(vec, (len(ops), dim))
+                for qubit in range(self._num_qubits):
+                    # Contract the operator on each qubit tensor axis
+                    psi = psi.reshape(len(ops), -1, 2, 2 ** qubit)
+                    psi = np.einsum('cij,cajb->caib', ops[:, qubit], psi)
+                psi = psi.reshape(len(ops), dim)
+                values[start:start + chunk] += prob * np.real(
+                    psi @ vec.conj())
+        return self._median_of_means(values[:, None], num_batches)[0]
+
+    def _median_of_means(self,
+                         values: np.array,
+                         num_batches: int
+                         ) -> np.array:
+        """Return the median-of-means of snapshot values.
+
+        Args:
+            values: array of shape ``(num_unique_snapshots, num_obs)`` of
+                the estimator values for each unique snapshot.
+            num_batches: the number of batches.
+
+        Returns:
+            The median over batches of the batch means for each observable.
+        """
+        num_batches = max(1, min(num_batches, len(self._shots)))
+        batch = np.arange(len(self._shots)) * num_batches // len(self._shots)
+        # Number of shots of each unique snapshot in each batch
+        counts = np.zeros((num_batches, len(values)))
+        np.add.at(counts, (batch, self._shots), 1)
+        means = counts @ values / np.sum(counts, axis=1)[:, None]
+        return np.median(means, axis=0)
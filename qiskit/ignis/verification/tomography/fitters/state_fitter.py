@@ -15,7 +15,7 @@
 
 """Maximum-Likelihood estimation quantum state tomography fitter
 """
-from typing import List, Union
+from typing import List, Union, Dict, Optional
 import numpy as np
 from qiskit.result import Result
 from qiskit import QuantumCircuit
@@ -27,15 +27,16 @@ class StateTomographyFitter(TomographyFitter):
     """Maximum-Likelihood estimation state tomography fitter."""
 
     def __init__(self,
-                 result: Result,
-                 circuits: List[QuantumCircuit],
+                 result: Optional[Result],
+                 circuits: Optional[List[QuantumCircuit]],
                  meas_basis: Union[TomographyBasis, str] = 'Pauli'
                  ):
         """Initialize state tomography fitter with experimental data.
 
         Args:
             result: a Qiskit Result object obtained from executing
-                tomography circuits.
+                tomography circuits. If None the fitter is initialized
+                without data (see :meth:`load_data`).
             circuits: a list of circuits or circuit names to extract
                 count information from the result object.
             meas_basis: (default: 'Pauli') A function to return measurement
@@ -55,6 +56,8 @@ class StateTomographyFitter(TomographyFitter):
 
         The ``cvx`` fitter method used CVXPY convex optimization package.
         The ``lstsq`` method uses least-squares fitting (linear inversion).
+        The ``mle_pg`` method uses NumPy accelerated projected gradient
+        descent to solve the same constrained problem as ``cvx``.
         The ``auto`` method will use 'cvx' if the CVXPY package is found on
         the system, otherwise it will default to 'lstsq'.
 
@@ -106,7 +109,7 @@ class StateTomographyFitter(TomographyFitter):
             (2012). Open access: arXiv:1106.5458 [quant-ph].
 
         Args:
-            method: The fitter method 'auto', 'cvx' or 'lstsq'.
+            method: The fitter method 'auto', 'cvx', 'lstsq' or 'mle_pg'.
             standard_weights: (default: True) Apply weights to
                 tomography data based on count probability
             beta: (default: 0.5) hedging parameter for converting counts
@@ -121,3 +124,8 @@ class StateTomographyFitter(TomographyFitter):
         """
         return super().fit(method, standard_weights, beta,
                            trace=1, psd=True, **kwargs)
+
+    def _fit_options(self, basis_matrix: np.array) -> Dict:
+        """Return the default fitter constraints for state tomography."""
+        # pylint: disable=unused-argument
+        return {'psd': True, 'trace': 1}
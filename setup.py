@@ -19,8 +19,8 @@ import sys
 
 
 requirements = [
-    "numpy>=1.13",
-    "qiskit-terra>=0.13.0",
+    "numpy>=1.17",
+    "qiskit-terra>=0.15.0",
     "networkx>=2.2",
     "scipy>=0.19,!=0.19.1",
     "setuptools>=40.1.0",
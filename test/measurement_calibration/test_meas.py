@@ -30,24 +30,57 @@ expected (equally distributed) result
 """
 
 import unittest
+from unittest import mock
 import os
 import json
 from test.measurement_calibration.generate_data \
     import tensored_calib_circ_creation, meas_calib_circ_creation
 import numpy as np
+import scipy.linalg as la
 import qiskit
 from qiskit.result.result import Result
-from qiskit import Aer
+from qiskit import Aer, QiskitError
+from qiskit.providers.aer.noise import NoiseModel, ReadoutError
 from qiskit.ignis.mitigation.measurement \
      import (CompleteMeasFitter, TensoredMeasFitter,
-             complete_meas_cal, tensored_meas_cal,
-             MeasurementFilter)
+             LocalMeasFitter, complete_meas_cal, tensored_meas_cal,
+             random_meas_cal, local_meas_cal, correlated_mit_pattern,
+             MeasurementFilter, TensoredFilter)
+from qiskit.ignis.mitigation.measurement.filters import _memory_counts
 from qiskit.ignis.verification.tomography import count_keys
 
 # fixed seed for tests - for both simulator and transpiler
 SEED = 42
 
 
+def sample_cal_result(state_labels, corr_pairs, rng, flip=0.03,
+                      corr_flip=0.05, shots=1000):
+    """Sample calibration counts with correlated bit flips of pairs."""
+    # Aer only applies correlated readout errors to joint measure
+    # instructions, so sample the assignment model directly
+    nqubits = len(state_labels[0])
+    results = []
+    for label in state_labels:
+        bits = np.array([int(b) for b in reversed(label)])
+        meas = np.tile(bits, (shots, 1))
+        meas ^= rng.random(meas.shape) < flip
+        for i, j in corr_pairs:
+            flips = rng.random(shots) < corr_flip
+            meas[:, i] ^= flips
+            meas[:, j] ^= flips
+        outcomes, counts = np.unique(meas @ (1 << np.arange(nqubits)),
+                                     return_counts=True)
+        results.append({
+            'shots': shots, 'success': True,
+            'data': {'counts': {hex(o): int(c) for o, c
+                                in zip(outcomes, counts)}},
+            'header': {'name': 'cal_' + label, 'memory_slots': nqubits,
+                       'creg_sizes': [['c', nqubits]]}})
+    return Result.from_dict({
+        'backend_name': 'test', 'backend_version': '0', 'qobj_id': '0',
+        'job_id': '0', 'success': True, 'results': results})
+
+
 class TestMeasCal(unittest.TestCase):
     # TODO: after terra 0.8, derive test case like this
     # class TestMeasCal(QiskitTestCase):
@@ -487,6 +520,396 @@ class TestMeasCal(unittest.TestCase):
             output_results_least_square.get_counts(0)['111'],
             saved_info['results_least_square']['111'], places=0)
 
+    def test_tensored_filter_pseudo_inverse(self):
+        """Test the TensoredFilter pseudo inverse against the full matrix."""
+        rng = np.random.default_rng(SEED)
+        sizes = [2, 1, 3]
+        cal_matrices = []
+        substate_labels_list = []
+        full_matrix = np.ones((1, 1))
+        for size in sizes:
+            cal_mat = rng.random((2 ** size, 2 ** size)) + 4 * np.eye(2 ** size)
+            cal_mat /= np.sum(cal_mat, axis=0)
+            labels = count_keys(size)
+            perm = rng.permutation(2 ** size)
+            cal_matrices.append(cal_mat[np.ix_(perm, perm)])
+            substate_labels_list.append([labels[i] for i in perm])
+            # the first calibration block is the least significant
+            full_matrix = np.kron(cal_mat, full_matrix)
+
+        nqubits = sum(sizes)
+        counts = {format(i, '0{}b'.format(nqubits)): int(rng.integers(100))
+                  for i in rng.choice(2 ** nqubits, 20, replace=False)}
+        raw = np.zeros(2 ** nqubits)
+        for state, count in counts.items():
+            raw[int(state, 2)] = count
+        expected = np.linalg.solve(full_matrix, raw)
+
+        meas_filter = TensoredFilter(cal_matrices, substate_labels_list)
+        output = meas_filter.apply(counts, method='pseudo_inverse')
+        for state, count in output.items():
+            self.assertAlmostEqual(count, expected[int(state, 2)])
+
+    def test_tensored_filter_least_squares(self):
+        """Test the TensoredFilter least squares against the full matrix."""
+        rng = np.random.default_rng(SEED)
+        cal_matrices = []
+        full_matrix = np.ones((1, 1))
+        for size in [1, 2, 1]:
+            cal_mat = rng.random((2 ** size, 2 ** size)) + 4 * np.eye(2 ** size)
+            cal_mat /= np.sum(cal_mat, axis=0)
+            cal_matrices.append(cal_mat)
+            full_matrix = np.kron(cal_mat, full_matrix)
+        substate_labels_list = [count_keys(1), count_keys(2), count_keys(1)]
+        counts = {'0000': 500, '1111': 400, '0101': 20, '1000': 4}
+
+        tensored = TensoredFilter(cal_matrices, substate_labels_list).apply(
+            counts, method='least_squares')
+        complete = MeasurementFilter(full_matrix, count_keys(4)).apply(
+            counts, method='least_squares')
+        self.assertAlmostEqual(sum(tensored.values()), 924)
+        for state in count_keys(4):
+            self.assertGreaterEqual(tensored.get(state, 0), 0)
+            self.assertAlmostEqual(tensored.get(state, 0),
+                                   complete.get(state, 0), places=4)
+
+    def test_sparse_filter(self):
+        """Test the sparse mitigation restricted to the observed states."""
+        rng = np.random.default_rng(SEED)
+        cal_matrices = []
+        full_matrix = np.ones((1, 1))
+        for size in [2, 1, 2]:
+            cal_mat = rng.random((2 ** size, 2 ** size)) + 4 * np.eye(2 ** size)
+            cal_mat /= np.sum(cal_mat, axis=0)
+            cal_matrices.append(cal_mat)
+            full_matrix = np.kron(cal_mat, full_matrix)
+        substate_labels_list = [count_keys(2), count_keys(1), count_keys(2)]
+        tensored_filter = TensoredFilter(cal_matrices, substate_labels_list)
+        complete_filter = MeasurementFilter(full_matrix, count_keys(5))
+
+        # with all states observed this is the pseudo inverse, both with the
+        # matrix-free and the stored restricted matrix
+        counts = {state: int(rng.integers(1, 100)) for state in count_keys(5)}
+        expected = tensored_filter.apply(counts, method='pseudo_inverse')
+        expected = [expected[state] for state in counts]
+        for meas_filter in [tensored_filter, complete_filter]:
+            for distance in [None, 5]:
+                output = meas_filter.apply(counts, method='sparse',
+                                           distance=distance)
+                np.testing.assert_allclose(
+                    [output[state] for state in counts], expected,
+                    rtol=1e-8)
+
+        # only observed states are returned
+        counts = {'00000': 500, '11111': 400, '00001': 30, '10111': 25}
+        output = tensored_filter.apply(counts, method='sparse', distance=1)
+        self.assertEqual(set(output), set(counts))
+        self.assertAlmostEqual(sum(output.values()), 955, places=2)
+        self.assertGreater(output['00000'], counts['00000'])
+
+    def test_batch_apply(self):
+        """Test applying filters to many experiments in one call."""
+        rng = np.random.default_rng(SEED)
+        cal_mat = rng.random((2, 2)) + 4 * np.eye(2)
+        cal_mat /= np.sum(cal_mat, axis=0)
+        full_matrix = np.kron(cal_mat, cal_mat)
+        raw = rng.integers(100, size=(5, 4)).astype(float)
+        counts_list = [dict(zip(count_keys(2), row)) for row in raw]
+        expected = raw @ np.linalg.inv(full_matrix).T
+
+        filters = [MeasurementFilter(full_matrix, count_keys(2)),
+                   TensoredFilter([cal_mat, cal_mat], [count_keys(1)] * 2)]
+        for meas_filter in filters:
+            np.testing.assert_allclose(
+                meas_filter.apply(raw, method='pseudo_inverse'), expected)
+            output = meas_filter.apply(counts_list, method='pseudo_inverse')
+            self.assertEqual(len(output), 5)
+            for row, counts in zip(expected, output):
+                np.testing.assert_allclose(
+                    [counts[state] for state in count_keys(2)], row)
+
+            # least squares experiments are fitted independently
+            output = meas_filter.apply(raw, method='least_squares')
+            for row, new_row in zip(raw, output):
+                counts = meas_filter.apply(dict(zip(count_keys(2), row)),
+                                           method='least_squares')
+                np.testing.assert_allclose(
+                    [counts.get(state, 0) for state in count_keys(2)],
+                    new_row)
+
+        # a list of counts of one experiment is returned as an array
+        output = filters[0].apply(raw[0].tolist(), method='least_squares')
+        self.assertIsInstance(output, np.ndarray)
+        np.testing.assert_allclose(
+            output, filters[0].apply(raw[:1], method='least_squares')[0])
+
+    def test_apply_result_copy(self):
+        """Test that filtering a Result does not modify it."""
+        with open(os.path.join(
+                os.path.dirname(__file__), 'test_tensored_meas_results.json'), "r") as saved_file:
+            saved_info = json.load(saved_file)
+        cal_results = Result.from_dict(saved_info['cal_results'])
+        results = Result.from_dict(saved_info['results'])
+        raw_counts = results.get_counts(0)
+
+        meas_cal = TensoredMeasFitter(cal_results,
+                                      mit_pattern=saved_info['mit_pattern'])
+        new_results = meas_cal.filter.apply(results, method='pseudo_inverse')
+        self.assertEqual(results.get_counts(0), raw_counts)
+        self.assertNotEqual(new_results.get_counts(0), raw_counts)
+        self.assertIs(new_results.results[0].header,
+                      results.results[0].header)
+
+    def test_subset_fitter(self):
+        """Test the subset fitter partial trace of the cal matrix."""
+        rng = np.random.default_rng(SEED)
+        cal_mats = []
+        for _ in range(3):
+            cal_mat = rng.random((2, 2)) + 4 * np.eye(2)
+            cal_mats.append(cal_mat / np.sum(cal_mat, axis=0))
+
+        # the first character of the state labels is qubit_list[0]
+        meas_cal = CompleteMeasFitter(None, count_keys(3),
+                                      qubit_list=[4, 2, 7])
+        meas_cal.cal_matrix = np.kron(np.kron(cal_mats[0], cal_mats[1]),
+                                      cal_mats[2])
+        sub_fitter = meas_cal.subset_fitter([7, 4])
+        self.assertEqual(sub_fitter.qubit_list, [7, 4])
+        self.assertEqual(sub_fitter.state_labels, count_keys(2))
+        np.testing.assert_allclose(sub_fitter.cal_matrix,
+                                   np.kron(cal_mats[2], cal_mats[0]))
+
+    def test_decayed_calibration(self):
+        """Test adding calibration data with decayed weights."""
+        meas_calibs, _ = tensored_meas_cal(mit_pattern=[[0], [1]])
+        backend = Aer.get_backend('qasm_simulator')
+        ideal_result = qiskit.execute(meas_calibs, backend, shots=1000,
+                                      seed_simulator=SEED).result()
+        noise_model = NoiseModel()
+        noise_model.add_all_qubit_readout_error(
+            ReadoutError([[0.8, 0.2], [0.1, 0.9]]))
+        noisy_result = qiskit.execute(meas_calibs, backend, shots=1000,
+                                      noise_model=noise_model,
+                                      seed_simulator=SEED).result()
+
+        noisy_fitter = TensoredMeasFitter(noisy_result, [[0], [1]])
+        meas_fitter = TensoredMeasFitter(ideal_result, [[0], [1]],
+                                         decay=0.5)
+        meas_fitter.add_data(noisy_result)
+        for cal_mat, noisy_mat in zip(meas_fitter.cal_matrices,
+                                      noisy_fitter.cal_matrices):
+            # the ideal counts have half the weight of the noisy counts
+            np.testing.assert_allclose(cal_mat,
+                                       (0.5 * np.eye(2) + noisy_mat) / 1.5)
+
+        # without decay the counts of all results have the same weight
+        meas_fitter = TensoredMeasFitter(None, [[0], [1]])
+        meas_fitter.add_data([ideal_result, noisy_result])
+        for cal_mat, noisy_mat in zip(meas_fitter.cal_matrices,
+                                      noisy_fitter.cal_matrices):
+            np.testing.assert_allclose(cal_mat, (np.eye(2) + noisy_mat) / 2)
+
+    def test_correlated_mit_pattern(self):
+        """Test detecting correlated readout errors from random states."""
+        rng = np.random.default_rng(SEED)
+        _, state_labels = random_meas_cal(qubit_list=[10, 11, 12, 13, 14],
+                                          num_circuits=32, seed=SEED)
+
+        self.assertEqual(correlated_mit_pattern(
+            sample_cal_result(state_labels, [], rng)),
+                         [[0], [1], [2], [3], [4]])
+        self.assertEqual(
+            correlated_mit_pattern(
+                sample_cal_result(state_labels, [(0, 2), (2, 4)], rng),
+                qubit_list=[10, 11, 12, 13, 14]),
+            [[10, 12, 14], [11], [13]])
+
+    def test_local_meas_fitter(self):
+        """Test the k-local calibration of correlated readout errors."""
+        rng = np.random.default_rng(SEED)
+        meas_calibs, state_labels = local_meas_cal(qubit_list=range(10), k=2,
+                                                   seed=SEED)
+        self.assertLess(len(meas_calibs), 20)
+        self.assertEqual(len(set(state_labels)), len(state_labels))
+        result = sample_cal_result(state_labels, [(0, 3), (5, 6)], rng,
+                                   shots=4000)
+        meas_fitter = LocalMeasFitter(result, qubit_list=range(10))
+        self.assertEqual(meas_fitter.mit_pattern,
+                         [[0, 3], [1], [2], [4], [5, 6], [7], [8], [9]])
+
+        # ideal calibration matrices of the sampled model
+        flip = np.array([[0.97, 0.03], [0.03, 0.97]])
+        corr = 0.95 * np.eye(4) + 0.05 * np.fliplr(np.eye(4))
+        for cal_mat, group in zip(meas_fitter.cal_matrices,
+                                  meas_fitter.mit_pattern):
+            ideal = flip if len(group) == 1 else \
+                corr @ np.kron(flip, flip)
+            np.testing.assert_allclose(cal_mat, ideal, atol=0.02)
+
+        # the filter of the fitter corrects ideal counts
+        ideal_counts = {'0' * 10: 500, '1' * 10: 500}
+        noisy_counts = sample_cal_result(
+            ['0' * 10] * 2 + ['1' * 10] * 2, [(0, 3), (5, 6)], rng,
+            shots=2000).get_counts()
+        raw_counts = {}
+        for counts in noisy_counts:
+            for key, val in counts.items():
+                raw_counts[key] = raw_counts.get(key, 0) + val / 8
+        for method in ['least_squares', 'sparse']:
+            mitigated = meas_fitter.filter.apply(raw_counts, method=method)
+            for key, val in ideal_counts.items():
+                self.assertAlmostEqual(mitigated[key], val, delta=30)
+
+        # the counts are in the qubit_list order of the calibration circuits
+        # also with qubits that are not corrected
+        meas_fitter = LocalMeasFitter(result, [[5, 6], [0, 3]],
+                                      qubit_list=range(10))
+        mitigated = meas_fitter.filter.apply(
+            {'0010101101': 1000}, method='pseudo_inverse')
+        # qubits 5, 6 are in state 1 and qubits 0, 3 in state 3 of their
+        # calibration matrices
+        pinvs = [np.linalg.inv(cal_mat) for cal_mat in meas_fitter.cal_matrices]
+        self.assertAlmostEqual(mitigated['0010101101'],
+                               1000 * pinvs[0][1, 1] * pinvs[1][3, 3])
+        for key in mitigated:
+            self.assertEqual([key[9 - q] for q in [1, 2, 4, 7, 8, 9]],
+                             ['0', '1', '0', '1', '0', '0'])
+
+        with self.assertRaises(QiskitError):
+            LocalMeasFitter(result, [[0, 1, 2]], qubit_list=range(10))
+
+    def test_apply_memory(self):
+        """Test mitigating single-shot memory in chunks."""
+        noise_model = NoiseModel()
+        noise_model.add_all_qubit_readout_error(
+            ReadoutError([[0.9, 0.1], [0.2, 0.8]]))
+        backend = Aer.get_backend('qasm_simulator')
+        meas_calibs, mit_pattern = tensored_meas_cal(
+            mit_pattern=[[0], [1, 2]])
+        cal_results = qiskit.execute(meas_calibs, backend, shots=2000,
+                                     noise_model=noise_model,
+                                     seed_simulator=SEED).result()
+        meas_filter = TensoredMeasFitter(cal_results, mit_pattern).filter
+
+        qc = qiskit.QuantumCircuit(3, 3)
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.measure([0, 1, 2], [0, 1, 2])
+        result = qiskit.execute(qc, backend, shots=5000, memory=True,
+                                noise_model=noise_model,
+                                seed_simulator=SEED).result()
+        memory = result.get_memory(0)
+        bits = np.array([[int(bit) for bit in reversed(shot)]
+                         for shot in memory])
+        chunks = [memory[start:start + 700] for start in range(0, 5000, 700)]
+        for method in ['pseudo_inverse', 'least_squares', 'sparse']:
+            expected = meas_filter.apply(result.get_counts(0), method=method)
+            for mem in [memory, bits, chunks, [bits[:2000], bits[2000:]]]:
+                mitigated = meas_filter.apply_memory(mem, method=method,
+                                                     chunk_size=1000)
+                self.assertEqual(set(mitigated), set(expected))
+                for state, count in expected.items():
+                    self.assertAlmostEqual(mitigated[state], count)
+
+    def test_apply_memory_many_qubits(self):
+        """Test mitigating memory of more qubits than fit in an integer."""
+        rng = np.random.default_rng(SEED)
+        cal_mat = np.array([[0.9, 0.2], [0.1, 0.8]])
+        num_qubits = 70
+        # shots with the low bits random and the high bits fixed
+        high = ''.join(rng.choice(['0', '1'], size=num_qubits - 3))
+        memory = [high + format(val, '03b')
+                  for val in rng.integers(8, size=3000)]
+        counts = {}
+        for shot in memory:
+            counts[shot] = counts.get(shot, 0) + 1
+
+        self.assertEqual(_memory_counts(memory, num_qubits, 1000), counts)
+        bits = np.array([[int(bit) for bit in reversed(shot)]
+                         for shot in memory])
+        self.assertEqual(_memory_counts(bits, num_qubits, 1000), counts)
+        hexes = [hex(int(shot, 2)) for shot in memory]
+        self.assertEqual(_memory_counts(hexes, num_qubits, 1000), counts)
+
+        # the fixed bits only scale the renormalized columns, so this is the
+        # mitigation of the low bits
+        meas_filter = TensoredFilter([cal_mat] * num_qubits,
+                                     [count_keys(1)] * num_qubits)
+        low_filter = TensoredFilter([cal_mat] * 3, [count_keys(1)] * 3)
+        low_counts = {key[-3:]: val for key, val in counts.items()}
+        for distance in [None, 1]:
+            mitigated = meas_filter.apply_memory(
+                memory, method='sparse', distance=distance, chunk_size=1000)
+            expected = low_filter.apply(low_counts, method='sparse',
+                                        distance=distance)
+            self.assertEqual(set(mitigated), set(counts))
+            for key, val in mitigated.items():
+                self.assertAlmostEqual(val, expected[key[-3:]])
+
+    def test_cached_pseudo_inverse(self):
+        """Test the filters reuse the pseudo inverse of the cal matrices."""
+        cal_mat = np.array([[0.9, 0.2], [0.1, 0.8]])
+        raw_counts = {'0': 600, '1': 400}
+        filters = [MeasurementFilter(cal_mat, ['0', '1']),
+                   TensoredFilter([cal_mat], [['0', '1']])]
+        for meas_filter in filters:
+            with mock.patch('scipy.linalg.pinv', wraps=la.pinv) as pinv:
+                first = meas_filter.apply(raw_counts, 'pseudo_inverse')
+                second = meas_filter.apply(raw_counts, 'pseudo_inverse')
+                self.assertEqual(pinv.call_count, 1)
+                self.assertEqual(first, second)
+
+                # setting the cal matrices invalidates the cached inverse
+                if isinstance(meas_filter, MeasurementFilter):
+                    meas_filter.cal_matrix = np.eye(2)
+                else:
+                    meas_filter.cal_matrices = [np.eye(2)]
+                third = meas_filter.apply(raw_counts, 'pseudo_inverse')
+                self.assertEqual(pinv.call_count, 2)
+                self.assertAlmostEqual(third['0'], 600)
+
+    def test_cached_fitter_filter(self):
+        """Test the filters of a fitter share the pseudo inverse."""
+        rng = np.random.default_rng(SEED)
+        state_labels = count_keys(2)
+        result = sample_cal_result(state_labels, [], rng)
+        raw_counts = {'00': 500, '11': 300, '01': 200}
+        fitters = [CompleteMeasFitter(result, state_labels),
+                   TensoredMeasFitter(result, [[0], [1]]),
+                   LocalMeasFitter(result, [[0], [1]])]
+        for fitter in fitters:
+            with mock.patch('scipy.linalg.pinv', wraps=la.pinv) as pinv:
+                first = fitter.filter.apply(raw_counts, 'pseudo_inverse')
+                calls = pinv.call_count
+                second = fitter.filter.apply(raw_counts, 'pseudo_inverse')
+                self.assertEqual(pinv.call_count, calls)
+                self.assertEqual(first, second)
+
+                # rebuilding the cal matrices computes a new pseudo inverse
+                fitter.add_data(result)
+                fitter.filter.apply(raw_counts, 'pseudo_inverse')
+                self.assertEqual(pinv.call_count, 2 * calls)
+
+            # setting the cal matrices of a filter does not change the
+            # filters of the fitter
+            meas_filter = fitter.filter
+            if isinstance(meas_filter, MeasurementFilter):
+                meas_filter.cal_matrix = np.eye(4)
+            else:
+                meas_filter.cal_matrices = [np.eye(2), np.eye(2)]
+            self.assertEqual(meas_filter.apply(raw_counts, 'pseudo_inverse'),
+                             raw_counts)
+            self.assertNotEqual(
+                fitter.filter.apply(raw_counts, 'pseudo_inverse'),
+                raw_counts)
+
+        fitters[0].cal_matrix = np.eye(4)
+        self.assertEqual(fitters[0].filter.apply(raw_counts, 'pseudo_inverse'),
+                         raw_counts)
+        fitters[1].cal_matrices = [np.eye(2), np.eye(2)]
+        self.assertEqual(fitters[1].filter.apply(raw_counts, 'pseudo_inverse'),
+                         raw_counts)
+
 
 if __name__ == '__main__':
     unittest.main()
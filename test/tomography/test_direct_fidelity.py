@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-docstring
+# pylint: disable=invalid-name
+
+import unittest
+
+import numpy
+import qiskit
+from qiskit import QuantumRegister, QuantumCircuit, Aer, QiskitError
+from qiskit.quantum_info import (Statevector, Operator, Pauli,
+                                 random_density_matrix, state_fidelity,
+                                 process_fidelity)
+import qiskit.ignis.verification.tomography as tomo
+from qiskit.ignis.verification.tomography.basis.circuits import \
+    _pauli_expectation_vector, _pauli_string
+
+
+class TestDirectFidelityEstimation(unittest.TestCase):
+    def setUp(self):
+        q = QuantumRegister(4)
+        circ = QuantumCircuit(q)
+        circ.h(q[0])
+        for j in range(3):
+            circ.cx(q[j], q[j + 1])
+        circ.ry(0.5, q[1])
+        self.qubits = q
+        self.circuit = circ
+        self.psi = Statevector.from_instruction(circ)
+
+    def test_pauli_expectations(self):
+        rho = random_density_matrix(8, seed=42).data
+        expvals = _pauli_expectation_vector(rho)
+        for j in [0, 5, 27, 63]:
+            pauli = Pauli(_pauli_string(j, 3)).to_matrix()
+            self.assertAlmostEqual(expvals[j],
+                                   numpy.real(numpy.trace(rho @ pauli)))
+
+    def test_state_fidelity(self):
+        circs, settings = tomo.direct_fidelity_circuits(
+            self.circuit, self.qubits, self.psi, num_settings=100, seed=42)
+        self.assertLess(len(circs), 3 ** 4)
+        self.assertEqual(sum(num for num, _ in settings.values()), 100)
+        job = qiskit.execute(circs, Aer.get_backend('qasm_simulator'),
+                             shots=2000, seed_simulator=42)
+        fitter = tomo.DirectFidelityFitter(job.result(), circs, settings)
+        self.assertEqual(fitter.num_settings, 100)
+        self.assertAlmostEqual(fitter.fidelity(), 1, places=1)
+
+    def test_wrong_target(self):
+        target = QuantumCircuit(4)
+        target.compose(self.circuit, inplace=True)
+        target.rx(0.8, 2)
+        target = Statevector.from_instruction(target)
+        circs, settings = tomo.direct_fidelity_circuits(
+            self.circuit, self.qubits, target, num_settings=400, seed=42)
+        job = qiskit.execute(circs, Aer.get_backend('qasm_simulator'),
+                             shots=4000, seed_simulator=42)
+        fitter = tomo.DirectFidelityFitter(job.result(), circs, settings)
+        self.assertAlmostEqual(fitter.fidelity(),
+                               state_fidelity(self.psi, target), places=1)
+
+    def test_process_fidelity(self):
+        q = QuantumRegister(2)
+        circ = QuantumCircuit(q)
+        circ.h(q[0])
+        circ.cx(q[0], q[1])
+        circ.rz(0.6, q[1])
+        target = QuantumCircuit(2)
+        target.h(0)
+        target.cx(0, 1)
+        circs, settings = tomo.direct_fidelity_circuits(
+            circ, q, Operator(target), num_settings=200, seed=42,
+            process=True)
+        job = qiskit.execute(circs, Aer.get_backend('qasm_simulator'),
+                             shots=4000, seed_simulator=42)
+        fitter = tomo.DirectFidelityFitter(job.result(), circs, settings)
+        self.assertAlmostEqual(
+            fitter.fidelity(),
+            process_fidelity(Operator(circ), Operator(target)), places=1)
+
+    def test_target_dimension(self):
+        with self.assertRaises(QiskitError):
+            tomo.direct_fidelity_circuits(self.circuit, self.qubits,
+                                          Statevector.from_label('00'))
+
+
+if __name__ == '__main__':
+    unittest.main()
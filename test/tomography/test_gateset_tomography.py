@@ -14,17 +14,23 @@
 
 # pylint: disable=missing-docstring,invalid-name
 import unittest
+from ast import literal_eval
 import numpy as np
-from qiskit import Aer
+from qiskit import Aer, QuantumCircuit
 from qiskit.compiler import assemble
 from qiskit.ignis.verification.tomography import GatesetTomographyFitter
 from qiskit.ignis.verification.tomography import gateset_tomography_circuits
+from qiskit.ignis.verification.tomography import \
+    long_gst_circuits
 from qiskit.ignis.verification.tomography.basis import default_gateset_basis
+from qiskit.ignis.verification.tomography.fitters.gateset_fitter import \
+    GST_Optimize, GaugeOptimize
+from qiskit.result import Result
 
 from qiskit.providers.aer.noise import NoiseModel
 
-from qiskit.extensions import HGate, SGate
-from qiskit.quantum_info import PTM
+from qiskit.extensions import HGate, SGate, CXGate
+from qiskit.quantum_info import PTM, Statevector, Operator
 
 
 class TestGatesetTomography(unittest.TestCase):
@@ -146,5 +152,161 @@ class TestGatesetTomography(unittest.TestCase):
                                          noise_ptm=np.real(noise_ptm.data))
 
 
+class TestGSTOptimize(unittest.TestCase):
+    def setUp(self):
+        basis = default_gateset_basis()
+        rng = np.random.default_rng(42)
+        probs = {}
+        for Fi in basis.spam_labels:
+            for Fj in basis.spam_labels:
+                for G in basis.gate_labels:
+                    probs[(Fj, G, Fi)] = rng.random()
+        self.optimizer = GST_Optimize(basis.gate_labels, basis.spam_labels,
+                                      basis.spam_spec, probs)
+        self.x = rng.normal(size=2 * 4 + 2 * 4 +
+                            len(basis.gate_labels) * 2 * 16)
+
+    @staticmethod
+    def finite_difference(fun, x, eps=1e-6):
+        return np.array([(np.array(fun(x + eps * e)) -
+                          np.array(fun(x - eps * e))) / (2 * eps)
+                         for e in np.eye(len(x))]).T
+
+    def test_obj_fn_grad(self):
+        grad = self.optimizer._obj_fn_grad(self.x)
+        expected = self.finite_difference(self.optimizer._obj_fn, self.x)
+        np.testing.assert_allclose(grad, expected,
+                                   atol=1e-6 * np.max(np.abs(expected)))
+
+    def test_constraint_jacobians(self):
+        for cons in self.optimizer._constraints():
+            jac = cons['jac'](self.x)
+            expected = self.finite_difference(cons['fun'], self.x)
+            np.testing.assert_allclose(jac, expected, atol=1e-6)
+
+    def test_penalty_fn_grad(self):
+        _, grad = self.optimizer._penalty_fn(self.x, 10)
+        expected = self.finite_difference(
+            lambda x: self.optimizer._penalty_fn(x, 10)[0], self.x)
+        np.testing.assert_allclose(grad, expected,
+                                   atol=1e-6 * np.max(np.abs(expected)))
+
+
+class TestTwoQubitGatesetTomography(unittest.TestCase):
+    def setUp(self):
+        self.basis = default_gateset_basis(2)
+        self.basis.add_gate(CXGate())
+        self.circuits = gateset_tomography_circuits([0, 1], self.basis)
+
+    @staticmethod
+    def exact_result(circuits, shots=10000):
+        # Ideal counts from the statevector probabilities of each circuit
+        results = []
+        for circuit in circuits:
+            probs = Statevector.from_instruction(
+                circuit.remove_final_measurements(inplace=False)
+            ).probabilities()
+            counts = {hex(i): int(round(shots * p))
+                      for i, p in enumerate(probs) if p > 1e-12}
+            results.append({'shots': shots, 'success': True,
+                            'data': {'counts': counts},
+                            'header': {'name': circuit.name,
+                                       'memory_slots': 2}})
+        return Result.from_dict({'backend_name': 'exact',
+                                 'backend_version': '0', 'qobj_id': '',
+                                 'job_id': '', 'success': True,
+                                 'results': results})
+
+    def test_circuits(self):
+        num_spam = len(self.basis.spam_labels)
+        num_gates = len(self.basis.gate_labels)
+        self.assertEqual(num_spam, 16)
+        self.assertEqual(len(self.circuits),
+                         num_spam ** 2 * (num_gates + 1) + num_spam)
+        for circuit in self.circuits:
+            self.assertEqual(circuit.num_qubits, 2)
+            self.assertEqual(circuit.count_ops()['measure'], 2)
+
+    def test_linear_inversion_gauge(self):
+        result = self.exact_result(self.circuits)
+        fitter = GatesetTomographyFitter(result, self.circuits, self.basis)
+        ideal = fitter._ideal_gateset(16)
+        gauge = GaugeOptimize(ideal, fitter.linear_inversion(), self.basis)
+        gateset = gauge.optimize()
+        for label in self.basis.gate_labels:
+            np.testing.assert_allclose(gateset[label].data,
+                                       ideal[label].data, atol=1e-3)
+        np.testing.assert_allclose(gateset['rho'], ideal['rho'], atol=1e-3)
+        np.testing.assert_allclose(gateset['E'], ideal['E'], atol=1e-3)
+
+    def test_default_basis(self):
+        circuits = gateset_tomography_circuits([0, 1])
+        result = self.exact_result(circuits)
+        fitter = GatesetTomographyFitter(result, circuits)
+        self.assertEqual(fitter.gateset_basis.num_qubits, 2)
+        ideal = fitter._ideal_gateset(16)
+        gauge = GaugeOptimize(ideal, fitter.linear_inversion(),
+                              fitter.gateset_basis)
+        gateset = gauge.optimize()
+        for label in fitter.gateset_basis.gate_labels:
+            np.testing.assert_allclose(gateset[label].data,
+                                       ideal[label].data, atol=1e-3)
+
+    def test_gauge_obj_fn_grad(self):
+        basis = default_gateset_basis()
+        gates = {label: PTM(mat)
+                 for label, mat in basis.gate_matrices.items()}
+        gates['rho'] = np.array([[np.sqrt(0.5)], [0], [0], [np.sqrt(0.5)]])
+        gates['E'] = np.array([[np.sqrt(0.5), 0, 0, np.sqrt(0.5)]])
+        gauge = GaugeOptimize(gates, gates, basis)
+        x = np.eye(4).ravel() + np.random.default_rng(7).normal(
+            scale=0.1, size=16)
+        grad = gauge._obj_fn_grad(x)
+        expected = TestGSTOptimize.finite_difference(gauge._obj_fn, x)
+        np.testing.assert_allclose(grad, expected, atol=1e-6)
+
+
+class TestLongGatesetTomographyCircuits(unittest.TestCase):
+    def test_sequences(self):
+        basis = default_gateset_basis()
+        circuits = long_gst_circuits(
+            gateset_basis=basis, max_lengths=[0, 1, 2, 4])
+        names = [circuit.name for circuit in circuits]
+        self.assertEqual(len(names), len(set(names)))
+        # The long sequences include the short GST gate strings
+        spam = basis.spam_spec
+        for Fj in basis.spam_labels:
+            for Fi in basis.spam_labels:
+                for gate in basis.gate_labels:
+                    self.assertIn(str(spam[Fj] + (gate,) + spam[Fi]), names)
+        self.assertIn(str(('X_Rot_90',) * 4 + ('Y_Rot_90',)), names)
+
+    def test_germs(self):
+        basis = default_gateset_basis()
+        germs = [('X_Rot_90', 'Y_Rot_90')]
+        circuits = long_gst_circuits(
+            gateset_basis=basis, germs=germs, max_lengths=[2, 3])
+        # L=2 and L=3 give the same germ power, which is only measured once
+        expected = long_gst_circuits(
+            gateset_basis=basis, germs=germs, max_lengths=[2])
+        self.assertEqual([circuit.name for circuit in circuits],
+                         [circuit.name for circuit in expected])
+        self.assertTrue(all(
+            literal_eval(circuit.name).count('X_Rot_90') >= 1
+            for circuit in circuits))
+
+    def test_circuit_operators(self):
+        basis = default_gateset_basis()
+        circuits = long_gst_circuits(
+            gateset_basis=basis, max_lengths=[1, 2, 4, 8])
+        for circuit in circuits[::37]:
+            expected = QuantumCircuit(1)
+            for gate in literal_eval(circuit.name):
+                basis.add_gate_to_circuit(expected, expected.qubits[0], gate)
+            actual = circuit.remove_final_measurements(inplace=False)
+            self.assertTrue(Operator(actual).equiv(Operator(expected)))
+            self.assertEqual(circuit.count_ops()['measure'], 1)
+
+
 if __name__ == '__main__':
     unittest.main()
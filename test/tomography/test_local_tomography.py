@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-docstring
+# pylint: disable=invalid-name
+
+import itertools as it
+import unittest
+
+import numpy
+import qiskit
+from qiskit import QuantumRegister, QuantumCircuit, Aer, QiskitError
+from qiskit.quantum_info import state_fidelity, partial_trace, Statevector
+import qiskit.ignis.verification.tomography as tomo
+from qiskit.ignis.utils import _covering_array
+
+
+class TestCoveringArray(unittest.TestCase):
+    def test_covering(self):
+        for n, k in [(3, 2), (6, 2), (5, 3)]:
+            array = _covering_array(n, k, 3, seed=42)
+            self.assertLess(len(array), 3 ** n)
+            for sub in it.combinations(range(n), k):
+                combos = set(map(tuple, array[:, sub]))
+                self.assertEqual(len(combos), 3 ** k)
+
+    def test_seed(self):
+        numpy.testing.assert_array_equal(_covering_array(6, 2, 3, seed=1),
+                                         _covering_array(6, 2, 3, seed=1))
+
+
+class TestLocalTomography(unittest.TestCase):
+    def setUp(self):
+        q = QuantumRegister(5)
+        circ = QuantumCircuit(q)
+        circ.h(q[0])
+        for j in range(4):
+            circ.cx(q[j], q[j + 1])
+        circ.ry(0.4, q[2])
+        circ.rx(0.7, q[4])
+        self.qubits = q
+        self.circuit = circ
+        self.psi = Statevector.from_instruction(circ)
+
+    def test_num_circuits(self):
+        circs = tomo.local_tomography_circuits(self.circuit, self.qubits,
+                                               seed=42)
+        self.assertLess(len(circs), 3 ** 5)
+
+    def test_local_fit(self):
+        circs = tomo.local_tomography_circuits(self.circuit, self.qubits,
+                                               k=2, seed=42)
+        job = qiskit.execute(circs, Aer.get_backend('qasm_simulator'),
+                             shots=4000, seed_simulator=42)
+        fitter = tomo.LocalTomographyFitter(job.result(), circs, k=2)
+        rhos = fitter.fit()
+        self.assertEqual(set(rhos), set(it.combinations(range(5), 2)))
+        for sub, rho in rhos.items():
+            traced = [j for j in range(5) if j not in sub]
+            target = partial_trace(self.psi, traced)
+            self.assertAlmostEqual(numpy.trace(rho), 1)
+            self.assertAlmostEqual(
+                state_fidelity(target, rho, validate=False), 1, places=1)
+
+    def test_subsystems(self):
+        circs = tomo.local_tomography_circuits(self.circuit, self.qubits,
+                                               k=3, seed=42)
+        job = qiskit.execute(circs, Aer.get_backend('qasm_simulator'),
+                             shots=2000, seed_simulator=42)
+        fitter = tomo.LocalTomographyFitter(job.result(), circs, k=3)
+        rhos = fitter.fit(subsystems=[(0, 1), (4, 2, 3)])
+        self.assertEqual(set(rhos), {(0, 1), (2, 3, 4)})
+        target = partial_trace(self.psi, [0, 1])
+        self.assertAlmostEqual(
+            state_fidelity(target, rhos[(2, 3, 4)], validate=False), 1,
+            places=1)
+        with self.assertRaises(QiskitError):
+            fitter.bootstrap(num_samples=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+#
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-docstring,invalid-name
+
+import unittest
+from unittest import mock
+
+import numpy as np
+from scipy import linalg as la
+import qiskit
+from qiskit import QuantumCircuit, Aer
+import qiskit.ignis.verification.tomography as tomo
+from qiskit.ignis.verification.tomography.fitters import base_fitter
+from qiskit.ignis.verification.tomography.fitters.lstsq_fit import \
+    make_positive_semidefinite, lstsq_fit
+
+
+def wizard_reference(mat, epsilon=0):
+    """Eigenvalue-by-eigenvalue implementation of the wizard method."""
+    dim = len(mat)
+    v, w = la.eigh(mat)
+    for j in range(dim):
+        if v[j] < epsilon:
+            tmp = v[j]
+            v[j] = 0.
+            for k in range(j + 1, dim):
+                v[k] = v[k] + tmp / (dim - (j + 1))
+    return sum(v[j] * np.outer(w[:, j], np.conj(w[:, j]))
+               for j in range(dim))
+
+
+def random_hermitian(rng, dim, pure=False):
+    mat = rng.normal(size=(dim, dim)) + 1j * rng.normal(size=(dim, dim))
+    mat = 0.5 * (mat + mat.conj().T)
+    if pure:
+        psi = rng.normal(size=dim) + 1j * rng.normal(size=dim)
+        psi /= la.norm(psi)
+        mat = np.outer(psi, psi.conj()) + 0.01 * mat
+    return mat
+
+
+class TestMakePositiveSemidefinite(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.rng = np.random.default_rng(42)
+
+    def test_single_matrix(self):
+        for dim in [2, 4, 8]:
+            for epsilon in [0, 0.01, 0.5]:
+                mat = random_hermitian(self.rng, dim)
+                np.testing.assert_allclose(
+                    make_positive_semidefinite(mat, epsilon),
+                    wizard_reference(mat, epsilon), atol=1e-12)
+
+    def test_batched_matrices(self):
+        mats = np.array([random_hermitian(self.rng, 4) for _ in range(6)])
+        mats = mats.reshape((2, 3, 4, 4))
+        ret = make_positive_semidefinite(mats)
+        self.assertEqual(ret.shape, (2, 3, 4, 4))
+        for i in range(2):
+            for j in range(3):
+                np.testing.assert_allclose(
+                    ret[i, j], wizard_reference(mats[i, j]), atol=1e-12)
+
+    def test_partial_spectrum(self):
+        for pure in [True, False]:
+            mat = random_hermitian(self.rng, 8, pure=pure)
+            for rank in [1, 2, 4]:
+                np.testing.assert_allclose(
+                    make_positive_semidefinite(mat, rank=rank),
+                    wizard_reference(mat), atol=1e-12)
+
+    def test_negative_epsilon(self):
+        with self.assertRaises(ValueError):
+            make_positive_semidefinite(np.eye(2), epsilon=-1)
+
+
+class TestLstsqFit(unittest.TestCase):
+    def test_pinv_unweighted_fit(self):
+        rng = np.random.default_rng(7)
+        basis_matrix = rng.normal(size=(24, 4)) + \
+            1j * rng.normal(size=(24, 4))
+        pinv = la.pinv(basis_matrix)
+        for _ in range(3):
+            data = rng.random(24)
+            expected = la.lstsq(basis_matrix, data)[0].reshape(
+                2, 2, order='F')
+            np.testing.assert_allclose(
+                lstsq_fit(data, basis_matrix, psd=False), expected,
+                atol=1e-12)
+            np.testing.assert_allclose(
+                lstsq_fit(data, basis_matrix, psd=False, pinv_matrix=pinv),
+                expected, atol=1e-12)
+
+    def test_fitter_pinv_cache(self):
+        base_fitter._BASIS_CACHE.clear()
+        circ = QuantumCircuit(2)
+        circ.h(0)
+        circ.cx(0, 1)
+        circs = tomo.state_tomography_circuits(circ, [0, 1])
+        backend = Aer.get_backend('qasm_simulator')
+        fitter = tomo.StateTomographyFitter(
+            qiskit.execute(circs, backend, shots=100,
+                           seed_simulator=42).result(), circs)
+        with mock.patch('scipy.linalg.pinv', wraps=la.pinv) as pinv:
+            rho = fitter.fit(method='lstsq', standard_weights=False)
+            fitter.fit(method='lstsq', standard_weights=False)
+            self.assertEqual(pinv.call_count, 1)
+            # new counts of the same configuration reuse the pseudo-inverse
+            fitter.add_data([qiskit.execute(circs, backend, shots=100,
+                                            seed_simulator=7).result()],
+                            circs)
+            rho2 = fitter.fit(method='lstsq', standard_weights=False)
+            self.assertEqual(pinv.call_count, 1)
+            # and so do new fitters of the same configuration
+            fitter = tomo.StateTomographyFitter(
+                qiskit.execute(circs, backend, shots=100,
+                               seed_simulator=3).result(), circs)
+            rho3 = fitter.fit(method='lstsq', standard_weights=False)
+            self.assertEqual(pinv.call_count, 1)
+        self.assertFalse(np.allclose(rho, rho2))
+        np.testing.assert_allclose(
+            rho3, fitter.fit(method='lstsq', standard_weights=False,
+                             pinv_matrix=None), atol=1e-10)
+
+    def test_process_fitter_pinv_cache(self):
+        base_fitter._BASIS_CACHE.clear()
+        circ = QuantumCircuit(1)
+        circ.h(0)
+        circs = tomo.process_tomography_circuits(circ, [0])
+        backend = Aer.get_backend('qasm_simulator')
+        with mock.patch('scipy.linalg.pinv', wraps=la.pinv) as pinv:
+            for seed in [42, 7]:
+                fitter = tomo.ProcessTomographyFitter(
+                    qiskit.execute(circs, backend, shots=100,
+                                   seed_simulator=seed).result(), circs)
+                choi = fitter.fit(method='lstsq', standard_weights=False)
+            self.assertEqual(pinv.call_count, 1)
+        np.testing.assert_allclose(
+            choi.data, fitter.fit(method='lstsq', standard_weights=False,
+                                  pinv_matrix=None).data, atol=1e-10)
+
+    def test_weighted_fit(self):
+        rng = np.random.default_rng(7)
+        basis_matrix = rng.normal(size=(24, 4))
+        data = rng.random(24)
+        weights = rng.random(24) + 0.5
+        expected = la.lstsq(weights[:, None] * basis_matrix,
+                            weights * data)[0].reshape(2, 2, order='F')
+        np.testing.assert_allclose(
+            lstsq_fit(data, basis_matrix, weights, psd=False), expected,
+            atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,10 +18,11 @@
 
 import unittest
 
+import numpy
 import qiskit
 from qiskit import QuantumRegister, QuantumCircuit, Aer
 from qiskit.quantum_info import state_fidelity
-from qiskit.quantum_info import Choi
+from qiskit.quantum_info import Choi, Operator
 
 import qiskit.ignis.verification.tomography as tomo
 from qiskit.ignis.verification.tomography.fitters import cvx_fit
@@ -53,6 +54,72 @@ class TestProcessTomography(unittest.TestCase):
         self.assertAlmostEqual(F_bell, 1, places=1)
 
 
+class TestProcessTomographyCircuits(unittest.TestCase):
+    def test_lazy_circuits(self):
+        q2 = QuantumRegister(2)
+        bell = QuantumCircuit(q2)
+        bell.h(q2[0])
+        bell.cx(q2[0], q2[1])
+
+        qpt = tomo.process_tomography_circuits(bell, q2)
+        lazy = tomo.process_tomography_circuits(bell, q2, lazy=True)
+        self.assertNotIsInstance(lazy, list)
+        lazy = list(lazy)
+        self.assertEqual(len(qpt), 16 * 9)
+        self.assertEqual([c.name for c in lazy], [c.name for c in qpt])
+        self.assertEqual([c.count_ops() for c in lazy],
+                         [c.count_ops() for c in qpt])
+        # circuits with the same measurement label do not share the
+        # measurement instructions
+        meas0 = [inst.operation for inst in qpt[0].data
+                 if inst.operation.name == 'measure']
+        meas9 = [inst.operation for inst in qpt[9].data
+                 if inst.operation.name == 'measure']
+        self.assertFalse(any(op0 is op9 for op0 in meas0 for op9 in meas9))
+
+    def test_template_circuits(self):
+        q2 = QuantumRegister(2)
+        bell = QuantumCircuit(q2)
+        bell.h(q2[0])
+        bell.cx(q2[0], q2[1])
+
+        template, bindings = tomo.tomography_circuit_template(
+            bell, q2, prep_labels='Pauli')
+        self.assertEqual(template.num_parameters, 12)
+        circuits = tomo.bind_tomography_circuits(template, bindings)
+        qpt = {c.name: c for c in tomo.process_tomography_circuits(bell, q2)}
+        self.assertEqual(set(c.name for c in circuits), set(qpt))
+        for circ in circuits[::7]:
+            self.assertTrue(Operator(
+                circ.remove_final_measurements(inplace=False)).equiv(
+                    Operator(qpt[circ.name].remove_final_measurements(
+                        inplace=False))))
+
+        job = qiskit.execute(circuits, Aer.get_backend('qasm_simulator'),
+                             shots=2000)
+        tomo_fit = tomo.ProcessTomographyFitter(job.result(), circuits)
+        choi = tomo_fit.fit(method='lstsq').data
+        F_bell = state_fidelity(Choi(bell).data / 4, choi / 4,
+                                validate=False)
+        self.assertAlmostEqual(F_bell, 1, places=1)
+
+
+class TestProcessTomographyMLEPG(TestProcessTomography):
+    def setUp(self):
+        super().setUp()
+        self.method = 'mle_pg'
+
+    def test_trace_preserving(self):
+        q2 = QuantumRegister(2)
+        bell = QuantumCircuit(q2)
+        bell.h(q2[0])
+        bell.cx(q2[0], q2[1])
+
+        choi, _ = run_circuit_and_tomography(bell, q2, self.method)
+        ptr = numpy.trace(choi.reshape(4, 4, 4, 4), axis1=1, axis2=3)
+        numpy.testing.assert_allclose(ptr, numpy.eye(4), atol=1e-4)
+
+
 @unittest.skipUnless(cvx_fit._HAS_CVX, 'cvxpy is required for this test')
 class TestProcessTomographyCVX(TestProcessTomography):
     def setUp(self):
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-docstring
+# pylint: disable=invalid-name
+
+import unittest
+
+import numpy
+import qiskit
+from qiskit import QuantumRegister, QuantumCircuit, Aer, QiskitError
+from qiskit.quantum_info import Statevector, DensityMatrix, Pauli
+import qiskit.ignis.verification.tomography as tomo
+
+
+class TestShadowTomography(unittest.TestCase):
+    def setUp(self):
+        q = QuantumRegister(4)
+        circ = QuantumCircuit(q)
+        circ.h(q[0])
+        for j in range(3):
+            circ.cx(q[j], q[j + 1])
+        circ.ry(0.5, q[1])
+        self.psi = Statevector.from_instruction(circ)
+        self.circuits = tomo.shadow_tomography_circuits(
+            circ, q, num_settings=200, seed=42)
+        job = qiskit.execute(self.circuits,
+                             Aer.get_backend('qasm_simulator'),
+                             shots=100, seed_simulator=42)
+        self.fitter = tomo.ShadowTomographyFitter(job.result(),
+                                                  self.circuits, seed=42)
+
+    def test_circuits(self):
+        labels = [circ.name for circ in self.circuits]
+        self.assertLessEqual(len(labels), 200)
+        self.assertEqual(len(labels), len(set(labels)))
+        self.assertEqual(self.fitter.num_qubits, 4)
+        self.assertEqual(self.fitter.num_snapshots,
+                         100 * len(self.circuits))
+
+    def test_expectation_values(self):
+        paulis = ['IIII', 'IIZZ', 'ZZII', 'IIIX', 'IZIZ', 'XIIX']
+        expected = [self.psi.expectation_value(Pauli(p)).real
+                    for p in paulis]
+        values = self.fitter.expectation_values(paulis)
+        numpy.testing.assert_allclose(values, expected, atol=0.2)
+        self.assertAlmostEqual(self.fitter.expectation_values('IIII'), 1)
+
+    def test_fidelity(self):
+        fid = self.fitter.fidelity(self.psi)
+        self.assertAlmostEqual(fid, 1, delta=0.2)
+        self.assertAlmostEqual(
+            self.fitter.fidelity(DensityMatrix(self.psi)), fid)
+
+    def test_invalid_pauli(self):
+        self.assertRaises(QiskitError, self.fitter.expectation_values, 'XX')
+        self.assertRaises(QiskitError, self.fitter.expectation_values,
+                          'IIIA')
+
+
+if __name__ == '__main__':
+    unittest.main()
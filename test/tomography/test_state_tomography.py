@@ -16,15 +16,18 @@
 # pylint: disable=unexpected-keyword-arg
 # pylint: disable=invalid-name
 
+import os
+import tempfile
 import unittest
 
 import numpy
 import qiskit
-from qiskit import QuantumRegister, QuantumCircuit, Aer
+from qiskit import QuantumRegister, QuantumCircuit, Aer, QiskitError
 from qiskit.circuit.library import U3Gate
 from qiskit.quantum_info import state_fidelity, partial_trace, Statevector
 import qiskit.ignis.verification.tomography as tomo
 import qiskit.ignis.verification.tomography.fitters.cvx_fit as cvx_fit
+import qiskit.ignis.verification.tomography.fitters.mle_pg_fit as mle_pg_fit
 
 
 def run_circuit_and_tomography(circuit, qubits, method='lstsq'):
@@ -57,6 +60,36 @@ class TestFitter(unittest.TestCase):
             self.assertAlmostEqual(numpy.trace(rho), trace_value, places=3)
 
 
+class TestMLEPGFitter(unittest.TestCase):
+    def test_trace_constraint(self):
+        p = numpy.array([1/2, 1/2, 1/2, 1/2, 1/2, 1/2])
+
+        # the basis matrix for 1-qubit measurement in the Pauli basis
+        A = numpy.array([
+            [0.5 + 0.j, 0.5 + 0.j, 0.5 + 0.j, 0.5 + 0.j],
+            [0.5 + 0.j, -0.5 + 0.j, -0.5 + 0.j, 0.5 + 0.j],
+            [0.5 + 0.j, 0. - 0.5j, 0. + 0.5j, 0.5 + 0.j],
+            [0.5 + 0.j, 0. + 0.5j, 0. - 0.5j, 0.5 + 0.j],
+            [1. + 0.j, 0. + 0.j, 0. + 0.j, 0. + 0.j],
+            [0. + 0.j, 0. + 0.j, 0. + 0.j, 1. + 0.j]
+        ])
+
+        for trace_value in [1, 0.3, 2, 0, 42]:
+            rho = mle_pg_fit.mle_pg_fit(p, A, trace=trace_value)
+            self.assertAlmostEqual(numpy.trace(rho), trace_value, places=3)
+            self.assertGreaterEqual(min(numpy.linalg.eigvalsh(rho)), -1e-8)
+
+    def test_trace_preserving_constraint(self):
+        # Random Choi-matrix data for a 1-qubit channel
+        rng = numpy.random.default_rng(1234)
+        A = rng.normal(size=(36, 16)) + 1j * rng.normal(size=(36, 16))
+        p = rng.random(36)
+        choi = mle_pg_fit.mle_pg_fit(p, A, trace_preserving=True)
+        ptr = numpy.trace(choi.reshape(2, 2, 2, 2), axis1=1, axis2=3)
+        numpy.testing.assert_allclose(ptr, numpy.eye(2), atol=1e-6)
+        self.assertGreaterEqual(min(numpy.linalg.eigvalsh(choi)), -1e-6)
+
+
 class TestStateTomography(unittest.TestCase):
     def setUp(self):
         super().setUp()
@@ -148,6 +181,135 @@ class TestStateTomography(unittest.TestCase):
         self.assertAlmostEqual(F_bell, 1, places=1)
 
 
+class TestStateTomographyBootstrap(unittest.TestCase):
+    def setUp(self):
+        q2 = QuantumRegister(2)
+        bell = QuantumCircuit(q2)
+        bell.h(q2[0])
+        bell.cx(q2[0], q2[1])
+        qst = tomo.state_tomography_circuits(bell, q2)
+        job = qiskit.execute(qst, Aer.get_backend('qasm_simulator'),
+                             shots=2000, seed_simulator=42)
+        self.psi = Statevector.from_instruction(bell)
+        self.tomo_fit = tomo.StateTomographyFitter(job.result(), qst)
+
+    def test_bootstrap(self):
+        ret = self.tomo_fit.bootstrap(num_samples=20, target=self.psi,
+                                      seed=42)
+        self.assertEqual(len(ret['purity']), 20)
+        self.assertEqual(len(ret['fidelity']), 20)
+        low, high = ret['fidelity_interval']
+        self.assertLessEqual(low, high)
+        self.assertGreater(low, 0.9)
+        self.assertLessEqual(high, 1 + 1e-8)
+        self.assertLessEqual(ret['purity_interval'][1], 1 + 1e-8)
+
+    def test_parametric_bootstrap(self):
+        ret = self.tomo_fit.bootstrap(num_samples=10, parametric=True,
+                                      seed=42)
+        self.assertNotIn('fidelity', ret)
+        low, high = ret['purity_interval']
+        self.assertLessEqual(low, high)
+        self.assertGreater(low, 0.8)
+
+    def test_seed(self):
+        ret1 = self.tomo_fit.bootstrap(num_samples=5, seed=7)
+        ret2 = self.tomo_fit.bootstrap(num_samples=5, seed=7)
+        numpy.testing.assert_allclose(ret1['purity'], ret2['purity'])
+
+
+class TestStateTomographyDataStore(unittest.TestCase):
+    def setUp(self):
+        q = QuantumRegister(2)
+        circ = QuantumCircuit(q)
+        circ.h(q[0])
+        circ.cx(q[0], q[1])
+        self.circuits = tomo.state_tomography_circuits(circ, q)
+        backend = Aer.get_backend('qasm_simulator')
+        self.results = [
+            qiskit.execute(self.circuits, backend, shots=500,
+                           seed_simulator=seed).result()
+            for seed in [1, 2]]
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'store')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_save_load(self):
+        fitter = tomo.StateTomographyFitter(self.results[0], self.circuits)
+        fitter.save_data(self.path)
+        loaded = tomo.StateTomographyFitter(None, None)
+        loaded.load_data(self.path)
+        self.assertEqual(loaded.data, fitter.data)
+        numpy.testing.assert_allclose(loaded.fit(method='lstsq'),
+                                      fitter.fit(method='lstsq'))
+
+    def test_append(self):
+        fitter = tomo.StateTomographyFitter(self.results[0], self.circuits)
+        fitter.save_data(self.path)
+        segment = os.path.join(self.path, 'counts_0.npy')
+        saved = numpy.load(segment)
+        # Resume from the data store and add the data of another job
+        resumed = tomo.StateTomographyFitter(None, None)
+        resumed.load_data(self.path)
+        resumed.add_data([self.results[1]], self.circuits)
+        resumed.save_data(self.path)
+        # Only the new counts are appended to the data store
+        numpy.testing.assert_array_equal(numpy.load(segment), saved)
+        numpy.testing.assert_array_equal(
+            numpy.load(os.path.join(self.path, 'counts_1.npy')),
+            tomo.StateTomographyFitter(self.results[1],
+                                       self.circuits)._counts_array())
+        loaded = tomo.StateTomographyFitter(None, None)
+        loaded.load_data(self.path)
+        expected = tomo.StateTomographyFitter(self.results[0], self.circuits)
+        expected.add_data([self.results[1]], self.circuits)
+        self.assertEqual(loaded.data, expected.data)
+        numpy.testing.assert_array_equal(loaded._counts_array(),
+                                         expected._counts_array())
+
+    def test_reload(self):
+        fitter = tomo.StateTomographyFitter(self.results[0], self.circuits)
+        self.assertIs(fitter.data, fitter._data)
+        expected = fitter._counts_array()
+        # loading a store the fitter was saved to does not add its counts
+        fitter.save_data(self.path)
+        fitter.load_data(self.path)
+        numpy.testing.assert_array_equal(fitter._counts_array(), expected)
+        # saving again without new counts appends nothing
+        fitter.save_data(self.path)
+        self.assertFalse(os.path.exists(
+            os.path.join(self.path, 'counts_1.npy')))
+        loaded = tomo.StateTomographyFitter(None, None)
+        loaded.load_data(self.path)
+        loaded.load_data(self.path)
+        numpy.testing.assert_array_equal(loaded._counts_array(), expected)
+
+        # the counts of a new fitter are appended to the store
+        other = tomo.StateTomographyFitter(self.results[1], self.circuits)
+        other.save_data(self.path)
+        loaded.load_data(self.path)
+        numpy.testing.assert_array_equal(
+            loaded._counts_array(), expected + other._counts_array())
+
+    def test_save_fits(self):
+        fitter = tomo.StateTomographyFitter(self.results[0], self.circuits)
+        rho = fitter.fit(method='lstsq')
+        fitter.save_data(self.path, fits={'lstsq': rho})
+        fits = tomo.StateTomographyFitter.load_fits(self.path)
+        self.assertEqual(list(fits), ['lstsq'])
+        numpy.testing.assert_array_equal(fits['lstsq'], rho)
+        with self.assertRaises(QiskitError):
+            fitter.save_data(self.path, fits={'../lstsq': rho})
+
+
+class TestStateTomographyMLEPG(TestStateTomography):
+    def setUp(self):
+        super().setUp()
+        self.method = 'mle_pg'
+
+
 @unittest.skipUnless(cvx_fit._HAS_CVX, 'cvxpy is required  to run this test')
 class TestStateTomographyCVX(TestStateTomography):
     def setUp(self):